@@ -30,7 +30,9 @@ Attributes:
         adaptively; ``[..., FREQ_STEP]`` for the LSIO entries; and
         ``[..., FREQ_STEP, FREQ_SOL]`` for the HSIO entries, which also need a
         solution frequency. A user-supplied spec type sheet adds to or
-        overrides this mapping.
+        overrides this mapping. A spec type listing the ``ZMASK`` key also
+        carries a ``"Z_MASK"`` entry, being the ``[freq, ohm]`` breakpoints of
+        its target impedance mask, joined by straight lines on log-log axes.
     POST_PROCESS_KEY_ORDER_PDN (dict): Post-processing key to its sort rank,
         used to present PDN results in a stable order regardless of the order
         the keys were written in the input.
@@ -100,6 +102,7 @@ SPEC_TYPE = {
 POST_PROCESS_KEY_ORDER_PDN = {
     "ZOPEN": 0,
     "ZSHORT": 1,
+    "ZMASK": 2,
 }
 
 
@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module thins out curves before they are drawn.
+
+    A PowerSI sweep often holds 20k to 100k frequency points per curve, while
+the axes of a report figure are only some hundred pixels wide, so most of the
+points land on the same pixel column and only cost rasterization time and
+memory. The curves are reduced here to a few points per pixel column in a way
+that keeps what a reader looks for:
+
+* :func:`minmax_log_index` keeps the lowest and the highest point of each bin
+  on a logarithmic frequency axis, so every impedance peak and resonance notch
+  is drawn at its true height.
+* :func:`lttb_index` runs largest-triangle-three-buckets on a linear axis,
+  which follows the shape of a loss curve closely. The global lowest and
+  highest points are always kept on top of it.
+
+    Both take the curves of one figure sharing a frequency axis as one
+``[curve, point]`` stack, so the work is spread over NumPy calls on the whole
+stack rather than done curve by curve. They return the indices to keep, and
+only the drawing sees the reduced curves. Every value extracted from a network
+is still computed from the full arrays.
+"""
+
+import numpy as np
+
+
+def minmax_log_index(x, y_stack, n_bin):
+    """Get the lowest and highest point of each log-spaced bin of curves.
+
+    Points at a non-positive ``x``, which a log axis does not draw, are kept
+    as they are. Points whose bin holds a NaN are dropped, as a NaN is not
+    drawn either.
+
+    Args:
+        x (numpy.ndarray): The shared x values, e.g. frequency, ascending.
+        y_stack (numpy.ndarray): The y values, indexed ``[curve, point]``.
+        n_bin (int): Number of bins across the positive ``x`` range, usually
+            the pixel width of the axes.
+
+    Returns:
+        list of numpy.ndarray: The ascending indices to keep, one array per
+        curve. The first and last points are always kept. Every index is kept
+        when there are no more than ``2 * n_bin`` positive points, or when
+        ``x`` is not ascending.
+    """
+    x = np.asarray(x)
+    y_stack = np.asarray(y_stack)
+    size = x.size
+    all_index = [np.arange(size)] * len(y_stack)
+    i_start = int(np.searchsorted(x, 0, side="right"))
+    if size - i_start <= 2 * n_bin or np.any(np.diff(x) < 0):
+        return all_index
+    log_x = np.log10(x[i_start:])
+    log_span = log_x[-1] - log_x[0]
+    if log_span == 0:
+        return all_index
+    bin_id = np.minimum(((log_x - log_x[0]) / log_span * n_bin).astype(np.intp), n_bin - 1)
+    start = np.flatnonzero(np.r_[True, bin_id[1:] != bin_id[:-1]])
+    count = np.diff(np.r_[start, bin_id.size])
+    y_pos = y_stack[:, i_start:]
+    point = np.arange(i_start, size)
+    # the first index holding each bin's minimum, and the last holding its
+    # maximum
+    is_min = y_pos == np.repeat(np.minimum.reduceat(y_pos, start, axis=1), count, axis=1)
+    i_min = np.minimum.reduceat(np.where(is_min, point, size), start, axis=1)
+    is_max = y_pos == np.repeat(np.maximum.reduceat(y_pos, start, axis=1), count, axis=1)
+    i_max = np.maximum.reduceat(np.where(is_max, point, -1), start, axis=1)
+    edge = np.r_[np.arange(i_start), 0, size - 1]
+    index_list = []
+    for i_curve in range(len(y_stack)):
+        keep = np.r_[i_min[i_curve], i_max[i_curve], edge]
+        index_list.append(np.unique(keep[(keep >= 0) & (keep < size)]))
+    return index_list
+
+
+def lttb_index(x, y_stack, n_out):
+    """Get the points largest-triangle-three-buckets keeps of curves.
+
+    The first and last points are kept, and the points in between are split
+    into ``n_out - 2`` buckets of nearly equal count. From each bucket the
+    point making the largest triangle with the point kept from the previous
+    bucket and the mean of the next bucket is kept. The buckets are walked
+    once for the whole stack. The global lowest and highest points of each
+    curve are added if its buckets did not keep them.
+
+    Args:
+        x (numpy.ndarray): The shared x values, e.g. frequency.
+        y_stack (numpy.ndarray): The y values, indexed ``[curve, point]``.
+        n_out (int): Number of points to keep per curve, usually twice the
+            pixel width of the axes. At least ``3``.
+
+    Returns:
+        list of numpy.ndarray: The ascending indices to keep, one array per
+        curve. Every index is kept when there are no more than ``n_out``
+        points.
+    """
+    x = np.asarray(x, dtype=float)
+    y_stack = np.asarray(y_stack, dtype=float)
+    size = x.size
+    n_curve = len(y_stack)
+    if size <= n_out or n_out < 3:
+        return [np.arange(size)] * n_curve
+    edge = np.linspace(1, size - 1, n_out - 1).astype(np.intp)
+    width = np.diff(edge)
+    # the mean of the next bucket, for the third corner of each triangle
+    x_mean = np.r_[np.add.reduceat(x[1:-1], edge[:-1] - 1)[1:] / width[1:], x[-1]]
+    y_mean = np.add.reduceat(y_stack[:, 1:-1], edge[:-1] - 1, axis=1)[:, 1:] / width[1:]
+    y_mean = np.c_[y_mean, y_stack[:, -1]]
+    row = np.arange(n_curve)
+    keep = np.empty((n_curve, n_out), dtype=np.intp)
+    keep[:, 0] = 0
+    keep[:, -1] = size - 1
+    i_prev = keep[:, 0]
+    for i_bucket in range(n_out - 2):
+        start, stop = edge[i_bucket], edge[i_bucket + 1]
+        x_a = x[i_prev][:, None]
+        y_a = y_stack[row, i_prev][:, None]
+        area = np.abs(
+            (x_a - x_mean[i_bucket]) * (y_stack[:, start:stop] - y_a)
+            - (x_a - x[start:stop]) * (y_mean[:, i_bucket, None] - y_a)
+        )
+        i_prev = start + np.argmax(area, axis=1)
+        keep[:, i_bucket + 1] = i_prev
+    is_nan = np.isnan(y_stack)
+    i_min = np.argmin(np.where(is_nan, np.inf, y_stack), axis=1)
+    i_max = np.argmax(np.where(is_nan, -np.inf, y_stack), axis=1)
+    return [
+        np.unique(np.r_[keep[i_curve], i_min[i_curve], i_max[i_curve]])
+        for i_curve in range(n_curve)
+    ]
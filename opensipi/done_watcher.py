@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module waits for the ``.done`` markers of a run to appear.
+
+    The solver reports progress only by writing marker files, so the monitor
+used to stat the marker of the current key once a second. That adds up to a
+second of latency per key and thousands of stat calls per wait. ``DoneWatcher``
+waits for any of a list of markers in one folder at once, and wakes as soon as
+one of them is written:
+
+* On Linux, the folder is watched through inotify, reached with ``ctypes`` so
+  no package is needed. The markers are only looked at when the folder
+  reports a new or closed file, and once every ``SAFETY_TIME`` in case the
+  folder sits on a network share whose writes are not reported.
+* Elsewhere, or when inotify cannot be set up, the markers are polled with a
+  sleep that starts short and doubles up to ``MAX_POLL_TIME``, so a quick step
+  is noticed quickly and a long one costs few calls.
+
+    A wait can also be cut short by a file descriptor turning readable, such
+as the pidfd of a solver that exits. See
+``opensipi.solver_process.SolverProcess``.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+from time import perf_counter, sleep
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+def _init_inotify(run_dir):
+    """Watch a folder for new files through inotify.
+
+    Args:
+        run_dir (str): The folder.
+
+    Returns:
+        int: The inotify file descriptor, or ``None`` where inotify is not
+        available or the folder cannot be watched.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_CREATE | _IN_MOVED_TO | _IN_CLOSE_WRITE
+    if libc.inotify_add_watch(fd, os.fsencode(run_dir), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class DoneWatcher:
+    """Waits for marker files in one folder.
+
+    Attributes:
+        MIN_POLL_TIME (float): First sleep in seconds of the polling fallback.
+        MAX_POLL_TIME (float): Longest sleep in seconds of the polling
+            fallback.
+        SAFETY_TIME (float): Longest time in seconds inotify is trusted
+            without looking at the markers.
+        run_dir (str): Separator-ending folder the markers are written to.
+        inotify_fd (int): The inotify file descriptor, or ``None`` when
+            polling.
+    """
+
+    def __init__(self, run_dir):
+        """Start watching a folder.
+
+        Args:
+            run_dir (str): Separator-ending folder the markers are written to.
+        """
+        self.MIN_POLL_TIME = 0.05
+        self.MAX_POLL_TIME = 5
+        self.SAFETY_TIME = 30
+        self.run_dir = run_dir
+        self.inotify_fd = _init_inotify(run_dir)
+
+    def wait(self, name_list, timeout=None, wake_fd=None):
+        """Wait until at least one of some markers exists.
+
+        Args:
+            name_list (list of str): File names of the markers in ``run_dir``.
+            timeout (float, optional): Longest wait in seconds. Defaults to
+                ``None``, which waits for as long as it takes.
+            wake_fd (int, optional): A file descriptor that ends the wait once
+                readable, e.g. a pidfd. Defaults to ``None``.
+
+        Returns:
+            list of str: The markers of ``name_list`` that exist, in its
+            order. Empty only when the wait timed out or was woken by
+            ``wake_fd``.
+        """
+        wake_list = [] if wake_fd is None else [wake_fd]
+        deadline = None if timeout is None else perf_counter() + timeout
+        poll_time = self.MIN_POLL_TIME
+        while True:
+            done_list = [name for name in name_list if os.path.exists(self.run_dir + name)]
+            if done_list:
+                return done_list
+            remain = None if deadline is None else deadline - perf_counter()
+            if remain is not None and remain <= 0:
+                return []
+            if self.inotify_fd is None:
+                wait_time = poll_time if remain is None else min(poll_time, remain)
+                poll_time = min(2 * poll_time, self.MAX_POLL_TIME)
+                if not wake_list:
+                    sleep(wait_time)
+                    continue
+                ready_list = select.select(wake_list, [], [], wait_time)[0]
+            else:
+                wait_time = self.SAFETY_TIME if remain is None else min(self.SAFETY_TIME, remain)
+                ready_list = select.select([self.inotify_fd] + wake_list, [], [], wait_time)[0]
+                if self.inotify_fd in ready_list:
+                    self.__drain()
+            if wake_fd is not None and wake_fd in ready_list:
+                return [name for name in name_list if os.path.exists(self.run_dir + name)]
+
+    def close(self):
+        """Stop watching the folder."""
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def __drain(self):
+        """Read the pending inotify events, whose content is not needed."""
+        try:
+            while os.read(self.inotify_fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
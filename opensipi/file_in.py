@@ -383,16 +383,22 @@ class FileIn:
         Args:
             raw_data (list of list of str): The sheet contents. The first row
                 is the header; its second and third cells name the two sub
-                keys, normally ``Freq`` and ``Post_Process_Key``. Each
+                keys, normally ``Freq`` and ``Post_Process_Key``. An optional
+                fourth cell, normally ``Z_Mask``, names a column holding the
+                target impedance mask the ``ZMASK`` key checks. Each
                 remaining row defines one spec type as
-                ``[name, freq, post_process_keys]``.
+                ``[name, freq, post_process_keys]``, plus the mask when that
+                column exists.
 
         Returns:
             dict: Upper-cased spec type name to its definition, e.g.
             ``{"ZPDN": {"FREQ": [0, 1000000000], "POST_PROCESS_KEY":
             ["ZOPEN", "ZSHORT"]}}``. The frequencies are comma-separated and
             converted to int; the post-processing keys are comma-separated and
-            upper-cased.
+            upper-cased. A mask is written as comma-separated ``freq:ohm``
+            breakpoints, e.g. ``"1e3:0.01, 1e6:0.01, 1e8:0.1"``, and becomes a
+            list of ``[freq, ohm]`` float pairs. An empty mask cell adds no
+            mask.
         """
         # strip white spaces before and after strings in the raw data
         rec_data = rectify_data(raw_data)
@@ -406,6 +412,11 @@ class FileIn:
                 sub_key[0]: intfy_list(striped_str2list(tmp[1], ",")),
                 sub_key[1]: striped_str2list(tmp[2].upper(), ","),
             }
+            if len(header) > 3 and len(tmp) > 3 and tmp[3]:
+                spectype[st_key][header[3].upper()] = [
+                    [float(i_pt) for i_pt in striped_str2list(i_pair, ":")]
+                    for i_pair in striped_str2list(tmp[3], ",")
+                ]
         return spectype
 
     def __parse_stackup_info(self, raw_data):
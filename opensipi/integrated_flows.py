@@ -47,6 +47,52 @@ def sim2report(input_info, mntr_info):
             * ``op_pause_after_model_check`` (int, optional): ``1`` to pause
               after model check so the models can be inspected or hand-edited,
               ``0`` to run straight through. Defaults to ``0``.
+            * ``op_solver_shards`` (int, optional): Number of solver instances
+              running the model checks and the simulations side by side, each
+              on its own share of the keys. Defaults to ``1``.
+            * ``op_priority`` (int, optional): Rank of the solver launches in
+              the machine-wide queue for the license tokens set by
+              ``SIG_LIC_CAP``. Higher is served first. Defaults to ``0``.
+            * ``op_sample_sec`` (float, optional): Seconds between two logs of
+              the CPU time and the memory of the solver processes. Defaults
+              to ``120``.
+            * ``op_pipeline`` (int, optional): ``1`` to simulate each key as
+              soon as its model passes the checks. Ignored when pausing after
+              model check. Defaults to ``0``.
+            * ``op_snp_workers`` (int, optional): Number of worker processes
+              used to post-process the touchstone files for the report.
+              Defaults to ``1``.
+            * ``op_snp_cache_mb`` (float, optional): Size cap in MiB of a
+              binary cache of the parsed touchstone files, reused by later
+              reports on the same run. Defaults to ``0``, which disables it.
+            * ``op_tdr_settings`` (dict, optional): ``rise_time``, ``window``,
+              and ``span`` of the TDR plots. Defaults to ``{}``, which keeps
+              the defaults.
+            * ``op_plot_reuse`` (int, optional): ``1`` to reuse the figures
+              and values of an earlier report on the same run whose inputs
+              are unchanged. Defaults to ``0``.
+            * ``op_mm_settings`` (dict, optional): ``cache``, ``quadrants``,
+              and ``write_snp`` of the mixed-mode conversion. Defaults to
+              ``{}``, which keeps the defaults.
+            * ``op_snp_batch_mb`` (float, optional): Size cap in MiB of the
+              stacks same-grid touchstone files are post-processed in.
+              Defaults to ``0``, which processes one file at a time.
+            * ``op_plot_workers`` (int, optional): Number of worker processes
+              drawing the figures of each touchstone file, for a few very
+              large files. Defaults to ``1``.
+            * ``op_export`` (int, optional): ``1`` to export every plotted
+              curve and extracted value of the run as numeric columns in the
+              ``Export`` folder of the report. Defaults to ``0``.
+            * ``op_vf_settings`` (dict, optional): ``n_poles_real`` and
+              ``n_poles_cmplx`` of the compact pole-residue model fitted to
+              every touchstone file of the run. Defaults to ``{}``, which
+              fits no models.
+            * ``op_precision`` (str, optional): ``"single"`` to hold the S
+              matrices of the touchstone files in complex64, for processing
+              several large models at once. Defaults to ``"double"``.
+            * ``op_mask_plot`` (int, optional): ``0`` to only check the
+              ``ZMASK`` target impedance masks and draw no figures for them.
+              Defaults to ``1``.
 
     Returns:
         str: Full path to the generated pdf report.
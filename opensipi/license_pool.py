@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module accounts for the Sigrity license tokens of one machine.
+
+    A solver launched with ``-wait:1`` holds until a license is free, so
+several extractions started on one host pile up as solver processes that look
+busy while doing nothing. ``LicensePool`` admits a launch only when one of the
+tokens of its tool is free, and keeps the others waiting in opensipi, where the
+monitor can tell waiting apart from running.
+
+    The capacities come from the optional ``SIG_LIC_CAP`` of
+``config_sigrity.yaml``, as a number of tokens per tool. A tool without a
+capacity is not accounted for. The pool is a folder of plain files shared by
+every opensipi process on the machine:
+
+* ``<TOOL>/token_<i>.lock``: one file per token. A token is held by holding
+  the exclusive lock of its file, which the OS drops when the holder exits,
+  so a crashed run never keeps a token.
+* ``<TOOL>/<priority>_<time>_<pid>_<n>.wait``: one ticket per waiting launch.
+  The tickets are served by descending priority, then first come first
+  served. A ticket whose process is gone is removed by the next waiter.
+"""
+
+import os
+import tempfile
+from itertools import count
+from time import perf_counter, sleep, time_ns
+
+import psutil
+
+from opensipi.util.common import SL, expand_home_dir, make_dir, slash_ending
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+_TICKET_ID = count()
+
+
+def _try_lock(fd):
+    """Take the exclusive lock of an open file without blocking.
+
+    Args:
+        fd (int): The file descriptor.
+
+    Returns:
+        bool: Whether the lock was taken.
+    """
+    try:
+        if os.name == "nt":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd):
+    """Drop the lock of an open file and close it.
+
+    Args:
+        fd (int): The file descriptor, locked by :func:`_try_lock`.
+    """
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+class LicensePool:
+    """Lock-file token pool of the solver licenses of one machine.
+
+    Attributes:
+        POLL_TIME (float): Seconds between two looks at the pool while
+            waiting.
+        LOG_TIME (float): Seconds between two log lines while waiting.
+        capacity_dict (dict): Upper-case tool name to its number of tokens.
+        pool_dir (str): Separator-ending folder of the pool.
+    """
+
+    def __init__(self, tool_config):
+        """Read the capacities of the pool.
+
+        Args:
+            tool_config (dict): The loaded ``config_sigrity.yaml``, read for
+                the optional ``SIG_LIC_CAP``, e.g. ``{"POWERSI": 4}``, and the
+                optional ``SIG_LIC_POOL_DIR``, which defaults to an
+                ``opensipi_license`` folder in the temporary directory.
+        """
+        self.POLL_TIME = 5
+        self.LOG_TIME = 300
+        self.capacity_dict = {
+            tool.upper(): int(cap) for tool, cap in (tool_config.get("SIG_LIC_CAP") or {}).items()
+        }
+        pool_dir = tool_config.get("SIG_LIC_POOL_DIR") or (
+            tempfile.gettempdir() + SL + "opensipi_license"
+        )
+        self.pool_dir = slash_ending(expand_home_dir(pool_dir))
+
+    def acquire(self, tool, priority=0, lg=None):
+        """Wait for a free token of a tool and take it.
+
+        Args:
+            tool (str): The solver, e.g. ``"powersi"``.
+            priority (int, optional): Rank in the queue. Higher is served
+                first. Defaults to ``0``.
+            lg (logging.Logger, optional): Logger of the wait. Defaults to
+                ``None``, which logs nothing.
+
+        Returns:
+            int: The token, to be handed to :meth:`release`, or ``None`` if
+            the tool is not accounted for.
+        """
+        tool = tool.upper()
+        if tool not in self.capacity_dict:
+            return None
+        tool_dir = self.pool_dir + tool + SL
+        make_dir(tool_dir)
+        ticket = self.__add_ticket(tool_dir, priority)
+        tic = perf_counter()
+        log_tic = None
+        try:
+            while True:
+                queue = self.__get_queue(tool_dir)
+                n_ahead = queue.index(ticket) if ticket in queue else 0
+                token, n_free = self.__take_token(tool_dir, tool, n_ahead)
+                if token is not None:
+                    if lg is not None and log_tic is not None:
+                        lg.debug(
+                            "A {} token is taken after {} secs.".format(
+                                tool, str(round(perf_counter() - tic))
+                            )
+                        )
+                    return token
+                if lg is not None and (log_tic is None or perf_counter() - log_tic > self.LOG_TIME):
+                    log_tic = perf_counter()
+                    lg.debug(
+                        "Waiting for a {} token: {} of {} in use, {} queued ahead.".format(
+                            tool,
+                            str(self.capacity_dict[tool] - n_free),
+                            str(self.capacity_dict[tool]),
+                            str(n_ahead),
+                        )
+                    )
+                sleep(self.POLL_TIME)
+        finally:
+            os.remove(tool_dir + ticket)
+
+    @staticmethod
+    def release(token):
+        """Give a token back to the pool.
+
+        Args:
+            token (int): The token returned by :meth:`acquire`. ``None`` is
+                ignored.
+        """
+        if token is not None:
+            _unlock(token)
+
+    def get_usage(self, tool):
+        """Count the tokens in use and the launches waiting for one.
+
+        Args:
+            tool (str): The solver, e.g. ``"powersi"``.
+
+        Returns:
+            tuple: A 2-tuple ``(n_used, n_waiting)``. Both are ``0`` for a
+            tool that is not accounted for.
+        """
+        tool = tool.upper()
+        if tool not in self.capacity_dict:
+            return 0, 0
+        tool_dir = self.pool_dir + tool + SL
+        make_dir(tool_dir)
+        _, n_free = self.__take_token(tool_dir, tool, -1)
+        return self.capacity_dict[tool] - n_free, len(self.__get_queue(tool_dir))
+
+    def __take_token(self, tool_dir, tool, n_ahead):
+        """Take the free token left over by the waiters ahead.
+
+        The tokens are walked in order and each free one is counted. The
+        ``n_ahead + 1``-th free token is kept, so the waiters ahead are left
+        one each.
+
+        Args:
+            tool_dir (str): Separator-ending folder of the tool.
+            tool (str): Upper-case tool name.
+            n_ahead (int): Number of tickets ahead in the queue. ``-1`` only
+                counts the free tokens.
+
+        Returns:
+            tuple: A 2-tuple ``(token, n_free)``, the locked token or
+            ``None``, and the number of free tokens seen.
+        """
+        n_free = 0
+        for i_token in range(self.capacity_dict[tool]):
+            fd = os.open(tool_dir + "token_" + str(i_token) + ".lock", os.O_RDWR | os.O_CREAT)
+            if not _try_lock(fd):
+                os.close(fd)
+                continue
+            if n_free == n_ahead:
+                return fd, n_free + 1
+            _unlock(fd)
+            n_free += 1
+        return None, n_free
+
+    @staticmethod
+    def __add_ticket(tool_dir, priority):
+        """Queue a ticket for a token.
+
+        Args:
+            tool_dir (str): Separator-ending folder of the tool.
+            priority (int): Rank in the queue.
+
+        Returns:
+            str: Name of the ticket.
+        """
+        ticket = "{}_{}_{}_{}.wait".format(
+            str(int(priority)), str(time_ns()), str(os.getpid()), str(next(_TICKET_ID))
+        )
+        os.close(os.open(tool_dir + ticket, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+        return ticket
+
+    @staticmethod
+    def __get_queue(tool_dir):
+        """Get the tickets of live processes in the order they are served.
+
+        Tickets left by a process that is gone are removed on the way.
+
+        Args:
+            tool_dir (str): Separator-ending folder of the tool.
+
+        Returns:
+            list of str: Names of the tickets, the next to serve first.
+        """
+        ticket_list = []
+        for ticket in os.listdir(tool_dir):
+            if not ticket.endswith(".wait"):
+                continue
+            priority, time_stamp, pid, ticket_id = ticket[: -len(".wait")].rsplit("_", 3)
+            if not psutil.pid_exists(int(pid)):
+                try:
+                    os.remove(tool_dir + ticket)
+                except FileNotFoundError:
+                    pass
+                continue
+            rank = (-int(priority), int(time_stamp), int(pid), int(ticket_id))
+            ticket_list.append((rank, ticket))
+        return [ticket for _, ticket in sorted(ticket_list)]
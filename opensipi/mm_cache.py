@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module caches the mixed-mode networks converted from touchstone files.
+
+    Every report on a differential design converts each single-ended network
+to mixed mode again, although the ``Mixed_Mode`` folder beside the results
+already holds the outcome of the last conversion. ``MixedModeCache`` keeps the
+converted network there as an uncompressed ``.npz`` entry and hands it back
+while the entry still fits. An entry fits when it is newer than its source
+file, was converted with the same ``MM_ORDER_IN_SE`` and ``TERM_MM``, and holds
+every quadrant asked for, since a conversion may compute only some of them.
+"""
+
+import json
+import os
+
+import numpy as np
+import skrf as rf
+
+from opensipi.util.common import make_dir
+
+
+class MixedModeCache:
+    """Binary cache of converted mixed-mode networks.
+
+    Attributes:
+        ENTRY_EXT (str): File extension of a cache entry.
+        mm_dir (str): Separator-ending ``Mixed_Mode`` folder holding the
+            entries.
+    """
+
+    def __init__(self, mm_dir):
+        """Set up the cache folder.
+
+        Args:
+            mm_dir (str): Separator-ending folder to keep the entries in.
+                Created if missing.
+        """
+        self.ENTRY_EXT = ".npz"
+        self.mm_dir = mm_dir
+        make_dir(mm_dir)
+
+    def load(self, file_dir, conn_dict, quad_list):
+        """Load a converted network if its entry still fits.
+
+        Args:
+            file_dir (str): Full path of the single-ended snp file.
+            conn_dict (dict): The connectivity, whose ``MM_ORDER_IN_SE`` and
+                ``TERM_MM`` the entry must have been converted with.
+            quad_list (list of str): The quadrants needed, out of ``"DD"``,
+                ``"DC"``, ``"CD"``, and ``"CC"``.
+
+        Returns:
+            skrf.Network: The cached network, or ``None`` when the entry is
+            missing, older than the source, converted differently, short of a
+            needed quadrant, or unreadable.
+        """
+        entry_dir = self.get_entry_dir(file_dir)
+        try:
+            if os.stat(entry_dir).st_mtime_ns < os.stat(file_dir).st_mtime_ns:
+                return None
+            with np.load(entry_dir, allow_pickle=False) as entry:
+                if str(entry["setting"]) != self.__get_setting(conn_dict):
+                    return None
+                if not set(quad_list) <= set(entry["quad_list"].tolist()):
+                    return None
+                nw = rf.Network(
+                    frequency=rf.Frequency.from_f(entry["f"], unit="Hz"),
+                    s=entry["s"],
+                    z0=entry["z0"],
+                    name=os.path.splitext(os.path.basename(file_dir))[0],
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+        return nw
+
+    def save(self, file_dir, conn_dict, quad_list, nw):
+        """Write the entry of a converted network.
+
+        The entry is written under a per-process temporary name and then moved
+        into place, so a concurrent reader never sees a partial file.
+
+        Args:
+            file_dir (str): Full path of the single-ended snp file.
+            conn_dict (dict): The connectivity it was converted with.
+            quad_list (list of str): The quadrants it holds.
+            nw (skrf.Network): The mixed-mode network.
+        """
+        entry_dir = self.get_entry_dir(file_dir)
+        tmp_dir = entry_dir + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_dir, "wb") as f:
+            np.savez(
+                f,
+                f=nw.f,
+                s=nw.s,
+                z0=nw.z0,
+                setting=np.array(self.__get_setting(conn_dict)),
+                quad_list=np.array(quad_list, dtype=str),
+            )
+        os.replace(tmp_dir, entry_dir)
+
+    def get_entry_dir(self, file_dir):
+        """Get the path of the entry belonging to a single-ended snp file.
+
+        Args:
+            file_dir (str): Full path of the snp file.
+
+        Returns:
+            str: Full path of the entry, named after the ``_mm`` touchstone
+            file of the same conversion.
+        """
+        file_name = os.path.splitext(os.path.basename(file_dir))[0]
+        return self.mm_dir + file_name + "_mm" + self.ENTRY_EXT
+
+    def __get_setting(self, conn_dict):
+        """Get the conversion settings an entry is tied to, as one string.
+
+        Args:
+            conn_dict (dict): The connectivity.
+
+        Returns:
+            str: ``MM_ORDER_IN_SE`` and ``TERM_MM`` in JSON.
+        """
+        setting = [conn_dict["MM_ORDER_IN_SE"], conn_dict.get("TERM_MM")]
+        return json.dumps(setting, default=int)
@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module renders the report figures on reused Agg canvases.
+
+    Going through pyplot, every figure pays for a new figure, a new axes, the
+axis scales, the labels, and the grid, and then for closing it all down again,
+which is most of the cost of a report holding hundreds of small plots.
+``PlotCanvas`` keeps one Agg figure per plot style alive instead. The fixed
+parts of a style are set up once, and each plot only swaps in its title, its
+line data, and its legend before the png is written. Lines are reused as long
+as the drawing options of a curve stay the same, and rebuilt otherwise.
+
+    A curve with more points than the axes have pixel columns is thinned out
+first, see ``opensipi.curve_decimation``, with the method its style names.
+Up to that point count the output is the same png pyplot would write, pixel
+for pixel, so the file names, titles, and looks the report builders rely on do
+not change.
+"""
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from opensipi.curve_decimation import lttb_index, minmax_log_index
+
+
+class PlotCanvas:
+    """Persistent Agg figures, one per plot style.
+
+    Attributes:
+        STYLE_VERSION (int): Version of the look of the figures. Bumped on any
+            change to how a figure is drawn, so the outputs recorded by
+            ``opensipi.plot_manifest.PlotManifest`` are drawn anew.
+        PLOT_STYLE (dict): Style name to its fixed settings, being the axis
+            scales, the axis labels, whether the legend is drawn only when
+            a curve has a label or always, and how long curves are thinned
+            out, being ``"minmax_log"``, ``"lttb"``, or ``None`` for not at
+            all.
+        fig_dict (dict): Style name to the ``[fig, ax, line_list]`` set up for
+            it so far, where ``line_list`` holds one ``[line, option]`` entry
+            per line on the axes.
+    """
+
+    def __init__(self):
+        """Set up the styles. The figures are created on first use."""
+        self.STYLE_VERSION = 2
+        self.PLOT_STYLE = {
+            "zmag": {
+                "xscale": "log",
+                "yscale": "log",
+                "xlabel": "Frequency (GHz)",
+                "ylabel": "Z(Ohm)",
+                "legend": "labeled",
+                "decimation": "minmax_log",
+            },
+            "smag": {
+                "xscale": "linear",
+                "yscale": "linear",
+                "xlabel": "Frequency (GHz)",
+                "ylabel": "S21 (dB)",
+                "legend": "labeled",
+                "decimation": "lttb",
+            },
+            "time_domain": {
+                "xscale": "linear",
+                "yscale": "linear",
+                "xlabel": "Time (ns)",
+                "ylabel": "Zc (Ohm)",
+                "legend": "always",
+                "decimation": None,
+            },
+        }
+        self.fig_dict = {}
+
+    def render(self, style, fig_data, fig_title, fig_dir, dpi=None):
+        """Draw one figure and save it to a png.
+
+        Args:
+            style (str): One of the keys of ``PLOT_STYLE``.
+            fig_data (list of list): One curve per entry, as ``[x, y]`` or
+                ``[x, y, option]``, where ``option`` is a dict of matplotlib
+                line keyword arguments.
+            fig_title (str): Title drawn on the figure.
+            fig_dir (str): Full path of the png to write.
+            dpi (float, optional): Resolution of the png. Defaults to that of
+                the figure.
+        """
+        fig, ax, _ = self.get_figure(style)
+        self.__update_lines(style, self.decimate(style, fig_data, dpi))
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_title(fig_title)
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        has_label = any(len(i_curve) == 3 and "label" in i_curve[2] for i_curve in fig_data)
+        if has_label or self.PLOT_STYLE[style]["legend"] == "always":
+            ax.legend()
+        fig.savefig(fig_dir, dpi=dpi or "figure")
+
+    def render_batch(self, spec_list):
+        """Draw a list of figures and save each to its png.
+
+        Args:
+            spec_list (list of dict): One figure per entry, holding the
+                ``style``, ``fig_data``, ``fig_title``, and ``fig_dir``
+                arguments of :meth:`render`, and optionally its ``dpi``.
+
+        Returns:
+            list of str: The png paths written, in order.
+        """
+        for spec in spec_list:
+            self.render(
+                spec["style"], spec["fig_data"], spec["fig_title"], spec["fig_dir"], spec.get("dpi")
+            )
+        return [spec["fig_dir"] for spec in spec_list]
+
+    def decimate(self, style, fig_data, dpi=None):
+        """Thin out the curves of a figure to the resolution of its axes.
+
+        The budget is the pixel width of the axes at the png DPI. Min/max
+        bucketing keeps two points per pixel column, and LTTB keeps twice as
+        many points as there are columns. Curves drawn against the same x
+        array are thinned out together.
+
+        Args:
+            style (str): One of the keys of ``PLOT_STYLE``.
+            fig_data (list of list): The curves, as for :meth:`render`.
+            dpi (float, optional): Resolution of the png. Defaults to that of
+                the figure.
+
+        Returns:
+            list of list: The curves to draw, in the same form. Curves within
+            the budget are the very same entries.
+        """
+        method = self.PLOT_STYLE[style]["decimation"]
+        if method is None:
+            return fig_data
+        fig, ax, _ = self.get_figure(style)
+        n_px = max(int(fig.get_figwidth() * (dpi or fig.dpi) * ax.get_position().width), 2)
+        group_dict = {}
+        for i_curve, curve in enumerate(fig_data):
+            if len(curve[0]) > 2 * n_px:
+                group_dict.setdefault(id(curve[0]), []).append(i_curve)
+        thin_data = list(fig_data)
+        for i_list in group_dict.values():
+            x = np.asarray(fig_data[i_list[0]][0])
+            y_stack = np.stack([fig_data[i_curve][1] for i_curve in i_list])
+            if method == "minmax_log":
+                index_list = minmax_log_index(x, y_stack, n_px)
+            else:
+                index_list = lttb_index(x, y_stack, 2 * n_px)
+            for i_curve, y, index in zip(i_list, y_stack, index_list, strict=True):
+                thin_data[i_curve] = [x[index], y[index], *fig_data[i_curve][2:]]
+        return thin_data
+
+    def get_figure(self, style):
+        """Get the figure of a style, setting it up on first use.
+
+        Args:
+            style (str): One of the keys of ``PLOT_STYLE``.
+
+        Returns:
+            list: The ``[fig, ax, line_list]`` entry of the style.
+
+        Raises:
+            KeyError: If the style is unknown.
+        """
+        if style not in self.fig_dict:
+            setting = self.PLOT_STYLE[style]
+            fig = Figure(figsize=(8, 5))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+            ax.set_xscale(setting["xscale"])
+            ax.set_yscale(setting["yscale"])
+            ax.set_xlabel(setting["xlabel"])
+            ax.set_ylabel(setting["ylabel"])
+            ax.grid(which="major", linestyle="-")
+            ax.grid(which="minor", linestyle="--")
+            self.fig_dict[style] = [fig, ax, []]
+        return self.fig_dict[style]
+
+    def __update_lines(self, style, fig_data):
+        """Put the curves on the axes of a style, reusing its lines.
+
+        A curve without an explicit color takes the next one of the color
+        cycle, counted the way pyplot counts it on a fresh axes. That makes the
+        full drawing options of each curve known up front, so a line whose
+        options match is kept and only gets its data and label swapped. From
+        the first mismatch on, the lines are rebuilt to keep the draw order.
+
+        Args:
+            style (str): One of the keys of ``PLOT_STYLE``.
+            fig_data (list of list): The curves, as for :meth:`render`.
+        """
+        _, ax, line_list = self.fig_dict[style]
+        color_list = rcParams["axes.prop_cycle"].by_key()["color"]
+        i_color = 0
+        for i_curve, curve in enumerate(fig_data):
+            option = dict(curve[2]) if len(curve) == 3 else {}
+            label = option.pop("label", "_child" + str(i_curve))
+            if "color" not in option:
+                option["color"] = color_list[i_color % len(color_list)]
+                i_color += 1
+            if i_curve < len(line_list) and line_list[i_curve][1] == option:
+                line = line_list[i_curve][0]
+                line.set_data(curve[0], curve[1])
+                line.set_label(label)
+                continue
+            for line, _ in line_list[i_curve:]:
+                line.remove()
+            del line_list[i_curve:]
+            (line,) = ax.plot(curve[0], curve[1], label=label, **option)
+            line_list.append([line, option])
+        for line, _ in line_list[len(fig_data) :]:
+            line.remove()
+        del line_list[len(fig_data) :]
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module records which figures and extracted values a report already
+holds, so an unchanged result is not processed again.
+
+    Regenerating a report on a resumed run, or after a few keys were added,
+renders every png and extracts every value anew, although most snp files have
+not changed. ``PlotManifest`` keeps a ``Manifest`` folder in the plot folder
+with one entry per post-processing key of a touchstone file. The entry is
+named by a hash of everything that output depends on, being the snp content
+hash, the connectivity, the spec type, the settings, and the rendering style
+version, and it holds the output together with the content hash of each png.
+
+    An entry is only trusted while each of its pngs still exists with the
+recorded content. Two snp files of the same simulation key write to the same
+figure names, so a png can be overwritten by another file's output, and the
+content check catches that. Like the touchstone cache, the folder has no shared
+index, so parallel workers read and write entries at the same time safely.
+"""
+
+import hashlib
+import json
+import os
+
+from opensipi.util.common import SL, get_file_hash, make_dir
+
+
+class PlotManifest:
+    """Hash-keyed record of the post-processing outputs in a plot folder.
+
+    Attributes:
+        ENTRY_EXT (str): File extension of a manifest entry.
+        manifest_dir (str): Separator-ending folder holding the entries.
+    """
+
+    def __init__(self, plt_dir):
+        """Set up the manifest folder.
+
+        Args:
+            plt_dir (str): Separator-ending plot folder. The entries are kept
+                in its ``Manifest`` sub-folder, created if missing.
+        """
+        self.ENTRY_EXT = ".json"
+        self.manifest_dir = plt_dir + "Manifest" + SL
+        make_dir(self.manifest_dir)
+
+    def get_input_hash(self, input_dict):
+        """Get the hash naming the entry of a set of inputs.
+
+        Args:
+            input_dict (dict): Everything the output depends on. Values that
+                are not JSON types are hashed by their string form.
+
+        Returns:
+            str: The hex digest of the sha256 hash of the inputs.
+        """
+        text = json.dumps(input_dict, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def load(self, input_hash):
+        """Load the output recorded for some inputs, if it is still valid.
+
+        Args:
+            input_hash (str): The hash from :meth:`get_input_hash`.
+
+        Returns:
+            list or dict: The recorded output, in the form ``auto_process``
+            gives it, or ``None`` when there is no entry or one of its pngs is
+            missing or was overwritten since.
+        """
+        entry_dir = self.manifest_dir + input_hash + self.ENTRY_EXT
+        try:
+            with open(entry_dir, encoding="utf-8") as f:
+                entry = json.load(f)
+            for fig_dir, fig_hash in entry["fig_hash"].items():
+                if get_file_hash(fig_dir) != fig_hash:
+                    return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry["output"]
+
+    def save(self, input_hash, output):
+        """Record the output of some inputs along with its pngs' hashes.
+
+        The entry is written under a per-process temporary name and then moved
+        into place, so a concurrent reader never sees a partial file.
+
+        Args:
+            input_hash (str): The hash from :meth:`get_input_hash`.
+            output (list or dict): The output of one post-processing key, as
+                ``auto_process`` gives it.
+        """
+        entry_dir = self.manifest_dir + input_hash + self.ENTRY_EXT
+        fig_hash = {fig_dir: get_file_hash(fig_dir) for fig_dir in self.__get_fig_dir_list(output)}
+        tmp_dir = entry_dir + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_dir, "w", encoding="utf-8") as f:
+            json.dump({"output": output, "fig_hash": fig_hash}, f)
+        os.replace(tmp_dir, entry_dir)
+
+    def __get_fig_dir_list(self, output):
+        """Get the png paths an output refers to.
+
+        Args:
+            output (list or dict): A list of ``[fig_title, fig_dir, ...]``
+                entries, or a dict of such lists for the mixed-mode keys.
+
+        Returns:
+            list of str: The png paths, in order. An entry left undrawn, whose
+            path is empty, adds none.
+        """
+        if isinstance(output, dict):
+            return [
+                fig_dir for value in output.values() for fig_dir in self.__get_fig_dir_list(value)
+            ]
+        return [i_fig[1] for i_fig in output if i_fig[1]]
@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module fits touchstone networks with compact pole-residue models.
+
+    The result folders only keep the tabulated snp files, so every later
+consumer reloads the full tables and interpolates between their samples.
+``PoleResidueModel`` fits all responses of a network at once with the vector
+fitting of scikit-rf, which relocates one pole set shared by every port pair.
+The model keeps only the poles, one residue per pole and response, and the
+constant and proportional terms. That is a few hundred KB in place of a table
+of hundreds of MB, and it is written as an uncompressed ``.npz`` entry.
+
+    The model is evaluated at any frequency in closed form, for all responses
+in one matrix product, so the self impedances and the RLC values can be read
+at frequencies the sweep never sampled.
+"""
+
+import os
+
+import numpy as np
+import skrf as rf
+
+from opensipi.touchstone import TouchStone
+from opensipi.util.common import SL, make_dir
+
+
+class PoleResidueModel:
+    """Pole-residue model of the S-parameters of one network.
+
+    Each response is ``S(s) = d + s e + sum_k r_k / (s - p_k)``, where every
+    complex pole in ``poles`` also stands for its conjugate, with the
+    conjugate residue.
+
+    Attributes:
+        poles (numpy.ndarray): The shared poles in rad/s. Complex poles are
+            kept with a positive imaginary part only.
+        residues (numpy.ndarray): The residues, indexed
+            ``[output, input, pole]``.
+        constant (numpy.ndarray): The constant terms, indexed
+            ``[output, input]``.
+        proportional (numpy.ndarray): The terms proportional to ``s``, indexed
+            ``[output, input]``.
+        z0 (numpy.ndarray): The real reference impedance of each port.
+        name (str): The network name.
+    """
+
+    def __init__(self, poles, residues, constant, proportional, z0, name=""):
+        """Wrap the terms of a model. Use :meth:`fit` or :meth:`load` instead.
+
+        Args:
+            poles (numpy.ndarray): The shared poles.
+            residues (numpy.ndarray): The residues, ``[output, input, pole]``.
+            constant (numpy.ndarray): The constant terms.
+            proportional (numpy.ndarray): The proportional terms.
+            z0 (numpy.ndarray): The reference impedance of each port.
+            name (str, optional): The network name. Defaults to ``""``.
+        """
+        self.poles = np.asarray(poles, dtype=complex)
+        self.residues = np.asarray(residues, dtype=complex)
+        self.constant = np.asarray(constant, dtype=float)
+        self.proportional = np.asarray(proportional, dtype=float)
+        self.z0 = np.asarray(z0, dtype=float)
+        self.name = name
+
+    @classmethod
+    def fit(cls, nw, n_poles_real=2, n_poles_cmplx=8):
+        """Fit every response of a network with one shared pole set.
+
+        Args:
+            nw (skrf.Network): The network to fit. Its reference impedances
+                are taken as real and constant over frequency.
+            n_poles_real (int, optional): Number of real starting poles.
+                Defaults to ``2``.
+            n_poles_cmplx (int, optional): Number of complex conjugate
+                starting pole pairs. Defaults to ``8``.
+
+        Returns:
+            PoleResidueModel: The fitted model.
+        """
+        n_port = nw.number_of_ports
+        vf = rf.VectorFitting(nw)
+        vf.vector_fit(
+            n_poles_real=n_poles_real, n_poles_cmplx=n_poles_cmplx, init_pole_spacing="log"
+        )
+        return cls(
+            vf.poles,
+            vf.residues.reshape(n_port, n_port, -1),
+            vf.constant_coeff.reshape(n_port, n_port),
+            vf.proportional_coeff.reshape(n_port, n_port),
+            np.real(nw.z0[0]),
+            nw.name or "",
+        )
+
+    @staticmethod
+    def get_model_dir(model_folder, file_dir):
+        """Get the path of the model belonging to a touchstone file.
+
+        Args:
+            model_folder (str): Separator-ending folder holding the models.
+            file_dir (str): Full path of the snp file.
+
+        Returns:
+            str: Full path of the model, named after the snp file.
+        """
+        return model_folder + os.path.splitext(os.path.basename(file_dir))[0] + ".npz"
+
+    def save(self, model_dir):
+        """Write the model.
+
+        The model is written under a per-process temporary name and then moved
+        into place, so a concurrent reader never sees a partial file.
+
+        Args:
+            model_dir (str): Full path of the model file.
+        """
+        make_dir(os.path.dirname(model_dir) + SL)
+        tmp_dir = model_dir + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_dir, "wb") as f:
+            np.savez(
+                f,
+                poles=self.poles,
+                residues=self.residues,
+                constant=self.constant,
+                proportional=self.proportional,
+                z0=self.z0,
+                name=np.array(self.name),
+            )
+        os.replace(tmp_dir, model_dir)
+
+    @classmethod
+    def load(cls, model_dir):
+        """Read a model written by :meth:`save`.
+
+        Args:
+            model_dir (str): Full path of the model file.
+
+        Returns:
+            PoleResidueModel: The model.
+        """
+        with np.load(model_dir, allow_pickle=False) as entry:
+            return cls(
+                entry["poles"],
+                entry["residues"],
+                entry["constant"],
+                entry["proportional"],
+                entry["z0"],
+                str(entry["name"]),
+            )
+
+    def get_s(self, f):
+        """Evaluate the S-parameters of the model.
+
+        Args:
+            f (array_like of float): The frequencies in Hz.
+
+        Returns:
+            numpy.ndarray: The S-parameters, indexed ``[freq, output, input]``.
+        """
+        s = 2j * np.pi * np.atleast_1d(np.asarray(f, dtype=float))
+        n_port = len(self.z0)
+        residues = self.residues.reshape(n_port * n_port, -1)
+        is_cmplx = self.poles.imag != 0
+        # one column per pole, and one more per conjugate pole
+        basis = 1 / (s[:, None] - self.poles)
+        s_flat = basis @ residues.T
+        if is_cmplx.any():
+            conj_basis = 1 / (s[:, None] - self.poles[is_cmplx].conj())
+            s_flat += conj_basis @ residues[:, is_cmplx].conj().T
+        s_flat += self.constant.ravel() + s[:, None] * self.proportional.ravel()
+        return s_flat.reshape(len(s), n_port, n_port)
+
+    def get_network(self, f):
+        """Evaluate the model as a network.
+
+        Args:
+            f (array_like of float): The frequencies in Hz.
+
+        Returns:
+            skrf.Network: The model at those frequencies.
+        """
+        return rf.Network(
+            frequency=rf.Frequency.from_f(f, unit="Hz"),
+            s=self.get_s(f),
+            z0=self.z0,
+            name=self.name,
+        )
+
+    def get_z_self(self, f, port_list):
+        """Evaluate the self impedances of some ports.
+
+        Args:
+            f (array_like of float): The frequencies in Hz.
+            port_list (list of int): Zero-based port indices.
+
+        Returns:
+            numpy.ndarray: The complex self impedances in Ohm, indexed
+            ``[freq, port]`` in the order of ``port_list``. See
+            ``opensipi.touchstone.TouchStone.solve_z_self``.
+        """
+        s = self.get_s(f)
+        z0 = np.broadcast_to(self.z0, s.shape[:2])
+        return TouchStone.solve_z_self(s, z0, port_list)
+
+    def get_rlc(self, port_list, freq_tgt=None):
+        """Read R, L, and C from the model, with no sweep to interpolate.
+
+        Args:
+            port_list (list of int): Zero-based port indices.
+            freq_tgt (numpy.ndarray, optional): The frequencies in Hz the
+                resistance, the capacitance, and the inductance are read at,
+                in that order. Defaults to
+                ``opensipi.touchstone.TouchStone.RLC_FREQ``.
+
+        Returns:
+            tuple: A 3-tuple ``(r_dc, l_hf, c_lf)`` of arrays with one value
+            per port, in mOhm, pH, and nF. See
+            ``opensipi.touchstone.TouchStone.convert_z_to_rlc``.
+        """
+        if freq_tgt is None:
+            freq_tgt = TouchStone.RLC_FREQ
+        z_self = np.abs(self.get_z_self(freq_tgt, port_list))
+        return TouchStone.convert_z_to_rlc(z_self, freq_tgt)
+
+    def get_rms_error(self, nw):
+        """Get the fitting error against a network.
+
+        Args:
+            nw (skrf.Network): The network the model was fitted to.
+
+        Returns:
+            float: The root mean square of the S-parameter error over every
+            frequency and response.
+        """
+        return float(np.sqrt(np.mean(np.abs(self.get_s(nw.f) - nw.s) ** 2)))
@@ -0,0 +1,306 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module exports the plotted curves and the extracted values of a run
+as numeric columns.
+
+    The report only holds pngs and formatted strings, so comparing runs meant
+parsing every snp file again. When the export is on, each drawn figure leaves a
+small curve shard in a ``Curves`` folder beside its png, written by the worker
+that drew it, and the report stage gathers the shards and the extracted values
+of the run into an ``Export`` folder of plain NumPy columns:
+
+* ``curve_index.npy``: one row per curve, being the run, the simulation key,
+  the post-processing key, the port, and where its values sit in the two
+  columns below.
+* ``curve_x.npy`` and ``curve_y.npy``: the x and y values of every curve,
+  concatenated as float32.
+* ``scalar.npy``: one row per extracted value, being the run, the simulation
+  key, the post-processing key, the port, the quantity, and the value.
+
+    The value columns are memory-mapped on reading, so
+``ResultExport.read_curve`` pulls a single curve out of an export of any size
+without loading the rest, and any tool reading ``.npy`` files, pandas and Arrow
+included, can take them in.
+"""
+
+import os
+
+import numpy as np
+
+from opensipi.util.common import SL, make_dir
+
+
+class ResultExport:
+    """Columnar export of the curves and values of one run.
+
+    Attributes:
+        KEY_FIELD (list of str): The fields identifying a curve or a value.
+        export_dir (str): Separator-ending folder the columns are written to.
+        run_name (str): Name of the run, recorded on every row.
+        curve_list (list of tuple): The curves added so far, as
+            ``(sim_key, prockey, port, x, y)``.
+        scalar_list (list of tuple): The values added so far, as
+            ``(sim_key, prockey, port, quantity, value)``.
+    """
+
+    def __init__(self, export_dir, run_name):
+        """Set up an empty export.
+
+        Args:
+            export_dir (str): Separator-ending folder to write to. Created on
+                :meth:`write`.
+            run_name (str): Name of the run.
+        """
+        self.KEY_FIELD = ["run", "sim_key", "prockey", "port"]
+        self.export_dir = export_dir
+        self.run_name = run_name
+        self.curve_list = []
+        self.scalar_list = []
+
+    def add_curve(self, sim_key, prockey, port, x, y):
+        """Add one curve.
+
+        Args:
+            sim_key (str): The simulation key.
+            prockey (str): The post-processing key.
+            port (str): The curve label, e.g. ``"Port1"``, ``"S21"``, or
+                ``"SDD11"``.
+            x (numpy.ndarray): The x values, e.g. frequency in GHz.
+            y (numpy.ndarray): The y values, of the same length.
+        """
+        self.curve_list.append((sim_key, prockey, port, x, y))
+
+    def add_scalar(self, sim_key, prockey, port, quantity, value):
+        """Add one extracted value.
+
+        Args:
+            sim_key (str): The simulation key.
+            prockey (str): The post-processing key.
+            port (str): The port the value belongs to.
+            quantity (str): Name and unit of the value, e.g. ``"L_pH"``.
+            value (float): The value.
+        """
+        self.scalar_list.append((sim_key, prockey, port, quantity, value))
+
+    def add_shard(self, shard_dir, sim_key, prockey):
+        """Add every curve of a shard written by :meth:`save_shard`.
+
+        Args:
+            shard_dir (str): Full path of the shard.
+            sim_key (str): The simulation key.
+            prockey (str): The post-processing key.
+
+        Returns:
+            list of str: The ports of the curves added, in order.
+        """
+        x, y_stack, port_list = self.load_shard(shard_dir)
+        for port, y in zip(port_list, y_stack, strict=True):
+            self.add_curve(sim_key, prockey, port, x, y)
+        return port_list
+
+    def write(self):
+        """Write the columns of everything added.
+
+        Each column is written under a per-process temporary name and then
+        moved into place, so a concurrent reader never sees a partial file.
+        Curves sharing one x array store it once.
+
+        Returns:
+            str: The export folder.
+        """
+        make_dir(self.export_dir)
+        x_offset_dict = {}
+        x_list = []
+        y_list = []
+        x_size = y_size = 0
+        curve_index = np.zeros(len(self.curve_list), dtype=self.__get_curve_dtype())
+        for i_curve, (sim_key, prockey, port, x, y) in enumerate(self.curve_list):
+            if id(x) not in x_offset_dict:
+                x_offset_dict[id(x)] = x_size
+                x_list.append(np.asarray(x, dtype=np.float32))
+                x_size += len(x)
+            y_list.append(np.asarray(y, dtype=np.float32))
+            curve_index[i_curve] = (
+                self.run_name,
+                sim_key,
+                prockey,
+                port,
+                x_offset_dict[id(x)],
+                y_size,
+                len(y),
+            )
+            y_size += len(y)
+        scalar = np.array(
+            [(self.run_name,) + i_scalar for i_scalar in self.scalar_list],
+            dtype=self.__get_scalar_dtype(),
+        )
+        empty = np.zeros(0, dtype=np.float32)
+        self.__save("curve_index", curve_index)
+        self.__save("curve_x", np.concatenate(x_list) if x_list else empty)
+        self.__save("curve_y", np.concatenate(y_list) if y_list else empty)
+        self.__save("scalar", scalar)
+        return self.export_dir
+
+    @staticmethod
+    def read_index(export_dir):
+        """Read the curve index of an export.
+
+        Args:
+            export_dir (str): Separator-ending export folder.
+
+        Returns:
+            numpy.ndarray: The structured curve index, one row per curve.
+        """
+        return np.load(export_dir + "curve_index.npy")
+
+    @classmethod
+    def read_curve(cls, export_dir, sim_key, prockey, port):
+        """Read a single curve, loading only its own values.
+
+        Args:
+            export_dir (str): Separator-ending export folder.
+            sim_key (str): The simulation key.
+            prockey (str): The post-processing key.
+            port (str): The curve label.
+
+        Returns:
+            tuple: The ``(x, y)`` float32 arrays of the curve.
+
+        Raises:
+            KeyError: If the export holds no such curve.
+        """
+        curve_index = cls.read_index(export_dir)
+        match = (
+            (curve_index["sim_key"] == sim_key)
+            & (curve_index["prockey"] == prockey)
+            & (curve_index["port"] == port)
+        )
+        if not match.any():
+            raise KeyError(sim_key + "/" + prockey + "/" + port)
+        row = curve_index[np.argmax(match)]
+        x_col = np.load(export_dir + "curve_x.npy", mmap_mode="r")
+        y_col = np.load(export_dir + "curve_y.npy", mmap_mode="r")
+        x_slice = slice(row["x_offset"], row["x_offset"] + row["length"])
+        y_slice = slice(row["y_offset"], row["y_offset"] + row["length"])
+        return np.array(x_col[x_slice]), np.array(y_col[y_slice])
+
+    @staticmethod
+    def read_scalar(export_dir):
+        """Read the extracted values of an export.
+
+        Args:
+            export_dir (str): Separator-ending export folder.
+
+        Returns:
+            numpy.ndarray: The structured values, one row per value.
+        """
+        return np.load(export_dir + "scalar.npy")
+
+    @staticmethod
+    def get_shard_dir(plt_dir, fig_title):
+        """Get the path of the curve shard of a figure.
+
+        Args:
+            plt_dir (str): Separator-ending plot folder.
+            fig_title (str): Title of the figure, which names its png.
+
+        Returns:
+            str: Full path of the shard, in the ``Curves`` sub-folder.
+        """
+        return plt_dir + "Curves" + SL + fig_title + ".npz"
+
+    @staticmethod
+    def save_shard(shard_dir, x, y_stack, port_list):
+        """Write the curves of one figure to a shard.
+
+        The shard is written under a per-process temporary name and then moved
+        into place, as the figures of a run are drawn by several processes.
+
+        Args:
+            shard_dir (str): Full path of the shard.
+            x (numpy.ndarray): The x values shared by the curves.
+            y_stack (numpy.ndarray): The y values, indexed ``[curve, point]``.
+            port_list (list of str): The label of each curve.
+        """
+        make_dir(os.path.dirname(shard_dir) + SL)
+        tmp_dir = shard_dir + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_dir, "wb") as f:
+            np.savez(
+                f,
+                x=np.asarray(x, dtype=np.float32),
+                y=np.asarray(y_stack, dtype=np.float32),
+                port=np.array(port_list, dtype=str),
+            )
+        os.replace(tmp_dir, shard_dir)
+
+    @staticmethod
+    def load_shard(shard_dir):
+        """Read the curves of one figure from its shard.
+
+        Args:
+            shard_dir (str): Full path of the shard.
+
+        Returns:
+            tuple: ``(x, y_stack, port_list)`` as given to :meth:`save_shard`.
+        """
+        with np.load(shard_dir, allow_pickle=False) as shard:
+            return shard["x"], shard["y"], shard["port"].tolist()
+
+    def __get_curve_dtype(self):
+        """Get the row type of the curve index.
+
+        Returns:
+            numpy.dtype: The key fields as strings, then the offsets into the
+            x and y columns and the point count.
+        """
+        str_field = [
+            (field, self.__get_str_dtype(i_field)) for i_field, field in enumerate(self.KEY_FIELD)
+        ]
+        return np.dtype(str_field + [("x_offset", "i8"), ("y_offset", "i8"), ("length", "i8")])
+
+    def __get_scalar_dtype(self):
+        """Get the row type of the values.
+
+        Returns:
+            numpy.dtype: The key fields and the quantity as strings, then the
+            float64 value.
+        """
+        str_field = [
+            (field, self.__get_str_dtype(i_field)) for i_field, field in enumerate(self.KEY_FIELD)
+        ]
+        quantity_len = max([len(i_scalar[3]) for i_scalar in self.scalar_list], default=1)
+        return np.dtype(str_field + [("quantity", "U" + str(quantity_len)), ("value", "f8")])
+
+    def __get_str_dtype(self, i_field):
+        """Get the string type wide enough for one key field.
+
+        Args:
+            i_field (int): Index of the field in ``KEY_FIELD``.
+
+        Returns:
+            str: A NumPy unicode type code.
+        """
+        if i_field == 0:
+            return "U" + str(max(len(self.run_name), 1))
+        row_list = self.curve_list + self.scalar_list
+        return "U" + str(max([len(row[i_field - 1]) for row in row_list], default=1))
+
+    def __save(self, name, array):
+        """Write one column.
+
+        Args:
+            name (str): Column name, naming the ``.npy`` file.
+            array (numpy.ndarray): The column.
+        """
+        col_dir = self.export_dir + name + ".npy"
+        tmp_dir = col_dir + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_dir, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_dir, col_dir)
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module places the arrays of a network in shared memory.
+
+    The figures of one large touchstone file can be drawn by several worker
+processes at once, but handing each worker the network would pickle the whole
+S matrix once per worker. ``SharedNetwork`` copies the frequency axis, the S
+matrix, and the reference impedances into ``multiprocessing.shared_memory``
+blocks once. A worker attaches to them by name and reads them as NumPy arrays
+without a copy.
+
+    The process that creates the blocks owns them and removes them with
+:meth:`SharedNetwork.release`. An attached process only drops its own mapping
+and leaves the blocks to their owner. The workers are meant to be children of
+the owner, which share its resource tracker, so a block is tracked once and
+cleaned up even if the owner dies first.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import skrf as rf
+
+
+class SharedNetwork:
+    """Network arrays in shared memory, as their owner or as a view of them.
+
+    Attributes:
+        ARRAY_NAME (list of str): The network attributes kept in shared memory.
+            A class attribute, as it is needed before any instance exists.
+        spec (dict): Picklable description of the blocks, to attach with. Maps
+            each array name to ``(block_name, shape, dtype)``, and ``"name"``
+            to the network name.
+        shm_list (list of SharedMemory): The blocks.
+        is_owner (bool): Whether this instance created the blocks.
+        f (numpy.ndarray): The frequency axis in Hz. Set on attached instances
+            only, as are the other network attributes below.
+        s (numpy.ndarray): The S-parameters, indexed ``[freq, output, input]``.
+        z0 (numpy.ndarray): The reference impedances, indexed ``[freq, port]``.
+        frequency (skrf.Frequency): The frequency axis as scikit-rf takes it.
+        name (str): The network name.
+        number_of_ports (int): The port count.
+    """
+
+    ARRAY_NAME = ["f", "s", "z0"]
+
+    def __init__(self, spec, shm_list, is_owner):
+        """Wrap existing blocks. Use :meth:`create` or :meth:`attach` instead.
+
+        Args:
+            spec (dict): The description of the blocks.
+            shm_list (list of SharedMemory): The blocks, in the order of
+                ``ARRAY_NAME``.
+            is_owner (bool): Whether the blocks are to be removed on release.
+        """
+        self.spec = spec
+        self.shm_list = shm_list
+        self.is_owner = is_owner
+
+    @classmethod
+    def create(cls, nw):
+        """Copy the arrays of a network into new shared memory blocks.
+
+        Args:
+            nw (skrf.Network): The network to share.
+
+        Returns:
+            SharedNetwork: The owner of the blocks, holding no views of them.
+        """
+        spec = {"name": nw.name}
+        shm_list = []
+        try:
+            for array_name in cls.ARRAY_NAME:
+                array = np.ascontiguousarray(getattr(nw, array_name))
+                # a block cannot be empty
+                shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+                shm_list.append(shm)
+                np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+                spec[array_name] = (shm.name, array.shape, array.dtype.str)
+        except BaseException:
+            for shm in shm_list:
+                shm.close()
+                shm.unlink()
+            raise
+        return cls(spec, shm_list, True)
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to the blocks of a shared network.
+
+        Args:
+            spec (dict): The ``spec`` of the owner.
+
+        Returns:
+            SharedNetwork: A view of the blocks, carrying the network
+            attributes the post-processing reads.
+        """
+        shm_list = []
+        array_dict = {}
+        for array_name in cls.ARRAY_NAME:
+            block_name, shape, dtype = spec[array_name]
+            shm = SharedMemory(name=block_name)
+            shm_list.append(shm)
+            array_dict[array_name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        view = cls(spec, shm_list, False)
+        view.f = array_dict["f"]
+        view.s = array_dict["s"]
+        view.z0 = array_dict["z0"]
+        view.frequency = rf.Frequency.from_f(view.f, unit="Hz")
+        view.name = spec["name"]
+        view.number_of_ports = view.s.shape[-1]
+        return view
+
+    def release(self):
+        """Drop the mapping of the blocks, and remove them if owned.
+
+        An attached instance must not be used afterwards.
+        """
+        for array_name in self.ARRAY_NAME:
+            self.__dict__.pop(array_name, None)
+        for shm in self.shm_list:
+            shm.close()
+            if self.is_owner:
+                shm.unlink()
+        self.shm_list = []
@@ -22,27 +22,32 @@ handful of methods that differ, being which modeler to build, how strict the
 port format check is, and where the result files land.
 
     Progress is tracked through ``.done`` marker files rather than through the
-solver's exit status, because the solver is launched detached and runs in its
-own process. That is also why the monitor watches the process list to notice a
-solver that died, and why an interrupted run can be resumed: whatever already
-has a marker is simply not redone.
+solver's exit status, because one solver process runs many keys. The exit of
+the solver's processes, which the executor launches and tracks by PID, only
+tells a crash apart from a slow key. An interrupted run can be resumed, since
+whatever already has a marker is simply not redone.
 """
 
 import math
 import os
+import queue
 import re
 import shutil
-from time import perf_counter, sleep
-
-import psutil
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from time import perf_counter
 
 from opensipi.constants.CONSTANTS import SIM_INPUT_COL_TITLE
+from opensipi.done_watcher import DoneWatcher
+from opensipi.license_pool import LicensePool
+from opensipi.result_export import ResultExport
 from opensipi.sigrity_tools import (
     ClarityModeler,
     PowerdcModeler,
     PowersiIOModeler,
     PowersiPdnModeler,
 )
+from opensipi.solver_process import SolverProcess
 from opensipi.util.common import (
     SL,
     csv2dict,
@@ -292,6 +297,61 @@ class PowersiPdnExec:
                 * ``op_pause_after_model_check`` (int, optional): ``1`` to
                   pause after model check. Absent or ``0`` runs straight
                   through.
+                * ``op_solver_shards`` (int, optional): Number of solver
+                  instances the model check and the simulations are spread
+                  over. See :meth:`_run_stage`. Defaults to ``1``.
+                * ``op_priority`` (int, optional): Rank of this run's solver
+                  launches in the queue for license tokens. Higher is served
+                  first. See :meth:`_run_monitor`. Defaults to ``0``.
+                * ``op_sample_sec`` (float, optional): Seconds between two logs
+                  of the CPU time and the memory of the solver processes.
+                  Defaults to ``120``.
+                * ``op_pipeline`` (int, optional): ``1`` to start simulating
+                  each key as soon as its model passes the checks, rather
+                  than after the whole model check stage. See
+                  :meth:`_model_pipeline`. Ignored when pausing after model
+                  check. Defaults to ``0``.
+                * ``op_snp_workers`` (int, optional): Number of worker
+                  processes the report stage post-processes the touchstone
+                  files with. Recorded in the result config. Defaults to
+                  ``1``.
+                * ``op_snp_cache_mb`` (float, optional): Size cap in MiB of
+                  the binary touchstone cache the report stage reads
+                  through. Recorded in the result config. Defaults to ``0``,
+                  which disables the cache.
+                * ``op_tdr_settings`` (dict, optional): ``rise_time``,
+                  ``window``, and ``span`` of the TDR plots. Recorded in the
+                  result config. Defaults to ``{}``, which keeps the defaults.
+                * ``op_plot_reuse`` (int, optional): ``1`` to let the report
+                  stage reuse the figures and values of an earlier report
+                  whose inputs are unchanged. Recorded in the result config.
+                  Defaults to ``0``.
+                * ``op_mm_settings`` (dict, optional): ``cache``,
+                  ``quadrants``, and ``write_snp`` of the mixed-mode
+                  conversion. Recorded in the result config. Defaults to
+                  ``{}``, which keeps the defaults.
+                * ``op_snp_batch_mb`` (float, optional): Size cap in MiB of
+                  the stacks the report stage post-processes same-grid files
+                  in. Recorded in the result config. Defaults to ``0``, which
+                  processes one file at a time.
+                * ``op_plot_workers`` (int, optional): Number of worker
+                  processes the report stage draws the figures of each file
+                  with. Recorded in the result config. Defaults to ``1``.
+                * ``op_export`` (int, optional): ``1`` to export the curves
+                  and extracted values as numeric columns. Recorded in the
+                  result config. A DCR run exports its worst resistances
+                  right away. Defaults to ``0``.
+                * ``op_vf_settings`` (dict, optional): Pole counts of the
+                  pole-residue models the report stage fits to every
+                  touchstone file. Recorded in the result config. Defaults
+                  to ``{}``, which fits no models.
+                * ``op_mask_plot`` (int, optional): ``0`` to only check the
+                  ``ZMASK`` target impedance masks in the report stage and
+                  draw no figures for them. Recorded in the result config.
+                  Defaults to ``1``.
+                * ``op_precision`` (str, optional): ``"single"`` to hold the
+                  S matrices of the report stage in complex64. Recorded in
+                  the result config. Defaults to ``"double"``.
 
         Returns:
             tuple: A 2-tuple ``(result_config_dir, report_config_dir)``, the
@@ -304,18 +364,35 @@ class PowersiPdnExec:
             UnequalPortCounts: If the solver built a different number of ports
                 than the input declared.
         """
+        # report stage settings, handed over through the result config
+        self.snp_workers = mntr_info.get("op_snp_workers", 1)
+        self.snp_cache_mb = mntr_info.get("op_snp_cache_mb", 0)
+        self.tdr_settings = mntr_info.get("op_tdr_settings", {})
+        self.plot_reuse = mntr_info.get("op_plot_reuse", 0)
+        self.mm_settings = mntr_info.get("op_mm_settings", {})
+        self.snp_batch_mb = mntr_info.get("op_snp_batch_mb", 0)
+        self.plot_workers = mntr_info.get("op_plot_workers", 1)
+        self.export = mntr_info.get("op_export", 0)
+        self.mask_plot = mntr_info.get("op_mask_plot", 1)
+        self.vf_settings = mntr_info.get("op_vf_settings", {})
+        self.precision = mntr_info.get("op_precision", "double")
         # create the parent spd file
         self.__mk_parent_spd(mntr_info)
         # initial check for the input formats and existence of the comps/nets
         self._init_check()
-        # check for the port setups and cap SPICE models
-        self._model_check(mntr_info)
-        if "op_pause_after_model_check" not in mntr_info:
-            pass
-        elif mntr_info["op_pause_after_model_check"] == 1:
-            self.__pause_for_user_inputs()
-        # extract S-parameters
-        self.__model_xtract(mntr_info)
+        pause = mntr_info.get("op_pause_after_model_check", 0) == 1
+        if mntr_info.get("op_pipeline", 0) == 1 and not pause:
+            # check the models and extract S-parameters key by key
+            self._model_pipeline(mntr_info)
+        else:
+            if mntr_info.get("op_pipeline", 0) == 1:
+                self.lg.debug("The pipeline is off when pausing after model check.")
+            # check for the port setups and cap SPICE models
+            self._model_check(mntr_info)
+            if pause:
+                self.__pause_for_user_inputs()
+            # extract S-parameters
+            self.__model_xtract(mntr_info)
         # relocate result files
         self._relocate_results()
         # export result config yaml
@@ -363,7 +440,9 @@ class PowersiPdnExec:
         key2sim = self.run_info["run_info_check"]["key2sim"]
         # create model check spd files for each sim
         if key2sim != []:
-            self._run_monitor(mntr_info, self.run_info["run_info_check"])
+            self._run_stage(
+                mntr_info, self.run_info["run_info_check"], self.spd_proj.mk_check_shard_tcl
+            )
             # compare port counts
             self.__compare_port_count()
             # detect cap SPICE models
@@ -379,26 +458,263 @@ class PowersiPdnExec:
         """
         key2sim = self.run_info["run_info_sim"]["key2sim"]
         if key2sim != []:
-            self._run_monitor(mntr_info, self.run_info["run_info_sim"])
+            self._run_stage(
+                mntr_info, self.run_info["run_info_sim"], self.spd_proj.mk_run_shard_tcl
+            )
+        else:
+            self.lg.debug("Key is empty! No sim is conducted!")
+
+    def _model_pipeline(self, mntr_info):
+        """Check the models and extract S parameters, overlapping the two.
+
+        The model check stage runs as usual in a thread of its own, while the
+        per-key markers of its folder are watched. As soon as a key's model is
+        built, its ports and capacitors are checked by :meth:`_check_model_key`
+        and the key is queued for simulation. ``op_solver_shards`` simulation
+        workers take the queued keys, each launching one solver on all the keys
+        queued since its last launch. The solver is thus kept busy while the
+        models of the later keys are still being built.
+
+        Keys whose model was checked by an earlier run are queued first. A key
+        failing the port count is not simulated, but the others carry on, and
+        the mismatches are raised once everything is done.
+
+        Args:
+            mntr_info (dict): Monitor related information, read for
+                ``op_solver_shards``.
+
+        Raises:
+            UnequalPortCounts: If the built port count differs from the
+                declared one for any simulation.
+        """
+        run_info_check = self.run_info["run_info_check"]
+        key2check = run_info_check["key2sim"]
+        key2sim = self.run_info["run_info_sim"]["key2sim"]
+        worker_num = max(min(mntr_info.get("op_solver_shards", 1), len(key2sim)), 1)
+        sim_queue = queue.Queue()
+        i_batch = count()
+        unequal_ports_key = []
+        with ThreadPoolExecutor(max_workers=worker_num + 1) as pool:
+            sim_list = [
+                pool.submit(self.__sim_worker, mntr_info, sim_queue, i_batch)
+                for _ in range(worker_num)
+            ]
+            try:
+                # keys checked by an earlier run are ready to go
+                for i_key in [key for key in key2sim if key not in key2check]:
+                    self.__queue_checked_key(i_key, sim_queue, unequal_ports_key)
+                if key2check != []:
+                    check = pool.submit(
+                        self._run_stage,
+                        mntr_info,
+                        run_info_check,
+                        self.spd_proj.mk_check_shard_tcl,
+                    )
+                    self.__follow_model_check(check, sim_queue, unequal_ports_key)
+                else:
+                    self.lg.debug("Key is empty! No check is conducted!")
+            finally:
+                # one stop sign per worker, behind the queued keys
+                for _ in range(worker_num):
+                    sim_queue.put(None)
+            for future in sim_list:
+                future.result()
+        if key2sim != []:
+            run_info_sim = self.run_info["run_info_sim"]
+            txtfile_wr(run_info_sim["run_dir"] + run_info_sim["done_file"], "")
         else:
             self.lg.debug("Key is empty! No sim is conducted!")
+        if unequal_ports_key != []:
+            raise UnequalPortCounts(self.lg, unequal_ports_key)
+
+    def __follow_model_check(self, check, sim_queue, unequal_ports_key):
+        """Queue each key for simulation as soon as its model is checked.
+
+        Args:
+            check (concurrent.futures.Future): The running model check stage.
+            sim_queue (queue.Queue): The keys waiting for simulation.
+            unequal_ports_key (list of str): The keys failing the port count,
+                appended to.
+        """
+        run_dir = self.run_info["run_info_check"]["run_dir"]
+        pending = list(self.run_info["run_info_check"]["key2sim"])
+        watcher = DoneWatcher(run_dir)
+        try:
+            while pending:
+                name_list = [key + ".done" for key in pending]
+                done_list = watcher.wait(name_list, 5)
+                if not done_list and check.done():
+                    check.result()
+                    # a last look, for markers written as the stage ended
+                    done_list = watcher.wait(name_list, 0)
+                    if not done_list:
+                        self.lg.debug("Model check ended without " + ", ".join(pending) + "!")
+                        break
+                for i_key in [key for key in pending if key + ".done" in done_list]:
+                    pending.remove(i_key)
+                    self.__queue_checked_key(i_key, sim_queue, unequal_ports_key)
+        finally:
+            watcher.close()
+        check.result()
+
+    def __queue_checked_key(self, i_key, sim_queue, unequal_ports_key):
+        """Check the model of one key and queue it for simulation if it passes.
+
+        Args:
+            i_key (str): The simulation key, whose model check is done.
+            sim_queue (queue.Queue): The keys waiting for simulation.
+            unequal_ports_key (list of str): The keys failing the port count,
+                appended to.
+        """
+        if not self._check_model_key(i_key):
+            unequal_ports_key.append(i_key)
+            self.lg.debug("Sim is dropped for " + i_key + " due to unequal port counts!")
+        elif i_key in self.run_info["run_info_sim"]["key2sim"]:
+            sim_queue.put(i_key)
+            self.lg.debug("Sim is queued for " + i_key + ".")
+
+    def _check_model_key(self, i_key):
+        """Check the port count and the cap models of one simulation.
+
+        The per-key counterpart of the checks of :meth:`_model_check`. A cap
+        model issue only warns.
+
+        Args:
+            i_key (str): The simulation key.
+
+        Returns:
+            bool: Whether the built port count equals the declared one.
+        """
+        unequal_ports_key = self.__get_unequal_port_keys([i_key])
+        self.__check_cap_model([i_key])
+        return unequal_ports_key == []
+
+    def __sim_worker(self, mntr_info, sim_queue, i_batch):
+        """Simulate queued keys in batches until a stop sign is taken.
+
+        Every key queued by the time the worker is free makes one batch, with
+        a run script and a stage marker of its own.
+
+        Args:
+            mntr_info (dict): Monitor related information.
+            sim_queue (queue.Queue): The keys waiting for simulation, ended by
+                one ``None`` per worker.
+            i_batch (itertools.count): Batch index shared by the workers.
+        """
+        run_dir = self.run_info["run_info_sim"]["run_dir"]
+        stop = False
+        while not stop:
+            batch_key = [sim_queue.get()]
+            while batch_key[-1] is not None:
+                try:
+                    batch_key.append(sim_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch_key[-1] is None:
+                stop = True
+                batch_key.pop()
+            if batch_key == []:
+                continue
+            tcl_dir, done_file = self.spd_proj.mk_run_shard_tcl(batch_key, next(i_batch))
+            # a marker left by an interrupted run would end the wait early
+            if os.path.exists(run_dir + done_file):
+                os.remove(run_dir + done_file)
+            batch_info = dict(self.run_info["run_info_sim"])
+            batch_info.update({"tcl_dir": tcl_dir, "key2sim": batch_key, "done_file": done_file})
+            self._run_monitor(mntr_info, batch_info)
+
+    def _run_stage(self, mntr_info, run_info, mk_shard_tcl):
+        """Run the model check or the simulation stage.
+
+        By default one solver runs the stage's script, going through the keys
+        one after another. With ``op_solver_shards`` above ``1``, the keys are
+        dealt round-robin into that many shards instead, and each shard gets
+        its own script and stage marker from ``mk_shard_tcl``. The shards are
+        launched at once and monitored side by side, each by
+        :meth:`_run_monitor` in a thread of its own. The stage marker is
+        written once every shard is done, as the single script would have.
+
+        The per-key ``.done`` markers are the same either way, so a run can
+        be resumed with a different shard count.
+
+        Args:
+            mntr_info (dict): Monitor related information, read for
+                ``op_solver_shards``.
+            run_info (dict): The ``run_info_check`` or ``run_info_sim``
+                descriptor built by ``__get_run_info``.
+            mk_shard_tcl (callable): The modeler method writing the script of
+                one shard, e.g. ``PowersiPdnModeler.mk_run_shard_tcl``.
+        """
+        key2sim = run_info["key2sim"]
+        shard_num = min(mntr_info.get("op_solver_shards", 1), len(key2sim))
+        if shard_num <= 1:
+            self._run_monitor(mntr_info, run_info)
+            return
+        shard_list = []
+        for i_shard in range(shard_num):
+            shard_key = key2sim[i_shard::shard_num]
+            tcl_dir, done_file = mk_shard_tcl(shard_key, i_shard)
+            # a marker left by an interrupted run would end the wait early
+            if os.path.exists(run_info["run_dir"] + done_file):
+                os.remove(run_info["run_dir"] + done_file)
+            shard_info = dict(run_info)
+            shard_info.update({"tcl_dir": tcl_dir, "key2sim": shard_key, "done_file": done_file})
+            shard_list.append(shard_info)
+        self.lg.debug(str(len(key2sim)) + " keys are split into " + str(shard_num) + " shards.")
+        with ThreadPoolExecutor(max_workers=shard_num) as pool:
+            future_list = [
+                pool.submit(self._run_monitor, mntr_info, shard_info) for shard_info in shard_list
+            ]
+            for future in future_list:
+                future.result()
+        txtfile_wr(run_info["run_dir"] + run_info["done_file"], "")
+        self.lg.debug("All " + str(shard_num) + " shards are done.")
 
     def _run_monitor(self, mntr_info, run_info):
-        """Monitor the scripts running process.
+        """Launch the solver on a script once a license token is free.
 
-        The solver is launched detached, so progress is followed by watching
-        for the ``.done`` marker of each key and this call blocks until they
-        all appear. Every two minutes the process list is checked as well: a
-        solver that has vanished without leaving a marker has crashed, and
-        after three consecutive such observations it is relaunched. After three
-        relaunches the key is written off, its marker is written by hand so the
-        wait can proceed, and the run continues with the remaining keys rather
-        than stalling forever.
+        When ``SIG_LIC_CAP`` of ``config_sigrity.yaml`` gives the solver a
+        capacity, the launch first waits in the machine-wide queue of
+        ``opensipi.license_pool.LicensePool`` for a token, in the order of
+        ``op_priority``. The token is held until the script is done, restarts
+        included, and handed back even if the monitor fails.
 
         Args:
             mntr_info (dict): Monitor related information.
             run_info (dict): One of the three run descriptors built by
                 ``__get_run_info``.
+        """
+        lic_pool = LicensePool(run_info["tool_config"])
+        token = lic_pool.acquire(run_info["tool"], mntr_info.get("op_priority", 0), self.lg)
+        try:
+            self.__monitor_run(mntr_info, run_info)
+        finally:
+            lic_pool.release(token)
+
+    def __monitor_run(self, mntr_info, run_info):
+        """Monitor the scripts running process.
+
+        Progress is followed by watching for the ``.done`` markers of the
+        keys, and this call blocks until they all appear. The markers of every
+        key still to run are watched at once through
+        ``opensipi.done_watcher.DoneWatcher``, which wakes the monitor as soon
+        as one is written, or as soon as the launched solver exits. A solver
+        that is gone without the marker of the current key, being the process
+        tree it was launched as and the process of the PID it reported, has
+        crashed.
+        It is relaunched after ``op_sample_sec``, unless the marker shows up
+        or the solver is found running in the meantime, so a short license or
+        network outage does not use up the relaunches. After three relaunches
+        the key is written off, its marker is written by hand so the wait can
+        proceed, and the solver is launched once more for the remaining keys
+        rather than stalling forever. The CPU time and the memory of the solver's
+        processes are logged every ``op_sample_sec``.
+
+        Args:
+            mntr_info (dict): Monitor related information, read for ``email``
+                and ``op_sample_sec``.
+            run_info (dict): One of the three run descriptors built by
+                ``__get_run_info``.
 
         Note:
             A skipped key still gets a ``.done`` marker, so a later resumed run
@@ -406,6 +722,8 @@ class PowersiPdnExec:
         """
         # define variables from external inputs
         email = mntr_info["email"]
+        SAMPLE_PERIOD = mntr_info.get("op_sample_sec", 120)
+        RESTART_WAIT = SAMPLE_PERIOD  # backoff before a relaunch
 
         tool = run_info["tool"]
         run_dir = run_info["run_dir"]
@@ -421,71 +739,93 @@ class PowersiPdnExec:
         else:
             KNOB_EMAIL = 1
         # internal contants
-        CHECK_TIMES = 3
         MAX_RESTART = 3
+        EXIT_POLL_TIME = 2  # exit check without a pidfd
 
         # execute scripts
-        command = self.__run_tcl(run_info)
-
-        done = run_dir + done_file
-        if key2sim == []:
-            while not os.path.exists(done):
-                self.lg.debug("Waiting for " + done_file + " ...")
-                sleep(5)
-        else:
+        solver = self.__run_tcl(run_info)
+
+        watcher = DoneWatcher(run_dir)
+        try:
+            if key2sim == []:
+                while not watcher.wait([done_file], 5):
+                    self.lg.debug("Waiting for " + done_file + " ...")
+                return
+            pending = list(key2sim)
+            next_sample = perf_counter() + SAMPLE_PERIOD
             i = 0
-            for i_key in key2sim:
+            while pending:
+                i_key = pending[0]
                 self.lg.debug(run_type + " is running for " + i_key + " ...")
                 tic = perf_counter()
-                key_done = run_dir + i_key + ".done"
                 restart_times = 0
-                sample_counter = 0
-                while not os.path.exists(key_done):
-                    sleep(1)
-                    # check every 2 mins
-                    if math.floor((perf_counter() - tic) % 120) == 0:
-                        # if solver is not running
-                        # .exe works for both Windows and non-Windows OS
-                        if not (
-                            (tool + ".exe").upper()
-                            in (p.name().upper() for p in psutil.process_iter())
-                        ):
-                            sample_counter += 1
-                            self.lg.debug(
-                                tool
-                                + ".exe is not running! Detected for "
-                                + str(sample_counter)
-                                + " times. Will retry in 2 mins."
+                skipped = False
+                done_list = []
+                while not done_list:
+                    done_list = self.__wait_solver(
+                        watcher,
+                        [key + ".done" for key in pending],
+                        solver,
+                        next_sample,
+                        EXIT_POLL_TIME,
+                    )
+                    if done_list:
+                        break
+                    if perf_counter() >= next_sample:
+                        next_sample = perf_counter() + SAMPLE_PERIOD
+                        sample = solver.sample()
+                        self.lg.debug(
+                            (
+                                "{} PIDs {} of {} have used {} CPU secs "
+                                + "and hold {} MiB after {} mins."
+                            ).format(
+                                tool,
+                                str(sample["pid_list"]),
+                                i_key,
+                                str(round(sample["cpu_time"])),
+                                str(round(sample["rss_mb"])),
+                                str(math.floor((perf_counter() - tic) / 60)),
+                            )
+                        )
+                    if not solver.is_alive():
+                        self.lg.debug(
+                            "{} has exited with code {} before finishing {}!".format(
+                                tool, str(solver.poll()), i_key
                             )
-                        else:
-                            sample_counter = 0
-                        # if solver is found not running for max times
-                        if sample_counter == CHECK_TIMES:
-                            # if solver is restarted for max times
-                            if restart_times == MAX_RESTART:
-                                spd_done = run_dir + i_key + ".done"
-                                txtfile_wr(spd_done, "")
-                                self.lg.debug(
-                                    (
-                                        "{0}.exe has been restarted {1} "
-                                        + "times and still cannot finish "
-                                        + "sims for {2}. The {3} will be "
-                                        + "skipped!"
-                                    ).format(tool, str(MAX_RESTART), i_key, i_key)
-                                )
-                            os.system(command)
-                            if restart_times == MAX_RESTART:
-                                break
-                            restart_times += 1
+                        )
+                        # back off, so a short outage is not taken for a crash
+                        self.lg.debug("Will retry in " + str(round(RESTART_WAIT)) + " secs.")
+                        done_list = watcher.wait([key + ".done" for key in pending], RESTART_WAIT)
+                        if done_list:
+                            break
+                        if solver.is_alive():
+                            self.lg.debug(tool + " is found running again.")
+                            continue
+                        # if solver is restarted for max times
+                        if restart_times == MAX_RESTART:
+                            spd_done = run_dir + i_key + ".done"
+                            txtfile_wr(spd_done, "")
                             self.lg.debug(
-                                tool
-                                + ".exe is not running in the past "
-                                + str(2 * sample_counter)
-                                + " mins. Restart the tool "
-                                + str(restart_times)
-                                + " times."
+                                (
+                                    "{0} has been restarted {1} "
+                                    + "times and still cannot finish "
+                                    + "sims for {2}. The {3} will be "
+                                    + "skipped!"
+                                ).format(tool, str(MAX_RESTART), i_key, i_key)
                             )
-                            sample_counter = 0
+                        solver.launch()
+                        if restart_times == MAX_RESTART:
+                            skipped = True
+                            done_list = [i_key + ".done"]
+                            break
+                        restart_times += 1
+                        self.lg.debug(
+                            "Restart the tool "
+                            + str(restart_times)
+                            + " times as PID "
+                            + str(solver.popen.pid)
+                            + "."
+                        )
 
                     # send attention email after 1 hour
                     if KNOB_EMAIL and (perf_counter() - tic > 3600) and (email_sent[i] == 0):
@@ -503,50 +843,83 @@ class PowersiPdnExec:
                         }
                         email.send_message(msg)
 
-                toc = perf_counter()
-                time_elapse[i] = toc - tic
-                if sample_counter == 0:
-                    status = "done"
-                else:
-                    status = "SKIPPED"
-                self.lg.debug(
-                    ("{} is {} for {} after {} mins and {} secs!").format(
-                        run_type,
-                        status,
-                        i_key,
-                        str(math.floor(time_elapse[i] / 60)),
-                        str(math.floor(time_elapse[i] % 60)),
+                # several markers can show up at once, the first takes the time
+                for i_done in [key for key in pending if key + ".done" in done_list]:
+                    toc = perf_counter()
+                    time_elapse[i] = toc - tic
+                    tic = toc
+                    status = "SKIPPED" if skipped and i_done == i_key else "done"
+                    self.lg.debug(
+                        ("{} is {} for {} after {} mins and {} secs!").format(
+                            run_type,
+                            status,
+                            i_done,
+                            str(math.floor(time_elapse[i] / 60)),
+                            str(math.floor(time_elapse[i] % 60)),
+                        )
                     )
-                )
-                i = i + 1
-                self.lg.debug(f"{run_type} is done for {str(i)} out of total {str(key_total)}!")
-
-            while not os.path.exists(done):
-                sleep(1)
-            self.lg.debug("Successfully finished all runs!")
-            time_total = sum(time_elapse)
-            self.lg.debug(
-                ("Total elapsed time is {} hours, {} mins, and {} secs!").format(
-                    str(math.floor(time_total / 3600)),
-                    str(math.floor(time_total / 60)),
-                    str(math.floor(time_total % 60)),
-                )
+                    pending.remove(i_done)
+                    i = i + 1
+                    self.lg.debug(f"{run_type} is done for {str(i)} out of total {str(key_total)}!")
+
+            while not self.__wait_solver(
+                watcher, [done_file], solver, perf_counter() + SAMPLE_PERIOD, EXIT_POLL_TIME
+            ):
+                if not solver.is_alive():
+                    self.lg.debug(tool + " has exited without writing " + done_file + "!")
+                    break
+        finally:
+            watcher.close()
+            solver.close()
+        self.lg.debug("Successfully finished all runs!")
+        time_total = sum(time_elapse)
+        self.lg.debug(
+            ("Total elapsed time is {} hours, {} mins, and {} secs!").format(
+                str(math.floor(time_total / 3600)),
+                str(math.floor(time_total / 60)),
+                str(math.floor(time_total % 60)),
             )
+        )
+
+    @staticmethod
+    def __wait_solver(watcher, name_list, solver, deadline, exit_poll_time):
+        """Wait for some markers, the exit of the solver, or a deadline.
+
+        Args:
+            watcher (DoneWatcher): The watcher of the run folder.
+            name_list (list of str): File names of the markers.
+            solver (SolverProcess): The launched solver.
+            deadline (float): ``perf_counter`` time to stop waiting at.
+            exit_poll_time (float): Longest wait in seconds while the solver
+                runs and has no pidfd to wake the watcher with.
+
+        Returns:
+            list of str: The markers of ``name_list`` that exist.
+        """
+        wait_time = max(deadline - perf_counter(), 0)
+        wake_fd = None
+        if solver.poll() is None:
+            wake_fd = solver.exit_fd
+            if wake_fd is None:
+                wait_time = min(wait_time, exit_poll_time)
+        return watcher.wait(name_list, wait_time, wake_fd)
 
     def __run_tcl(self, info):
         """Run tcl scripts.
 
         Builds and launches the OS-specific command line that starts the
         solver on a tcl script. The call returns as soon as the solver is
-        launched, not when it finishes, and the command string is returned so
-        the monitor can reissue it to restart a crashed solver.
+        launched, not when it finishes, with the launched process, which the
+        monitor tracks and relaunches to restart a crashed solver. The script
+        is run through the tcl of :meth:`__mk_launch_tcl`, so the solver
+        reports its own PID.
 
         Args:
             info (dict): One of the three run descriptors, read for its
                 ``tool``, ``tool_config``, and ``tcl_dir``.
 
         Returns:
-            str: The command that was launched.
+            SolverProcess: The launched solver.
 
         Raises:
             UnboundLocalError: On an OS that is neither ``nt`` nor ``posix``.
@@ -554,7 +927,7 @@ class PowersiPdnExec:
         # define variables from external inputs
         tool = info["tool"]
         tool_config = info["tool_config"]
-        tcl_dir = info["tcl_dir"]
+        tcl_dir, pid_dir = self.__mk_launch_tcl(info["tcl_dir"])
 
         KNOB_BG_RUN = tool_config["KNOB_BACKGND_RUN"]
         if KNOB_BG_RUN == 1:
@@ -571,8 +944,7 @@ class PowersiPdnExec:
         if os.name == "nt":  # Windows OS
             sig_dir = slash_ending(os.environ.get("SIGRITY_EDA_DIR")).replace(SL, "/")
             command = (
-                "cmd /c start "
-                + sig_dir
+                sig_dir
                 + "tools/bin/"
                 + tool
                 + ".exe "
@@ -594,12 +966,42 @@ class PowersiPdnExec:
                 + lic_in_use
                 + " -tcl "
                 + tcl_dir.replace(SL, "/")
-                + " &"
             )
         self.lg.debug("The following command will be run: " + command)
-        os.system(command)
-        self.lg.debug("The above command has been launched.")
-        return command
+        solver = SolverProcess(command, pid_dir).launch()
+        self.lg.debug("The above command has been launched as PID " + str(solver.popen.pid) + ".")
+        return solver
+
+    @staticmethod
+    def __mk_launch_tcl(tcl_dir):
+        """Make the tcl the solver is launched on, which records its PID.
+
+        The launch tcl writes the PID of the solver to a file and then runs
+        the script. A solver put in the background by ``CMD_HEADER`` or
+        ``-b`` is then still followed, through that file.
+
+        Args:
+            tcl_dir (str): Full path of the tcl script to run.
+
+        Returns:
+            tuple: A 2-tuple ``(launch_tcl_dir, pid_dir)``, the full paths of
+            the launch tcl and of the PID file it writes.
+        """
+        tcl_stem = tcl_dir[: -len(".tcl")] if tcl_dir.endswith(".tcl") else tcl_dir
+        launch_tcl_dir = tcl_stem + "_launch.tcl"
+        pid_dir = tcl_stem + ".pid"
+        launch_tcl = (
+            'set pid_file [open "'
+            + pid_dir.replace(SL, "/")
+            + '" w]\n'
+            + "puts $pid_file [pid]\n"
+            + "close $pid_file\n"
+            + "source {"
+            + tcl_dir.replace(SL, "/")
+            + "}\n"
+        )
+        txtfile_wr(launch_tcl_dir, launch_tcl)
+        return launch_tcl_dir, pid_dir
 
     def __pause_for_user_inputs(self):
         """Pause the scripts and wait for user's inputs.
@@ -655,9 +1057,14 @@ class PowersiPdnExec:
         """Export result config yaml for easy snp processing.
 
         Records what the post-processing stage needs, being the port
-        connectivity, which keys were enabled, each key's spec type, and where
-        the results and plots live. Writing it to disk is what lets the report
-        stage run separately from the extraction.
+        connectivity, which keys were enabled, each key's spec type, where
+        the results and plots live, and how to post-process them, being the
+        worker count, the touchstone cache cap, the TDR settings, whether
+        earlier plots may be reused, the mixed-mode conversion settings, the
+        stack size cap, the per-file plot worker count, whether the curves
+        and values are exported, whether the mask checks are drawn, the pole
+        counts of the fitted models, and the precision of the S matrices. Writing it to disk is what lets the
+        report stage run separately from the extraction.
 
         Returns:
             str: Full path of the yaml file written.
@@ -669,6 +1076,17 @@ class PowersiPdnExec:
             "spectype": self.__get_spectype_dict(),
             "result_sub_dirs": self.result_sub_dirs,
             "plot_dir": self.plot_dir,
+            "op_snp_workers": self.snp_workers,
+            "op_snp_cache_mb": self.snp_cache_mb,
+            "op_tdr_settings": self.tdr_settings,
+            "op_plot_reuse": self.plot_reuse,
+            "op_mm_settings": self.mm_settings,
+            "op_snp_batch_mb": self.snp_batch_mb,
+            "op_plot_workers": self.plot_workers,
+            "op_export": self.export,
+            "op_mask_plot": self.mask_plot,
+            "op_vf_settings": self.vf_settings,
+            "op_precision": self.precision,
         }
         export_dict_to_yaml(data, result_config_dir)
         return result_config_dir
@@ -1136,28 +1554,43 @@ class PowersiPdnExec:
             UnequalPortCounts: If any simulation's built port count differs
                 from its declared one.
         """
-        # extract the counts of the actually generated ports in a spd
-        port_count_spd = self.__get_port_count_spd()
-        # compare
-        input_key = list(self.sim_input.keys())
-        unequal_ports_key = [
-            i_key for i_key in input_key if port_count_spd[i_key] != self._port_count_defined[i_key]
-        ]
+        unequal_ports_key = self.__get_unequal_port_keys(list(self.sim_input.keys()))
         if unequal_ports_key == []:
             self.lg.debug("Port counts are checked. Everything is correct! ")
         else:
             raise UnequalPortCounts(self.lg, unequal_ports_key)
 
-    def __get_port_count_spd(self):
+    def __get_unequal_port_keys(self, input_key):
+        """Get the simulations whose built port count differs from the declared.
+
+        Args:
+            input_key (list of str): The simulation keys to compare.
+
+        Returns:
+            list of str: The keys of ``input_key`` with a port count mismatch.
+        """
+        # extract the counts of the actually generated ports in a spd
+        port_count_spd = self.__get_port_count_spd(input_key)
+        # compare
+        return [
+            i_key for i_key in input_key if port_count_spd[i_key] != self._port_count_defined[i_key]
+        ]
+
+    def __get_port_count_spd(self, input_key=None):
         """Extract the counts of the actually generated ports in spd file.
 
         Read from the ``Ports_...csv`` files the model check stage exported,
         by counting the lines starting with ``Port_``.
 
+        Args:
+            input_key (list of str, optional): The simulation keys to count.
+                Defaults to every key of the input.
+
         Returns:
             dict: Simulation key to the number of ports actually built.
         """
-        input_key = list(self.sim_input.keys())
+        if input_key is None:
+            input_key = list(self.sim_input.keys())
         port_count_spd = {}
         for i_key in input_key:
             port_csv_dir = self.spd_proj.model_check_dir + "Ports_" + i_key + ".csv"
@@ -1169,7 +1602,7 @@ class PowersiPdnExec:
             port_count_spd[i_key] = port_count
         return port_count_spd
 
-    def __check_cap_model(self):
+    def __check_cap_model(self, input_key=None):
         """Check if SPICE models are used for a cap.
 
         The assumption is that a SPICE model will be longer than 5 lines, so
@@ -1178,12 +1611,17 @@ class PowersiPdnExec:
         RLC models are typically inaccurate, but not wrong enough to stop the
         run, so this only warns.
 
+        Args:
+            input_key (list of str, optional): The simulation keys to check.
+                Defaults to every key of the input.
+
         Note:
             Capacitors are recognized by their RefDes prefix, ``C`` by default.
             A design naming them otherwise needs ``CapRefDes`` set, or every
             simulation is reported as having no caps.
         """
-        input_key = list(self.sim_input.keys())
+        if input_key is None:
+            input_key = list(self.sim_input.keys())
         cap_model_lines = {}
         for i_key in input_key:
             cap_csv_dir = self.spd_proj.model_check_dir + "Caps_" + i_key + ".csv"
@@ -1282,7 +1720,8 @@ class PowersiPdnExec:
 
         Returns:
             dict: Simulation key to its spec type definition, holding ``FREQ``
-            and ``POST_PROCESS_KEY``. Covers every simulation, enabled or not.
+            and ``POST_PROCESS_KEY``, and ``Z_MASK`` for a spec type with
+            one. Covers every simulation, enabled or not.
 
         Raises:
             KeyError: If a simulation names a spec type that is neither
@@ -1519,6 +1958,17 @@ class PowerdcExec(PowersiPdnExec):
         inst.mk_tcl()
         return inst
 
+    def _check_model_key(self, i_key):
+        """Pass every model, as no port or cap check applies to DCR.
+
+        Args:
+            i_key (str): The simulation key.
+
+        Returns:
+            bool: Always ``True``.
+        """
+        return True
+
     def _model_check(self, mntr_info):
         """Build the check models, without the port and cap checks.
 
@@ -1532,7 +1982,9 @@ class PowerdcExec(PowersiPdnExec):
         key2sim = self.run_info["run_info_check"]["key2sim"]
         # create model check spd files for each sim
         if key2sim != []:
-            self._run_monitor(mntr_info, self.run_info["run_info_check"])
+            self._run_stage(
+                mntr_info, self.run_info["run_info_check"], self.spd_proj.mk_check_shard_tcl
+            )
         else:
             self.lg.debug("Key is empty! No check is conducted!")
 
@@ -1638,8 +2090,29 @@ class PowerdcExec(PowersiPdnExec):
         tmp_list = [",".join(tmp) for tmp in new_list]
         output_str = "\n".join(tmp_list)
         txtfile_wr(report_csv, output_str)
+        if self.export:
+            self.__export_dcr(new_result)
         return new_result
 
+    def __export_dcr(self, dcr_dict):
+        """Export the worst resistances as numeric columns.
+
+        A DCR run has no curves, so only the values are written, into the
+        ``Export`` folder of the report directory. See
+        ``opensipi.result_export.ResultExport``.
+
+        Args:
+            dcr_dict (dict): Simulation key to its worst resistance in mOhm,
+                as a string.
+
+        Returns:
+            str: The export folder written.
+        """
+        export = ResultExport(self.report_dir + "Export" + SL, "Run_" + self.spd_proj.run_name)
+        for i_key, r_str in dcr_dict.items():
+            export.add_scalar(i_key, "DCR", "", "DCR_worst_mOhm", float(r_str))
+        return export.write()
+
     def __get_key_net_ckt(self):
         """Get a list of key, net, and ckt info.
 
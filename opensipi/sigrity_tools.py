@@ -887,6 +887,23 @@ class PowersiPdnModeler(SpdModeler):
         Args:
             key2check (list of str): The simulation keys to build models for.
         """
+        temp_tcl = self.__get_check_tcl(key2check, self.model_check_dir + self.CHECK_DONE_FILENAME)
+        # export a tcl script
+        txtfile_wr(self.check_tcl_dir, temp_tcl)
+        txtfile_wr(self.loc_script_dir + self.CHECK_COPY_TCL, temp_tcl)
+        self.lg.debug("check.tcl and its real-time copy are created.")
+
+    def __get_check_tcl(self, key2check, done_dir):
+        """Fill the model check template.
+
+        Args:
+            key2check (list of str): The simulation keys to build models for.
+            done_dir (str): Full path of the marker written once every key is
+                done.
+
+        Returns:
+            str: The tcl script.
+        """
         temp_tcl = txtfile_rd(self.template_dir + self.TEMP_CHECK_TCL)
         temp_tcl = temp_tcl.replace("PROC_COMMON_TCL_DIR", self.PROC_COMMON_TCL_DIR)
         temp_tcl = temp_tcl.replace("BOM_TCL_DIR", self.bom_tcl_dir)
@@ -899,13 +916,8 @@ class PowersiPdnModeler(SpdModeler):
         temp_tcl = temp_tcl.replace("SIM_DATE", self.run_name)
         temp_tcl = temp_tcl.replace("RUN_SIM", "false")
         temp_tcl = temp_tcl.replace("EXPORT_PORT", self.EXPORT_PORT)
-        temp_tcl = temp_tcl.replace(
-            "RUN_DONE", (self.model_check_dir + self.CHECK_DONE_FILENAME).replace(SL, "/")
-        )
-        # export a tcl script
-        txtfile_wr(self.check_tcl_dir, temp_tcl)
-        txtfile_wr(self.loc_script_dir + self.CHECK_COPY_TCL, temp_tcl)
-        self.lg.debug("check.tcl and its real-time copy are created.")
+        temp_tcl = temp_tcl.replace("RUN_DONE", done_dir.replace(SL, "/"))
+        return temp_tcl
 
     # ==========================================================================
     # __mk_run_tcl() related methods
@@ -921,18 +933,89 @@ class PowersiPdnModeler(SpdModeler):
         Args:
             key2sim (list of str): The simulation keys to run.
         """
+        temp_tcl = self.__get_run_tcl(key2sim, self.sim_dir + self.SIM_DONE_FILENAME)
+        # export a tcl script
+        txtfile_wr(self.sim_tcl_dir, temp_tcl)
+        txtfile_wr(self.loc_script_dir + self.RUN_COPY_TCL, temp_tcl)
+        self.lg.debug("run.tcl and its real-time copy are created.")
+
+    def __get_run_tcl(self, key2sim, done_dir):
+        """Fill the run template.
+
+        Args:
+            key2sim (list of str): The simulation keys to run.
+            done_dir (str): Full path of the marker written once every key is
+                done.
+
+        Returns:
+            str: The tcl script.
+        """
         temp_tcl = txtfile_rd(self.template_dir + self.TEMP_RUN_TCL)
         temp_tcl = temp_tcl.replace("SIM_KEY", "\n".join(key2sim))
         temp_tcl = temp_tcl.replace("CK_DIR", self.model_check_dir.replace(SL, "/"))
         temp_tcl = temp_tcl.replace("SIM_DIR", self.sim_dir.replace(SL, "/"))
         temp_tcl = temp_tcl.replace("SIM_DATE", self.run_name)
-        temp_tcl = temp_tcl.replace(
-            "RUN_DONE", (self.sim_dir + self.SIM_DONE_FILENAME).replace(SL, "/")
-        )
-        # export a tcl script
-        txtfile_wr(self.sim_tcl_dir, temp_tcl)
-        txtfile_wr(self.loc_script_dir + self.RUN_COPY_TCL, temp_tcl)
-        self.lg.debug("run.tcl and its real-time copy are created.")
+        temp_tcl = temp_tcl.replace("RUN_DONE", done_dir.replace(SL, "/"))
+        return temp_tcl
+
+    # ==========================================================================
+    # Shard related methods
+    # ==========================================================================
+    def mk_check_shard_tcl(self, key2check, i_shard):
+        """Make the model check tcl of one shard of the keys.
+
+        A shard is run by its own solver instance next to the others, so it
+        gets its own script and its own stage marker. The per-key ``.done``
+        markers are shared with the unsharded script, so keys finished by
+        either are skipped by both.
+
+        Args:
+            key2check (list of str): The simulation keys of the shard.
+            i_shard (int): Index of the shard.
+
+        Returns:
+            tuple: A 2-tuple ``(tcl_dir, done_file)``, the full path of the
+            script and the name of its marker in ``model_check_dir``.
+        """
+        done_file = self.get_shard_name(self.CHECK_DONE_FILENAME, i_shard)
+        tcl_dir = self.loc_script_dir + self.get_shard_name(self.CHECK_TCL, i_shard)
+        txtfile_wr(tcl_dir, self.__get_check_tcl(key2check, self.model_check_dir + done_file))
+        self.lg.debug(tcl_dir + " is created for " + str(len(key2check)) + " keys.")
+        return tcl_dir, done_file
+
+    def mk_run_shard_tcl(self, key2sim, i_shard):
+        """Make the run tcl of one shard of the keys.
+
+        See :meth:`mk_check_shard_tcl`.
+
+        Args:
+            key2sim (list of str): The simulation keys of the shard.
+            i_shard (int): Index of the shard.
+
+        Returns:
+            tuple: A 2-tuple ``(tcl_dir, done_file)``, the full path of the
+            script and the name of its marker in ``sim_dir``.
+        """
+        done_file = self.get_shard_name(self.SIM_DONE_FILENAME, i_shard)
+        tcl_dir = self.loc_script_dir + self.get_shard_name(self.RUN_TCL, i_shard)
+        txtfile_wr(tcl_dir, self.__get_run_tcl(key2sim, self.sim_dir + done_file))
+        self.lg.debug(tcl_dir + " is created for " + str(len(key2sim)) + " keys.")
+        return tcl_dir, done_file
+
+    @staticmethod
+    def get_shard_name(file_name, i_shard):
+        """Get the name of the per-shard copy of a file.
+
+        Args:
+            file_name (str): The unsharded name, e.g. ``"run.tcl"``.
+            i_shard (int): Index of the shard.
+
+        Returns:
+            str: The name with the index before the extension, e.g.
+            ``"run_0.tcl"``.
+        """
+        stem, ext = os.path.splitext(file_name)
+        return stem + "_" + str(i_shard) + ext
 
     # ==========================================================================
     # _mk_key_tcl() related methods
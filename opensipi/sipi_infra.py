@@ -27,8 +27,10 @@ import glob
 import os
 import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 
 import jinja2
+import matplotlib
 from pdfme import build_pdf
 
 from opensipi import __version__
@@ -40,12 +42,15 @@ from opensipi.constants.CONSTANTS import (
 from opensipi.file_in import FileIn
 from opensipi.gdrive_io import XtractResults2Drive
 from opensipi.gsheet_io import DCR2GSheet, TS2GSheet
+from opensipi.pole_residue import PoleResidueModel
+from opensipi.result_export import ResultExport
 from opensipi.sigrity_exec import (
     ClarityExec,
     PowerdcExec,
     PowersiIOExec,
     PowersiPdnExec,
 )
+from opensipi.snp_batch import SnpBatch
 from opensipi.templates.temp_report import io_report, pdn_report
 from opensipi.touchstone import TouchStone
 from opensipi.util.common import (
@@ -481,6 +486,58 @@ class Platform:
                 * ``email`` (str): Notification address. Not enabled yet.
                 * ``op_pause_after_model_check`` (int, optional): ``1`` to
                   pause after model check, ``0`` to run straight through.
+                * ``op_solver_shards`` (int, optional): Number of solver
+                  instances the keys are spread over. Defaults to ``1``.
+                * ``op_priority`` (int, optional): Rank of the solver
+                  launches in the queue for license tokens. Defaults to
+                  ``0``.
+                * ``op_sample_sec`` (float, optional): Seconds between two
+                  logs of the solver's CPU time and memory. Defaults to
+                  ``120``.
+                * ``op_pipeline`` (int, optional): ``1`` to overlap the model
+                  check and the simulations key by key. Defaults to ``0``.
+                * ``op_snp_workers`` (int, optional): Number of worker
+                  processes :meth:`process_snp` uses, recorded in the result
+                  config. Defaults to ``1``.
+                * ``op_snp_cache_mb`` (float, optional): Size cap in MiB of
+                  the binary touchstone cache :meth:`process_snp` reads
+                  through, recorded in the result config. Defaults to ``0``,
+                  which disables the cache.
+                * ``op_tdr_settings`` (dict, optional): ``rise_time``,
+                  ``window``, and ``span`` of the TDR plots, recorded in the
+                  result config. See ``TouchStone.get_tdr``.
+                * ``op_plot_reuse`` (int, optional): ``1`` to let
+                  :meth:`process_snp` reuse the figures and values of an
+                  earlier report whose inputs are unchanged, recorded in the
+                  result config. Defaults to ``0``.
+                * ``op_mm_settings`` (dict, optional): ``cache``,
+                  ``quadrants``, and ``write_snp`` of the mixed-mode
+                  conversion, recorded in the result config. See
+                  ``TouchStone.__init__``.
+                * ``op_snp_batch_mb`` (float, optional): Size cap in MiB of
+                  the stacks :meth:`process_snp` post-processes same-grid
+                  files in when it runs serially, recorded in the result
+                  config. Defaults to ``0``, which processes one file at a
+                  time.
+                * ``op_plot_workers`` (int, optional): Number of worker
+                  processes drawing the figures of each file, recorded in the
+                  result config. Meant for a few very large files. Defaults
+                  to ``1``.
+                * ``op_export`` (int, optional): ``1`` to have
+                  :meth:`process_snp` export every plotted curve and
+                  extracted value as numeric columns, recorded in the result
+                  config. A DCR run exports its worst resistances. Defaults to
+                  ``0``.
+                * ``op_vf_settings`` (dict, optional): ``n_poles_real`` and
+                  ``n_poles_cmplx`` of the pole-residue models
+                  :meth:`process_snp` fits, recorded in the result config.
+                  Defaults to ``{}``, which fits no models.
+                * ``op_mask_plot`` (int, optional): ``0`` to only check the
+                  ``ZMASK`` target impedance masks and draw no figures for
+                  them, recorded in the result config. Defaults to ``1``.
+                * ``op_precision`` (str, optional): ``"single"`` to hold the S
+                  matrices in complex64, recorded in the result config. See
+                  ``TouchStone.__init__``. Defaults to ``"double"``.
 
         Returns:
             tuple: A 2-tuple ``(result_config_dir, report_config_dir)``, the
@@ -489,16 +546,30 @@ class Platform:
         result_config_dir, report_config_dir = sim_exec.run(mntr_info)
         return result_config_dir, report_config_dir
 
-    def process_snp(self, result_config_dir):
+    def process_snp(self, result_config_dir, quick_look=False):
         """Post-process results and generate plots.
 
         Every touchstone file named by the result config is processed according
         to its simulation's spec type, writing the figures into the run's
-        ``Plot`` folder.
+        ``Plot`` folder. When the result config sets ``op_snp_workers`` above
+        ``1``, the files of each result sub-folder are spread over that many
+        worker processes, one file per task. When it sets ``op_export``, the
+        curves and values of the run are then gathered into the ``Export``
+        folder beside the ``Plot`` folder, see
+        ``opensipi.result_export.ResultExport``. When it sets
+        ``op_vf_settings``, every file is also fitted with a pole-residue
+        model, see :meth:`__fit_models`.
+
+        A quick look only draws the figures, from a subset of the frequency
+        rows of each file, and leaves the models and the export of an earlier
+        full pass as they are.
 
         Args:
             result_config_dir (str): Full path to the result configuration
                 file written by :meth:`run`.
+            quick_look (bool, optional): Whether to make a quick look. See
+                ``opensipi.touchstone.TouchStone.__init__``. Defaults to
+                ``False``.
 
         Returns:
             dict: Result sub-folder name to a dict of simulation key to that
@@ -506,12 +577,17 @@ class Platform:
             ``opensipi.touchstone.TouchStone.auto_process``.
         """
         result_config = load_yaml_to_dict(expand_home_dir(result_config_dir))
+        result_config["quick_look"] = quick_look
         result_dict = {}
         for key in result_config["result_sub_dirs"].keys():
             result_dict[key] = self.__snp_plot_xtract(key, result_config)
+            if result_config.get("op_vf_settings") and not quick_look:
+                self.__fit_models(key, result_config)
+        if result_config.get("op_export", 0) and not quick_look:
+            self.__export_results(result_dict, result_config)
         return result_dict
 
-    def report(self, result_config_dir, report_config_dir):
+    def report(self, result_config_dir, report_config_dir, quick_look=False):
         """Generate a report out of the processed results.
 
         Post-processes the results, then fills the pdf template matching the
@@ -522,6 +598,11 @@ class Platform:
                 file.
             report_config_dir (str): Full path to the report configuration
                 file.
+            quick_look (bool, optional): Whether to make a rough report fast,
+                e.g. to check the ports and the connectivity of a setup. The
+                report keeps its structure, but its figures are drawn at low
+                resolution from a subset of the frequency rows, and the TDR
+                and mixed-mode keys are left out. Defaults to ``False``.
 
         Returns:
             str: Full path of the pdf report written.
@@ -538,7 +619,7 @@ class Platform:
 
         # snp figures
         if report_type in ["PDN", "IO"]:
-            result_dict = self.process_snp(expand_home_dir(result_config_dir))
+            result_dict = self.process_snp(expand_home_dir(result_config_dir), quick_look)
         elif report_type in ["DCR"]:
             pass
 
@@ -562,7 +643,7 @@ class Platform:
         self.lg.debug("A summary report is created at " + dir)
         return dir
 
-    def report_html(self, result_config_dir, report_config_dir):
+    def report_html(self, result_config_dir, report_config_dir, quick_look=False):
         """Generate a HTML report out of the processed results.
 
         The html alternative to :meth:`report`. It renders a jinja2 template
@@ -575,6 +656,8 @@ class Platform:
                 file.
             report_config_dir (str): Full path to the report configuration
                 file.
+            quick_look (bool, optional): Whether to make a rough report fast.
+                See :meth:`report`. Defaults to ``False``.
 
         Returns:
             str: Full path of the pdf report written. The html sits beside it
@@ -591,7 +674,7 @@ class Platform:
 
         # snp figures
         if report_type in ["PDN", "IO"]:
-            result_dict = self.process_snp(expand_home_dir(result_config_dir))
+            result_dict = self.process_snp(expand_home_dir(result_config_dir), quick_look)
         elif report_type in ["DCR"]:
             pass
 
@@ -806,18 +889,149 @@ class Platform:
 
         Args:
             key (str): Result sub-folder name, e.g. ``"SNP_S"``.
-            result_config (dict): The loaded result configuration.
+            result_config (dict): The loaded result configuration. Its optional
+                ``op_snp_workers`` entry sets the number of worker processes.
+                Absent or ``1`` processes the files one after another in this
+                process, stacking the files that share a frequency grid with
+                ``opensipi.snp_batch.SnpBatch`` when ``op_snp_batch_mb`` is
+                above ``0``.
 
         Returns:
             dict: Simulation key to that simulation's post-processing output.
+            The keys follow the order of the plot list whichever way the files
+            were processed.
         """
         plt_list = self._get_plt_list(key, result_config)
-        ts_list = TouchStone.from_list(plt_list)
+        snp_workers = result_config.get("op_snp_workers", 1)
+        if snp_workers > 1 and len(plt_list) > 1:
+            return self.__snp_plot_xtract_parallel(plt_list, snp_workers)
+        batch_mb = result_config.get("op_snp_batch_mb", 0)
+        if batch_mb > 0:
+            output_dict = SnpBatch.process_list(plt_list, batch_mb)
+            TouchStone.wait_mm_writes()
+            return output_dict
+        # one network in memory at a time
         output_dict = {}
-        for ts in ts_list:
+        for ts in TouchStone.from_list(plt_list, stream=True):
             output_dict[ts.key_name] = ts.auto_process()
+        TouchStone.wait_mm_writes()
         return output_dict
 
+    def __snp_plot_xtract_parallel(self, plt_list, snp_workers):
+        """Post-process touchstone files in a pool of worker processes.
+
+        Each task loads one file, renders its figures, and hands back the
+        ``auto_process`` output, so only the info dicts and the small output
+        dicts cross the process boundary, never the networks. The results are
+        collected in submission order, which keeps the merged dict identical to
+        what the serial path builds.
+
+        Args:
+            plt_list (list of dict): The output of :meth:`_get_plt_list`.
+            snp_workers (int): Upper bound on the worker processes. No more
+                workers than files are started.
+
+        Returns:
+            dict: Simulation key to that simulation's post-processing output.
+        """
+        max_workers = min(snp_workers, len(plt_list))
+        self.lg.debug(
+            str(len(plt_list)) + " snp files are processed with " + str(max_workers) + " workers."
+        )
+        output_dict = {}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_snp_worker) as pool:
+            for key_name, output in pool.map(_auto_process_snp, plt_list):
+                output_dict[key_name] = output
+        return output_dict
+
+    def __fit_models(self, key, result_config):
+        """Fit a pole-residue model to every touchstone file of one sub-folder.
+
+        The models are kept in a ``Pole_Residue`` folder beside the result
+        sub-folders, one sub-folder per result sub-folder, see
+        ``opensipi.pole_residue.PoleResidueModel``. A model newer than its
+        snp file is kept as it is.
+
+        Args:
+            key (str): Result sub-folder name, e.g. ``"SNP_S"``.
+            result_config (dict): The loaded result configuration, whose
+                ``op_vf_settings`` holds the keyword arguments of
+                ``PoleResidueModel.fit``.
+
+        Returns:
+            list of str: Full paths of the models of the sub-folder.
+        """
+        vf_settings = result_config["op_vf_settings"]
+        snp_dir = expand_home_dir(result_config["result_sub_dirs"][key])
+        # the model folder sits beside the result sub-folders
+        model_folder = (
+            get_str_before_last_n_symbol(snp_dir, SL, 2) + SL + "Pole_Residue" + SL + key + SL
+        )
+        model_list = []
+        for info in self._get_plt_list(key, result_config):
+            model_dir = PoleResidueModel.get_model_dir(model_folder, info["file_dir"])
+            model_list.append(model_dir)
+            if (
+                os.path.isfile(model_dir)
+                and os.stat(model_dir).st_mtime_ns >= os.stat(info["file_dir"]).st_mtime_ns
+            ):
+                continue
+            ts = TouchStone(info, lazy=True)
+            PoleResidueModel.fit(ts.nw, **vf_settings).save(model_dir)
+            ts.release()
+            self.lg.debug(info["snp_name"] + " is fitted to " + model_dir)
+        return model_list
+
+    def __export_results(self, result_dict, result_config):
+        """Gather the curves and values of a processed run into columns.
+
+        The curves are read back from the shards the figures left in the
+        ``Curves`` folder, so files processed by workers or reused from an
+        earlier report are covered alike. The self impedance keys also export
+        the resistance, inductance, and capacitance values they extracted, and
+        the ``ZMASK`` key its result as ``1`` for a pass and ``0`` for a fail,
+        its worst margin, and the frequency of that margin.
+
+        Args:
+            result_dict (dict): The output of :meth:`process_snp`.
+            result_config (dict): The loaded result configuration.
+
+        Returns:
+            str: The export folder written.
+        """
+        plot_dir = expand_home_dir(result_config["plot_dir"])
+        # the run folder is two levels above the plot folder
+        run_name = os.path.basename(get_str_before_last_n_symbol(plot_dir, SL, 3))
+        export_dir = get_str_before_last_n_symbol(plot_dir, SL, 2) + SL + "Export" + SL
+        export = ResultExport(export_dir, run_name)
+        # the values following [fig_title, fig_dir], left empty when not meaningful
+        quantity_dict = {
+            "ZOPEN": ["R_mOhm", "L_pH", "C_nF"],
+            "ZSHORT": ["R_mOhm", "L_pH", "C_nF"],
+            "ZMASK": ["pass", "margin_dB", "margin_freq_GHz"],
+        }
+        for sim_dict in result_dict.values():
+            for key_name, output_dict in sim_dict.items():
+                sim_key = key_name.split("__", 1)[1]
+                for prockey, output in output_dict.items():
+                    if isinstance(output, dict):
+                        entry_list = [i_entry for value in output.values() for i_entry in value]
+                    else:
+                        entry_list = output
+                    for i_entry in entry_list:
+                        shard_dir = ResultExport.get_shard_dir(plot_dir, i_entry[0])
+                        port_list = export.add_shard(shard_dir, sim_key, prockey)
+                        for quantity, value in zip(quantity_dict.get(prockey, []), i_entry[2:]):
+                            if value in ("", "N/A"):
+                                continue
+                            if quantity == "pass":
+                                value = value == "PASS"
+                            export.add_scalar(
+                                sim_key, prockey, port_list[0], quantity, float(value)
+                            )
+        self.lg.debug("The curves and values are exported to " + export_dir)
+        return export.write()
+
     def _get_plt_list(self, key, result_config):
         """Get the plot list out of a given directory.
 
@@ -827,6 +1041,19 @@ class Platform:
         whose key was not enabled in the input are skipped, so results left
         over from an earlier run do not leak into this report.
 
+        When the result config sets ``op_snp_cache_mb`` above ``0``, every
+        file is read through a binary cache kept in a ``SNP_Cache`` folder
+        beside the result sub-folders, capped at that many MiB. Its
+        ``op_tdr_settings``, when present, is passed on as ``tdr_settings``,
+        a set ``op_plot_reuse`` as ``plot_reuse``, ``op_mm_settings``, when
+        present, as ``mm_settings``, an ``op_plot_workers`` above ``1`` as
+        ``plot_workers``, a set ``op_export`` as ``curve_export``, an
+        ``op_mask_plot`` of ``0`` as ``mask_plot``, and an ``op_precision``
+        other than ``"double"`` as ``precision``. A ``quick_look`` set by
+        :meth:`process_snp` is passed on as ``quick_look``, and then drops
+        ``curve_export``, so the curves of a full report are not overwritten
+        by the row subset.
+
         Args:
             key (str): Result sub-folder name, e.g. ``"SNP_S"``.
             result_config (dict): The loaded result configuration.
@@ -841,6 +1068,17 @@ class Platform:
         checked_keys = result_config["checked_keys"]
         spectype = result_config["spectype"]
         conn = result_config["CONNECTIVITY"]
+        cache_mb = result_config.get("op_snp_cache_mb", 0)
+        tdr_settings = result_config.get("op_tdr_settings")
+        plot_reuse = result_config.get("op_plot_reuse", 0)
+        mm_settings = result_config.get("op_mm_settings")
+        plot_workers = result_config.get("op_plot_workers", 1)
+        export = result_config.get("op_export", 0)
+        mask_plot = result_config.get("op_mask_plot", 1)
+        precision = result_config.get("op_precision", "double")
+        quick_look = result_config.get("quick_look", False)
+        # the cache folder sits beside the result sub-folders
+        cache_dir = get_str_before_last_n_symbol(snp_dir, SL, 2) + SL + "SNP_Cache" + SL
         snp_list = glob.glob(snp_dir + "*.[sS]*[pP]")
         for i_snp in snp_list:
             file_dir = i_snp
@@ -856,6 +1094,25 @@ class Platform:
                     "snp_name": snp_name,
                     "conn_dict": conn[sim_key],
                 }
+                if cache_mb > 0:
+                    temp_dict["cache_dir"] = cache_dir
+                    temp_dict["cache_mb"] = cache_mb
+                if tdr_settings:
+                    temp_dict["tdr_settings"] = tdr_settings
+                if plot_reuse:
+                    temp_dict["plot_reuse"] = True
+                if mm_settings:
+                    temp_dict["mm_settings"] = mm_settings
+                if plot_workers > 1:
+                    temp_dict["plot_workers"] = plot_workers
+                if export and not quick_look:
+                    temp_dict["curve_export"] = True
+                if not mask_plot:
+                    temp_dict["mask_plot"] = False
+                if precision != "double":
+                    temp_dict["precision"] = precision
+                if quick_look:
+                    temp_dict["quick_look"] = True
                 plt_list.append(temp_dict)
                 self.lg.debug(snp_name + " is included for plotting!")
             else:
@@ -871,7 +1128,9 @@ class Platform:
         Extends the template in place: the summary rows go into section 0, one
         result row per figure into the section 1 table matching that
         post-processing key, and the figures themselves into section 2. The
-        table cells cross-reference the figures by number.
+        table cells cross-reference the figures by number. A row whose figure
+        was not drawn, as a ``ZMASK`` check without plots, gets no figure and
+        an empty figure cell.
 
         Args:
             pdf_report (dict): The ``pdn_report`` template. Modified in place,
@@ -890,15 +1149,15 @@ class Platform:
                     index_mod = POST_PROCESS_KEY_ORDER_PDN[process_key]
                     for i_list in result:
                         # table
+                        if i_list[1]:
+                            ctnt_dict = {".": "Fig." + str(i), "style": "url", "ref": i_list[0]}
+                        else:
+                            ctnt_dict = ""
                         pdf_report["sections"][1]["content"][index_mod]["table"].append(
-                            [
-                                i_list[0],
-                                i_list[2],
-                                i_list[3],
-                                i_list[4],
-                                {".": "Fig." + str(i), "style": "url", "ref": i_list[0]},
-                            ]
+                            [i_list[0], i_list[2], i_list[3], i_list[4], ctnt_dict]
                         )
+                        if not i_list[1]:
+                            continue
                         # figures
                         image_dict = {
                             "group": [
@@ -987,6 +1246,10 @@ class Platform:
     ):
         """Generate a HTML report for PDN.
 
+        The ``ZMASK`` results get a table of their own, as in
+        :meth:`__gen_pdn_report`. A row whose figure was not drawn gets an
+        empty figure cell.
+
         Args:
             summary_list (list of list of str): Run summary rows.
             result_dict (dict): The output of :meth:`process_snp`.
@@ -1155,3 +1418,32 @@ class Platform:
             }
             out_gsheet_proj = DCR2GSheet(out_gsheet_info)
             out_gsheet_proj.export_results()
+
+
+def _init_snp_worker():
+    """Select the non-interactive backend in a post-processing worker.
+
+    A worker only ever writes figures to file, and a GUI backend inherited from
+    the parent, or picked by default on a spawned Windows worker, would try to
+    open windows from a process with no event loop.
+    """
+    matplotlib.use("Agg")
+
+
+def _auto_process_snp(info):
+    """Load and post-process one touchstone file in a worker process.
+
+    Args:
+        info (dict): One entry of the plot list, as described in
+            ``opensipi.touchstone.TouchStone``.
+
+    Returns:
+        tuple: A 2-tuple ``(key_name, output)``, being the simulation key and
+        the ``auto_process`` output for the file.
+    """
+    # lazy, so outputs reused from the plot manifest never load the file
+    ts = TouchStone(info, lazy=True)
+    output = ts.auto_process()
+    # a worker may be shut down once it returns, so its mixed-mode writes finish here
+    TouchStone.wait_mm_writes()
+    return ts.key_name, output
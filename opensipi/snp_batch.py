@@ -0,0 +1,261 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module post-processes touchstone files sharing one frequency grid as
+a single stack.
+
+    A PDN run leaves dozens of snp files with the same frequency grid and port
+count in one result folder, and each of them goes through the same impedance
+solves, port terminations, RLC reads, and dB conversions on its own. ``SnpBatch``
+groups such files and stacks their S matrices into one ``[file, freq, port,
+port]`` array, so each of those steps is one NumPy call over the whole stack.
+Only drawing the figures is left per file.
+
+    Files are grouped by port count, frequency grid, and the ports each of the
+stacked keys reads, being ``ZOPEN``, ``ZSHORT``, ``IL``, and ``RL``. The other
+keys run file by file as ``TouchStone.auto_process`` runs them. The outputs,
+the figures, and the recorded plot manifest entries are the same as those of
+``TouchStone.auto_process`` on each file.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from opensipi.touchstone import TouchStone
+
+
+class SnpBatch:
+    """Stacked post-processing of same-grid touchstone files.
+
+    Attributes:
+        STACK_KEY (list of str): The post-processing keys computed over the
+            whole stack.
+        ts_list (list of TouchStone): The files of the stack, in order.
+    """
+
+    def __init__(self, ts_list):
+        """Set up a stack.
+
+        Args:
+            ts_list (list of TouchStone): Files sharing the group signature of
+                :meth:`get_signature`. Their networks are stacked on first use.
+        """
+        self.STACK_KEY = ["ZOPEN", "ZSHORT", "IL", "RL"]
+        self.ts_list = ts_list
+
+    @classmethod
+    def process_list(cls, info_list, batch_mb):
+        """Post-process a plot list, stacking the files that fit together.
+
+        The files are read one after another and collected into groups. A group
+        is processed and released as soon as its S matrices reach
+        ``batch_mb``, and the rest once every file has been read, so the
+        memory held is bounded by the cap per distinct group.
+
+        Args:
+            info_list (list of dict): One ``info`` dict per touchstone file, as
+                described in ``TouchStone.__init__``.
+            batch_mb (float): Size cap of one stack in MiB.
+
+        Returns:
+            dict: Simulation key to that simulation's post-processing output,
+            in the order of ``info_list``, as the serial loop gives it.
+        """
+        cap_bytes = batch_mb * 2**20
+        output_list = [None] * len(info_list)
+        group_dict = {}
+        for i_info, info in enumerate(info_list):
+            ts = TouchStone(info, lazy=True)
+            # a fully reused file is never read
+            signature = None if cls.__is_reused(ts) else cls.get_signature(ts)
+            if signature is None:
+                output_list[i_info] = (ts.key_name, ts.auto_process())
+                ts.release()
+                continue
+            group = group_dict.setdefault(signature, [])
+            group.append((i_info, ts))
+            if sum(i_ts.nw.s.nbytes for _, i_ts in group) >= cap_bytes:
+                cls.__process_group(group_dict.pop(signature), output_list)
+        for group in group_dict.values():
+            cls.__process_group(group, output_list)
+        return dict(output_list)
+
+    @staticmethod
+    def get_signature(ts):
+        """Get what a file must share with the others of its stack.
+
+        Args:
+            ts (TouchStone): The file, read on first access of its network.
+
+        Returns:
+            str: The port count, a hash of the frequency grid, and the ports
+            each stacked key of the spec type reads, in JSON. ``None`` when the
+            spec type asks for no stacked key.
+        """
+        key_list = []
+        for key in ts.spec_type["POST_PROCESS_KEY"]:
+            match key:
+                case "ZOPEN" | "ZSHORT":
+                    key_list.append([key, len(ts.conn_dict["ZIN"])])
+                case "IL" | "RL":
+                    key_list.append([key, ts.conn_dict[key]])
+        if not key_list:
+            return None
+        f_hash = hashlib.sha256(ts.nw.f.tobytes()).hexdigest()
+        return json.dumps([ts.port_num, f_hash, key_list])
+
+    def auto_process(self):
+        """Post-process every file of the stack.
+
+        Returns:
+            list of dict: The ``TouchStone.auto_process`` output of each file,
+            in order.
+        """
+        stack_output = self.__process_stack()
+        output_list = []
+        for ts, stacked in zip(self.ts_list, stack_output, strict=True):
+            output_dict = {}
+            for key in ts.spec_type["POST_PROCESS_KEY"]:
+                output = stacked[key] if key in stacked else ts.process_key(key)
+                if output is not None:
+                    output_dict[key] = output
+            output_list.append(output_dict)
+        return output_list
+
+    @staticmethod
+    def __is_reused(ts):
+        """Check whether every output of a file is in its plot manifest.
+
+        Args:
+            ts (TouchStone): The file.
+
+        Returns:
+            bool: ``True`` when ``plot_reuse`` is on and each key of the spec
+            type has a valid manifest entry.
+        """
+        if not ts.plot_reuse:
+            return False
+        return all(ts.load_output(key) is not None for key in ts.spec_type["POST_PROCESS_KEY"])
+
+    @classmethod
+    def __process_group(cls, group, output_list):
+        """Process one group and release its files.
+
+        Args:
+            group (list of tuple): ``(index, ts)`` pairs of the group.
+            output_list (list of tuple): ``(key_name, output)`` per plot list
+                entry, filled in at the index of each file.
+        """
+        batch = cls([ts for _, ts in group])
+        for (i_info, ts), output in zip(group, batch.auto_process(), strict=True):
+            output_list[i_info] = (ts.key_name, output)
+            ts.release()
+
+    def __process_stack(self):
+        """Produce the outputs of the stacked keys over the whole stack.
+
+        Files with a valid plot manifest entry for a key are left out of the
+        stack for that key.
+
+        Returns:
+            list of dict: Stacked key to its output, one dict per file.
+        """
+        stack_output = [{} for _ in self.ts_list]
+        process_key = self.ts_list[0].spec_type["POST_PROCESS_KEY"]
+        s_stack = None
+        for key in process_key:
+            if key not in self.STACK_KEY:
+                continue
+            todo_list = []
+            for i_ts, ts in enumerate(self.ts_list):
+                output = ts.load_output(key)
+                if output is None:
+                    todo_list.append(i_ts)
+                else:
+                    stack_output[i_ts][key] = output
+            if not todo_list:
+                continue
+            if s_stack is None:
+                s_stack = np.stack([ts.nw.s for ts in self.ts_list])
+                z0_stack = np.stack([ts.nw.z0 for ts in self.ts_list])
+            # a sub-stack is a copy, so the full stack is used whenever it can be
+            if len(todo_list) == len(self.ts_list):
+                s, z0 = s_stack, z0_stack
+            else:
+                s, z0 = s_stack[todo_list], z0_stack[todo_list]
+            ts_list = [self.ts_list[i_ts] for i_ts in todo_list]
+            match key:
+                case "ZOPEN" | "ZSHORT":
+                    output_list = self.__process_zself(ts_list, s, z0, key)
+                case "IL" | "RL":
+                    output_list = self.__process_s_path(ts_list, s, key)
+            for i_ts, ts, output in zip(todo_list, ts_list, output_list, strict=True):
+                ts.save_output(key, output)
+                stack_output[i_ts][key] = output
+        return stack_output
+
+    def __process_zself(self, ts_list, s, z0, key):
+        """Produce the ``ZOPEN`` or ``ZSHORT`` outputs of a stack.
+
+        Args:
+            ts_list (list of TouchStone): The files of the stack.
+            s (numpy.ndarray): Their S-parameters, indexed
+                ``[file, freq, output, input]``.
+            z0 (numpy.ndarray): Their reference impedances, indexed
+                ``[file, freq, port]``.
+            key (str): ``"ZOPEN"`` or ``"ZSHORT"``.
+
+        Returns:
+            list of list: The output of each file, as ``TouchStone.plot_zself``
+            or ``TouchStone.plot_zself_shortsns`` gives it.
+        """
+        ts_0 = ts_list[0]
+        port_list = list(range(len(ts_0.conn_dict["ZIN"])))
+        sns_shorted = key == "ZSHORT"
+        if sns_shorted:
+            sns_port_list = list(range(len(port_list), ts_0.port_num))
+            s, z0 = TouchStone.terminate_s(s, z0, sns_port_list)
+        z_self = TouchStone.solve_z_self(s, z0, port_list)
+        z_interp, _, extrap = TouchStone.interp_z_self(ts_0.nw.f, z_self, ts_0.RLC_FREQ)
+        r_dc, l_hf, c_lf = TouchStone.convert_z_to_rlc(z_interp, ts_0.RLC_FREQ)
+        z_mag = np.abs(z_self)
+        output_list = []
+        for i_ts, ts in enumerate(ts_list):
+            if extrap[i_ts].any():
+                ts.warn_sparse_sweep(ts.file_dir)
+            rlc = (r_dc[i_ts], l_hf[i_ts], c_lf[i_ts])
+            output_list.append(ts.draw_zself(z_mag[i_ts], rlc, sns_shorted, key))
+        return output_list
+
+    def __process_s_path(self, ts_list, s, key):
+        """Produce the ``IL`` or ``RL`` outputs of a stack.
+
+        Args:
+            ts_list (list of TouchStone): The files of the stack.
+            s (numpy.ndarray): Their S-parameters, indexed
+                ``[file, freq, output, input]``.
+            key (str): ``"IL"`` or ``"RL"``.
+
+        Returns:
+            list of list: The output of each file, as ``TouchStone.plot_il`` or
+            ``TouchStone.plot_rl`` gives it.
+        """
+        ts_0 = ts_list[0]
+        conn_list = ts_0.conn_dict[key]
+        if key == "IL":
+            out_list = [i_conn[1] - 1 for i_conn in conn_list]
+            in_list = [i_conn[0] - 1 for i_conn in conn_list]
+            label_list = ["S" + str(i_conn[1]) + str(i_conn[0]) for i_conn in conn_list]
+        else:
+            out_list = in_list = [i_conn - 1 for i_conn in conn_list]
+            label_list = ["S" + str(i_conn) + str(i_conn) for i_conn in conn_list]
+        s_path = ts_0.get_s_path(s, out_list, in_list)
+        return [ts.draw_s_path(s_path[i_ts], label_list, key) for i_ts, ts in enumerate(ts_list)]
@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module caches parsed touchstone files in a binary form.
+
+    Parsing an ASCII snp file is the slowest step of loading it, and the same
+files are read again by every report and by every resumed run. ``SnpCache``
+keeps the parsed frequency axis, S matrix, reference impedances, and port names
+of each file as an uncompressed ``.npz`` entry in a cache folder, and hands the
+network back from there while the entry is still valid.
+
+    An entry belongs to the absolute path of its source file and records the
+size, the modification time, and the content hash the source had when the
+entry was written. A matching size and modification time is trusted as is. A
+matching size with a different modification time, as left by a copy or a
+touch, is settled by the content hash, so only a real change of content causes
+a re-parse.
+
+    There is no shared index. Each entry carries its own metadata, which lets
+the worker processes of a parallel post-processing run read and fill one cache
+folder at the same time. The folder is capped in size, and the entries used
+least recently are evicted first, so a tree holding many runs does not double
+its footprint.
+"""
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+import skrf as rf
+
+from opensipi.snp_reader import read_touchstone, set_precision
+from opensipi.util.common import get_file_hash, make_dir
+
+
+class SnpCache:
+    """Binary cache of parsed touchstone networks.
+
+    Attributes:
+        ENTRY_EXT (str): File extension of a cache entry.
+        cache_dir (str): Separator-ending folder holding the entries.
+        cap_bytes (int): Size cap of the folder in bytes.
+    """
+
+    def __init__(self, cache_dir, cap_mb):
+        """Set up the cache folder.
+
+        Args:
+            cache_dir (str): Separator-ending folder to keep the entries in.
+                Created if missing.
+            cap_mb (float): Size cap of the folder in MiB. An entry larger
+                than the cap on its own is evicted right after being written.
+        """
+        self.ENTRY_EXT = ".npz"
+        self.cache_dir = cache_dir
+        self.cap_bytes = int(cap_mb * 2**20)
+        make_dir(cache_dir)
+
+    def load(self, file_dir, precision="double"):
+        """Load a touchstone file, from its cache entry when still valid.
+
+        On a miss the text file is parsed by ``read_touchstone``, a fresh entry is
+        written, and the folder is trimmed back under its cap. The entry always
+        holds the double precision network, whatever precision is asked for.
+
+        Args:
+            file_dir (str): Full path of the snp file.
+            precision (str, optional): ``"double"`` or ``"single"``, see
+                ``opensipi.snp_reader.set_precision``. Defaults to
+                ``"double"``.
+
+        Returns:
+            skrf.Network: The network, identical in frequency axis, S matrix,
+            reference impedances, name, and port names to a direct read.
+        """
+        entry_dir = self.get_entry_dir(file_dir)
+        stat = os.stat(file_dir)
+        nw = self.__read_entry(entry_dir, file_dir, stat)
+        if nw is None:
+            nw = read_touchstone(file_dir)
+            self.__write_entry(entry_dir, file_dir, stat, get_file_hash(file_dir), nw)
+            self.evict()
+        return set_precision(nw, precision)
+
+    def get_entry_dir(self, file_dir):
+        """Get the path of the cache entry belonging to a touchstone file.
+
+        The file name is kept for readability, and a hash of the absolute path
+        tells apart same-named files from different result sub-folders.
+
+        Args:
+            file_dir (str): Full path of the snp file.
+
+        Returns:
+            str: Full path of the entry, whether it exists or not.
+        """
+        abs_dir = os.path.abspath(file_dir)
+        path_hash = hashlib.sha1(abs_dir.encode("utf-8")).hexdigest()[:16]
+        file_name = os.path.splitext(os.path.basename(abs_dir))[0]
+        return self.cache_dir + file_name + "__" + path_hash + self.ENTRY_EXT
+
+    def evict(self):
+        """Remove the least recently used entries until the cap is met.
+
+        A hit refreshes the modification time of its entry, so that time is
+        the last-use order. Entries another process is removing or still
+        holding open are skipped.
+        """
+        entries = []
+        for entry_dir in glob.glob(self.cache_dir + "*" + self.ENTRY_EXT):
+            try:
+                stat = os.stat(entry_dir)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_dir))
+        total_bytes = sum(entry[1] for entry in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total_bytes <= self.cap_bytes:
+                break
+            try:
+                os.remove(entry_dir)
+            except OSError:
+                continue
+            total_bytes -= size
+
+    def __read_entry(self, entry_dir, file_dir, stat):
+        """Read a cache entry if it still describes the source file.
+
+        Args:
+            entry_dir (str): Full path of the entry.
+            file_dir (str): Full path of the snp file.
+            stat (os.stat_result): The current status of the snp file.
+
+        Returns:
+            skrf.Network: The cached network, or ``None`` when the entry is
+            missing, stale, or unreadable.
+        """
+        if not os.path.exists(entry_dir):
+            return None
+        try:
+            with np.load(entry_dir, allow_pickle=False) as entry:
+                if str(entry["src_dir"]) != os.path.abspath(file_dir):
+                    return None
+                if int(entry["src_size"]) != stat.st_size:
+                    return None
+                src_hash = str(entry["src_hash"])
+                touched = int(entry["src_mtime_ns"]) != stat.st_mtime_ns
+                if touched and src_hash != get_file_hash(file_dir):
+                    return None
+                nw = self.__build_network(entry)
+        except (OSError, ValueError, KeyError):
+            return None
+        if touched:
+            # record the new time so the next read skips the hash
+            self.__write_entry(entry_dir, file_dir, stat, src_hash, nw)
+        else:
+            os.utime(entry_dir)
+        return nw
+
+    def __write_entry(self, entry_dir, file_dir, stat, src_hash, nw):
+        """Write a cache entry for a network.
+
+        The entry is written under a per-process temporary name and then moved
+        into place, so a concurrent reader never sees a partial file.
+
+        Args:
+            entry_dir (str): Full path of the entry.
+            file_dir (str): Full path of the snp file.
+            stat (os.stat_result): The status of the snp file it was read with.
+            src_hash (str): The content hash of the snp file.
+            nw (skrf.Network): The parsed network.
+        """
+        tmp_dir = entry_dir + "." + str(os.getpid()) + ".tmp"
+        port_names = nw.port_names if nw.port_names else []
+        with open(tmp_dir, "wb") as f:
+            np.savez(
+                f,
+                f=nw.f,
+                s=nw.s,
+                z0=nw.z0,
+                name=np.array(nw.name if nw.name else ""),
+                port_names=np.array(port_names, dtype=str),
+                src_dir=np.array(os.path.abspath(file_dir)),
+                src_size=np.array(stat.st_size),
+                src_mtime_ns=np.array(stat.st_mtime_ns),
+                src_hash=np.array(src_hash),
+            )
+        os.replace(tmp_dir, entry_dir)
+
+    def __build_network(self, entry):
+        """Build a network out of the arrays of a cache entry.
+
+        Args:
+            entry (numpy.lib.npyio.NpzFile): The opened entry.
+
+        Returns:
+            skrf.Network: The network the entry describes.
+        """
+        nw = rf.Network(
+            frequency=rf.Frequency.from_f(entry["f"], unit="Hz"),
+            s=entry["s"],
+            z0=entry["z0"],
+            name=str(entry["name"]),
+        )
+        port_names = entry["port_names"].tolist()
+        if port_names:
+            nw.port_names = port_names
+        return nw
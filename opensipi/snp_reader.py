@@ -0,0 +1,356 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module reads touchstone files into scikit-rf networks.
+
+    The scikit-rf parser walks the file line by line in Python, which is what
+dominates loading the large multi-port files PowerSI and Clarity write. Here
+the comments, the option line, and the version 2 keywords are located with
+regular expressions over the whole text, and the data section is handed to
+NumPy as a single string, so the number crunching never leaves C. Line-wrapped
+rows need no special care, since the data is read as one flat stream of values
+and only then shaped per frequency.
+
+    Touchstone 1.x and 2.x are covered, with S, Y, or Z parameters in the RI,
+MA, or DB format and any port count. A file holding something this reader does
+not handle, being noise data, G or H parameters, 1.x Y parameters, or the
+per-frequency port impedances HFSS writes, is passed on to scikit-rf, so the
+result is always the network scikit-rf would have built.
+
+    A network can also be held in single precision, see :func:`set_precision`,
+which halves the memory of its S matrix for the large files where that
+matters.
+
+    For a quick look, only a subset of the frequency rows, spread evenly over
+a log axis, is parsed. The line breaks are located with NumPy over the raw
+bytes, the rows to keep are picked from the frequency at the head of each
+row, and only those rows are handed to the number parser.
+"""
+
+import copy
+import os
+import re
+
+import numpy as np
+import skrf as rf
+
+_FREQ_UNIT = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+_COMMENT_RE = re.compile(r"!.*")
+_PORT_NAME_RE = re.compile(r"! Port\[(\d+)\][ \t]*=[ \t]*(.*)")
+_OPTION_RE = re.compile(r"^\s*#(.*)$", re.M)
+# no line anchor, so the scan for the bracket runs at C speed over the data
+_KEYWORD_RE = re.compile(r"\[([^\]\n]+)\](.*)")
+_SNP_EXT_RE = re.compile(r"\.[sS](\d+)[pP]$")
+
+
+def read_touchstone(file_dir, precision="double", n_row=0):
+    """Read a touchstone file into a network.
+
+    Args:
+        file_dir (str): Full path of the snp or ts file.
+        precision (str, optional): ``"double"`` or ``"single"``, see
+            :func:`set_precision`. Defaults to ``"double"``.
+        n_row (int, optional): Keep about this many frequency rows, see
+            :func:`get_row_index`, parsing only those. A file whose rows are
+            not laid out alike is parsed whole and then thinned out. Defaults
+            to ``0``, which keeps every row.
+
+    Returns:
+        skrf.Network: The network, with the same frequency axis, S matrix,
+        reference impedances, name, and port names a direct
+        ``skrf.Network(file_dir)`` gives. The free-text comments are not
+        kept.
+
+    Raises:
+        ValueError: If the data section does not hold a whole number of
+            frequency points for the declared port count.
+    """
+    with open(file_dir, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    name = os.path.splitext(os.path.basename(file_dir))[0]
+    nw = _parse_touchstone(text, file_dir, name, n_row)
+    if nw is None:
+        nw = rf.Network(file_dir)
+        if n_row:
+            nw = nw[get_row_index(nw.f, n_row)]
+            nw.name = name
+    return set_precision(nw, precision)
+
+
+def get_row_index(f, n_row):
+    """Pick about ``n_row`` frequency rows spread evenly over a log axis.
+
+    The rows nearest to ``n_row`` log-spaced targets between the lowest
+    positive and the highest frequency are kept, together with any DC row
+    and the first and last rows.
+
+    Args:
+        f (numpy.ndarray): The ascending frequencies of all rows.
+        n_row (int): The number of targets.
+
+    Returns:
+        numpy.ndarray: The ascending indices of the rows to keep, every index
+        when there are no more than ``n_row`` rows.
+    """
+    f = np.asarray(f, dtype=float)
+    if len(f) <= n_row:
+        return np.arange(len(f))
+    i_start = int(np.searchsorted(f, 0, side="right"))
+    if i_start == len(f):
+        return np.arange(len(f))
+    target = np.geomspace(f[i_start], f[-1], n_row)
+    i_hi = np.clip(np.searchsorted(f, target), i_start + 1, len(f) - 1)
+    nearer_lo = target - f[i_hi - 1] < f[i_hi] - target
+    index = np.where(nearer_lo, i_hi - 1, i_hi)
+    return np.unique(np.r_[np.arange(i_start), index, i_start, len(f) - 1])
+
+
+def set_precision(nw, precision):
+    """Get a network holding its S matrix at a given precision.
+
+    In single precision the S matrix is kept as complex64, which halves its
+    memory, and the dB and magnitude views taken from it come out as float32.
+    The frequency axis and the reference impedances stay in double precision.
+    scikit-rf casts any S matrix it is handed to complex128, so the array is
+    placed behind its setter.
+
+    Args:
+        nw (skrf.Network): The network. Not modified.
+        precision (str): ``"double"`` or ``"single"``.
+
+    Returns:
+        skrf.Network: ``nw`` itself in double precision, else a shallow copy
+        of it holding a complex64 S matrix.
+
+    Raises:
+        ValueError: If the precision is neither ``"double"`` nor
+            ``"single"``.
+    """
+    match precision:
+        case "double":
+            return nw
+        case "single":
+            nw_single = copy.copy(nw)
+            nw_single._s = nw.s.astype(np.complex64)
+            return nw_single
+    raise ValueError("The precision " + str(precision) + " is neither double nor single.")
+
+
+def _parse_touchstone(text, file_dir, name, n_row=0):
+    """Parse the text of a touchstone file.
+
+    Args:
+        text (str): The whole file.
+        file_dir (str): Full path of the file, for the port count of a 1.x
+            file and for the error messages.
+        name (str): Name given to the network.
+        n_row (int, optional): Keep about this many frequency rows, see
+            :func:`get_row_index`. Defaults to ``0``, which keeps every row.
+
+    Returns:
+        skrf.Network: The network, or ``None`` when the file holds something
+        left to scikit-rf.
+
+    Raises:
+        ValueError: If the data does not fit the declared port count.
+    """
+    if "! Port Impedance" in text or "! Gamma" in text:
+        # per-frequency port impedances in HFSS comments
+        return None
+    body = _COMMENT_RE.sub("", text)
+    option = _OPTION_RE.search(body)
+    unit, param, fmt, resistance = _parse_option_line(option.group(1) if option else "")
+    if param not in ("S", "Y", "Z"):
+        return None
+    keyword_dict = {}
+    keyword_list = list(_KEYWORD_RE.finditer(body))
+    for i_kw, kw in enumerate(keyword_list):
+        # a keyword's values run up to the next keyword
+        end = keyword_list[i_kw + 1].start() if i_kw + 1 < len(keyword_list) else len(body)
+        keyword_dict[kw.group(1).strip().upper()] = (kw.group(2), kw.end(), end)
+    is_v1 = "VERSION" not in keyword_dict
+    if not is_v1:
+        if "NOISE DATA" in keyword_dict:
+            return None
+        port_num = int(keyword_dict["NUMBER OF PORTS"][0])
+        _, data_start, data_end = keyword_dict["NETWORK DATA"]
+        two_port_order = keyword_dict.get("TWO-PORT DATA ORDER", ("12_21",))[0].strip()
+        matrix_format = keyword_dict.get("MATRIX FORMAT", ("FULL",))[0].strip().upper()
+        if "REFERENCE" in keyword_dict:
+            _, ref_start, ref_end = keyword_dict["REFERENCE"]
+            ref_text = keyword_dict["REFERENCE"][0] + " " + body[ref_start:ref_end]
+            reference = np.fromstring(ref_text, sep=" ")[:port_num]
+        else:
+            reference = np.full(port_num, resistance)
+    else:
+        ext = _SNP_EXT_RE.search(file_dir)
+        if ext is None or param == "Y":
+            # scikit-rf scales normalized 1.x admittances its own way, so
+            # those files stay with it to keep the two readers in agreement
+            return None
+        port_num = int(ext.group(1))
+        data_start = option.end() if option else 0
+        data_end = len(body)
+        two_port_order = "21_12"
+        matrix_format = "FULL"
+        reference = np.full(port_num, resistance)
+    if matrix_format == "FULL":
+        pair_num = port_num**2
+    else:
+        pair_num = port_num * (port_num + 1) // 2
+    row_len = 1 + 2 * pair_num
+    values = None
+    if n_row:
+        values = _read_row_subset(body[data_start:data_end], row_len, n_row)
+    if values is None:
+        values = np.fromstring(body[data_start:data_end], sep=" ")
+    if values.size % row_len:
+        if is_v1 and port_num == 2:
+            # 1.x two-port noise data rows are shorter
+            return None
+        raise ValueError(
+            file_dir + " holds " + str(values.size) + " values, which is not a whole number of "
+            "frequency points for " + str(port_num) + " ports."
+        )
+    values = values.reshape(-1, row_len)
+    f = values[:, 0] * _FREQ_UNIT[unit]
+    if is_v1 and port_num == 2 and np.any(np.diff(f) <= 0):
+        # 1.x two-port noise data restarts the frequency sweep
+        return None
+    if n_row and len(values) > n_row:
+        # the rows were not laid out alike, so all of them were parsed
+        row_index = get_row_index(f, n_row)
+        values, f = values[row_index], f[row_index]
+    pair = _get_complex(values[:, 1::2], values[:, 2::2], fmt)
+    data = np.empty((len(f), port_num, port_num), dtype=complex)
+    if matrix_format == "FULL":
+        data[:] = pair.reshape(-1, port_num, port_num)
+        if port_num == 2 and two_port_order == "21_12":
+            data = data.transpose(0, 2, 1).copy()
+    else:
+        rows, cols = (np.tril_indices if matrix_format == "LOWER" else np.triu_indices)(port_num)
+        data[:, rows, cols] = pair
+        data[:, cols, rows] = pair
+    z0 = np.broadcast_to(reference, (len(f), port_num)).astype(complex)
+    # 1.x stores Z normalized to the option line resistance, row by row as
+    # scikit-rf reads it
+    if param == "Z":
+        s = rf.z2s(data * z0[:, :, None] if is_v1 else data, z0)
+    elif param == "Y":
+        s = rf.y2s(data, z0)
+    else:
+        s = data
+    nw = rf.Network(frequency=rf.Frequency.from_f(f, unit="Hz"), s=s, z0=z0, name=name)
+    port_name_list = _PORT_NAME_RE.findall(text)
+    if port_name_list:
+        nw.port_names = [""] * port_num
+        for i_port, port_name in port_name_list:
+            nw.port_names[int(i_port) - 1] = port_name.strip()
+    return nw
+
+
+def _read_row_subset(data, row_len, n_row):
+    """Parse only the frequency rows :func:`get_row_index` picks.
+
+    Every row has to span the same number of non-blank lines, as the
+    touchstone writers wrap them, which the first row tells.
+
+    Args:
+        data (str): The data section.
+        row_len (int): The number of values in a row.
+        n_row (int): The number of rows to aim for.
+
+    Returns:
+        numpy.ndarray: The values of the picked rows as one flat array, or
+        ``None`` when the rows are not laid out alike or their frequencies
+        are not ascending.
+    """
+    raw = np.frombuffer(data.encode("utf-8"), dtype=np.uint8)
+    line_end = np.r_[np.flatnonzero(raw == ord("\n")), raw.size]
+    line_start = np.r_[0, line_end[:-1] + 1]
+    # a line only holding spaces, tabs, or a carriage return is blank
+    visible = np.logical_or.reduceat(raw > ord(" "), line_start[line_start < raw.size])
+    keep = np.zeros(len(line_start), dtype=bool)
+    keep[: len(visible)] = visible
+    line_start, line_end = line_start[keep], line_end[keep]
+    if not len(line_start):
+        return None
+    # the lines the first row spans
+    n_value = 0
+    line_per_row = 0
+    while n_value < row_len and line_per_row < len(line_start):
+        line = raw[line_start[line_per_row] : line_end[line_per_row]].tobytes()
+        n_value += len(line.split())
+        line_per_row += 1
+    if n_value != row_len or len(line_start) % line_per_row:
+        return None
+    head_start = line_start[::line_per_row]
+    head_end = line_end[::line_per_row]
+    f = np.array(
+        [float(raw[i_s:i_e].tobytes().split(None, 1)[0]) for i_s, i_e in zip(head_start, head_end)]
+    )
+    if np.any(np.diff(f) <= 0):
+        return None
+    row_end = line_end[line_per_row - 1 :: line_per_row]
+    text = b" ".join(
+        raw[head_start[i_r] : row_end[i_r]].tobytes() for i_r in get_row_index(f, n_row)
+    )
+    values = np.fromstring(text.decode("utf-8"), sep=" ")
+    if values.size % row_len:
+        return None
+    return values
+
+
+def _parse_option_line(option):
+    """Parse the option line into its four settings.
+
+    Args:
+        option (str): The option line without its ``#``. Empty when the file
+            has none.
+
+    Returns:
+        tuple: A 4-tuple ``(unit, param, fmt, resistance)``, upper-cased, with
+        the touchstone defaults ``GHZ``, ``S``, ``MA``, and ``50`` for the
+        settings the line leaves out.
+    """
+    unit, param, fmt, resistance = "GHZ", "S", "MA", 50.0
+    token_list = option.upper().split()
+    i_token = 0
+    while i_token < len(token_list):
+        token = token_list[i_token]
+        if token in _FREQ_UNIT:
+            unit = token
+        elif token in ("S", "Y", "Z", "G", "H"):
+            param = token
+        elif token in ("RI", "MA", "DB"):
+            fmt = token
+        elif token == "R" and i_token + 1 < len(token_list):
+            resistance = float(token_list[i_token + 1])
+            i_token += 1
+        i_token += 1
+    return unit, param, fmt, resistance
+
+
+def _get_complex(first, second, fmt):
+    """Combine the two columns of each value pair into complex numbers.
+
+    Args:
+        first (numpy.ndarray): Real parts, magnitudes, or dB values.
+        second (numpy.ndarray): Imaginary parts or angles in degrees.
+        fmt (str): ``"RI"``, ``"MA"``, or ``"DB"``.
+
+    Returns:
+        numpy.ndarray: The complex values, in the shape of the inputs.
+    """
+    match fmt:
+        case "RI":
+            return first + 1j * second
+        case "DB":
+            return 10 ** (first / 20) * np.exp(1j * np.deg2rad(second))
+    return first * np.exp(1j * np.deg2rad(second))
@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Created on Oct. 18, 2026
+
+Description:
+    This module tracks the solver processes launched by a run.
+
+    The solver used to be launched detached through the shell, so the monitor
+could only tell whether a process of that name was running anywhere on the
+machine, by listing every process. ``SolverProcess`` launches the command with
+``subprocess.Popen`` instead and keeps the process tree under the launched
+process, being the shell or start-up wrapper and the solver below it. The
+liveness, the exit code, the CPU time, and the resident memory are read for
+exactly those processes.
+
+    A launcher may also put the solver in the background and return, which
+re-parents the solver away from the tree. The solver can therefore write its
+own PID to a file, which is followed as part of the tree once it appears. No
+other process of the machine is looked at, so a solver of another run never
+passes for this one.
+
+    On Linux, the launched process also comes with a pidfd, a file descriptor
+that turns readable the moment the process exits, so the monitor can wait on
+the exit and on the ``.done`` markers at once. See
+``opensipi.done_watcher.DoneWatcher.wait``.
+"""
+
+import os
+import subprocess
+
+import psutil
+
+
+class SolverProcess:
+    """A solver command launched by opensipi, tracked by its process tree.
+
+    Attributes:
+        command (str): The command line.
+        popen (subprocess.Popen): The launched process, or ``None`` before
+            :meth:`launch`.
+        proc_dict (dict): PID to ``psutil.Process`` of every process of the
+            tree seen so far.
+        exit_fd (int): A pidfd of the launched process, or ``None`` where the
+            OS has none.
+        pid_dir (str): Full path of the file the solver writes its PID to,
+            or ``None``.
+    """
+
+    def __init__(self, command, pid_dir=None):
+        """Wrap a command without launching it.
+
+        Args:
+            command (str): The command line. Run through the shell on
+                non-Windows OS, so a ``CMD_HEADER`` prefix keeps working.
+            pid_dir (str, optional): Full path of the file the solver writes
+                its PID to. Defaults to ``None``, which tracks the launched
+                tree alone.
+        """
+        self.command = command
+        self.pid_dir = pid_dir
+        self.popen = None
+        self.proc_dict = {}
+        self.exit_fd = None
+
+    def launch(self):
+        """Launch the command, or launch it again.
+
+        The process is started in a session of its own, so interrupting the
+        monitor does not take the solver down with it.
+
+        Returns:
+            SolverProcess: This instance.
+        """
+        self.close()
+        # a PID left by the previous launch is not this solver's
+        if self.pid_dir is not None and os.path.exists(self.pid_dir):
+            os.remove(self.pid_dir)
+        if os.name == "nt":
+            self.popen = subprocess.Popen(self.command)
+        else:
+            self.popen = subprocess.Popen(self.command, shell=True, start_new_session=True)
+        self.proc_dict = {}
+        try:
+            self.proc_dict[self.popen.pid] = psutil.Process(self.popen.pid)
+        except psutil.NoSuchProcess:
+            pass
+        if hasattr(os, "pidfd_open"):
+            try:
+                self.exit_fd = os.pidfd_open(self.popen.pid)
+            except OSError:
+                self.exit_fd = None
+        return self
+
+    def poll(self):
+        """Get the exit code of the launched process.
+
+        Returns:
+            int: The exit code, or ``None`` while it is running.
+        """
+        return self.popen.poll()
+
+    def is_alive(self):
+        """Tell whether the solver is still running.
+
+        Returns:
+            bool: ``True`` while the launched process, a process started
+            under it, or the process of the PID file runs.
+        """
+        return self.poll() is None or bool(self.sample()["pid_list"])
+
+    def sample(self):
+        """Measure the process tree.
+
+        The process of the PID file, and the processes started under the
+        known ones since the last sample, are added to the tree first.
+
+        Returns:
+            dict: ``pid_list``, the PIDs of the live processes of the tree,
+            ``exit_code``, that of the launched process or ``None``,
+            ``cpu_time``, the user and system CPU seconds of the live
+            processes, and ``rss_mb``, their resident memory in MiB.
+        """
+        exit_code = self.poll()
+        self.__add_pid_file()
+        for proc in list(self.proc_dict.values()):
+            try:
+                for child in proc.children(recursive=True):
+                    self.proc_dict.setdefault(child.pid, child)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        pid_list = []
+        cpu_time = 0.0
+        rss = 0
+        for pid, proc in self.proc_dict.items():
+            try:
+                with proc.oneshot():
+                    # a gone process whose PID was taken by another
+                    if not proc.is_running() or proc.status() == psutil.STATUS_ZOMBIE:
+                        continue
+                    cpu = proc.cpu_times()
+                    cpu_time += cpu.user + cpu.system
+                    rss += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            pid_list.append(pid)
+        return {
+            "pid_list": pid_list,
+            "exit_code": exit_code,
+            "cpu_time": cpu_time,
+            "rss_mb": rss / 2**20,
+        }
+
+    def __add_pid_file(self):
+        """Add the process whose PID the solver wrote, once it is written."""
+        if self.pid_dir is None or not os.path.exists(self.pid_dir):
+            return
+        try:
+            with open(self.pid_dir) as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            # not written yet
+            return
+        if pid not in self.proc_dict:
+            try:
+                self.proc_dict[pid] = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                pass
+
+    def close(self):
+        """Drop the pidfd. The processes are left running."""
+        if self.exit_fd is not None:
+            os.close(self.exit_fd)
+            self.exit_fd = None
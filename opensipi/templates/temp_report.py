@@ -24,8 +24,8 @@ post-processing key is given in ``POST_PROCESS_KEY_ORDER_PDN`` or
 order, silently sends results to the wrong table.
 
 Attributes:
-    pdn_report (dict): Template for a PDN report. Section 1 holds two table
-        blocks, matching the PDN keys ``ZOPEN`` and ``ZSHORT``.
+    pdn_report (dict): Template for a PDN report. Section 1 holds three table
+        blocks, matching the PDN keys ``ZOPEN``, ``ZSHORT``, and ``ZMASK``.
     io_report (dict): Template for an HSIO or LSIO report. Section 1 holds six
         table blocks, matching the IO keys ``IL``, ``RL``, ``TDR``, ``IL_MM``,
         ``RL_MM``, and ``TDR_MM`` in that rank order.
@@ -93,6 +93,13 @@ pdn_report = {
                     "borders": [{"pos": "h0,1,-1;:", "width": 0.5}],
                     "table": [["Title", "DCR (mOhm)", "L@100MHz (pH)", "C@10kHz (nF)", "Figure"]],
                 },
+                {
+                    "widths": [3, 1, 1, 1, 1],
+                    "style": {"s": 9, "border_width": 0, "margin_left": 30, "margin_right": 30},
+                    "fills": [{"pos": "1::2;:", "color": 0.7}],
+                    "borders": [{"pos": "h0,1,-1;:", "width": 0.5}],
+                    "table": [["Title", "Mask", "Margin (dB)", "@ Freq (GHz)", "Figure"]],
+                },
             ],
         },
         {  # 2, figures
@@ -27,18 +27,109 @@ Note:
     so running this module directly fails.
 """
 
-from math import log10
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-import matplotlib.pyplot as plt
+import numpy as np
 import skrf as rf
-
+from scipy.signal import get_window
+from skrf.mathFunctions import nudge_eig
+
+from opensipi.mm_cache import MixedModeCache
+from opensipi.plot_manifest import PlotManifest
+from opensipi.result_export import ResultExport
+from opensipi.shared_network import SharedNetwork
+from opensipi.snp_cache import SnpCache
+from opensipi.snp_reader import read_touchstone, set_precision
 from opensipi.util.common import (
     SL,
+    get_file_hash,
     lol_numerical_add_num,
     make_dir,
     split_str_at_last_symbol,
 )
 
+# shared by every instance in the process, so figures outlive one file;
+# created on first draw, so a run that draws nothing never builds one
+_CANVAS = None
+# process id to its background writer and the writes it was handed
+_MM_WRITER = {}
+# the instance a plot worker process draws from
+_PLOT_WORKER = {}
+
+
+def _get_canvas():
+    """Get the canvas of this process, creating it on first use.
+
+    Returns:
+        PlotCanvas: The shared canvas.
+    """
+    global _CANVAS
+    if _CANVAS is None:
+        from opensipi.plot_canvas import PlotCanvas
+
+        _CANVAS = PlotCanvas()
+    return _CANVAS
+
+
+def _get_mm_writer():
+    """Get the background writer of the mixed-mode files of this process.
+
+    A forked worker inherits its parent's writer without the thread behind
+    it, so every process starts a writer of its own.
+
+    Returns:
+        list: A 2-list ``[executor, future_list]``, being a single-thread
+        executor and the writes submitted to it and not yet waited for.
+    """
+    pid = os.getpid()
+    if pid not in _MM_WRITER:
+        _MM_WRITER[pid] = [ThreadPoolExecutor(max_workers=1), []]
+    return _MM_WRITER[pid]
+
+
+def _init_plot_worker(info, nw_spec, nw_mm_spec):
+    """Set up a plot worker process on the shared networks of one file.
+
+    Args:
+        info (dict): The ``info`` dict of the file.
+        nw_spec (dict): The ``spec`` of the shared single-ended network.
+        nw_mm_spec (dict): The ``spec`` of the shared mixed-mode network, or
+            ``None`` when the mixed-mode keys read the single-ended one.
+    """
+    ts = TouchStone(info, lazy=True)
+    # the parent records the outputs, which are whole only there
+    ts.plot_reuse = False
+    ts.nw = SharedNetwork.attach(nw_spec)
+    ts.f = ts.nw.f / 1e9  # GHz
+    ts.port_num = ts.nw.number_of_ports
+    ts.nw_mm = ts.nw if nw_mm_spec is None else SharedNetwork.attach(nw_mm_spec)
+    _PLOT_WORKER["ts"] = ts
+
+
+def _process_plot_task(task):
+    """Draw the figures of one task in a plot worker process.
+
+    Args:
+        task (tuple): A 2-tuple ``(key, part_list)``, being the
+            post-processing key and, for a mixed-mode key, the quadrants or
+            modes to draw, else ``None``.
+
+    Returns:
+        list or dict: The output of the task, as ``TouchStone.process_key``
+        gives it, holding only the parts drawn for a mixed-mode key.
+    """
+    key, part_list = task
+    ts = _PLOT_WORKER["ts"]
+    match key:
+        case "IL_MM":
+            return ts.plot_il_mm(ts.conn_dict[key], ts.nw_mm.s, key, part_list)
+        case "RL_MM":
+            return ts.plot_rl_mm(ts.conn_dict[key], ts.nw_mm.s, key, part_list)
+        case "TDR_MM":
+            return ts.plot_tdr_mm(ts.conn_dict[key], ts.nw_mm, key, part_list)
+    return ts.process_key(key)
+
 
 class TouchStone:
     """Post-process one touchstone file into plots and extracted values.
@@ -47,15 +138,27 @@ class TouchStone:
         MM_KEY (list of str): The post-processing keys that require the
             single-ended network to be converted to mixed-mode. Used to decide
             whether to pay for that conversion at construction time.
+        RLC_FREQ (numpy.ndarray): The frequencies in Hz the resistance, the
+            capacitance, and the inductance are read at, in that order. A
+            class attribute, shared with the pole-residue models.
+        MM_PART (dict): Mixed-mode key to the quadrants or modes it plots, one
+            figure each, in the order its output lists them.
     """
 
-    def __init__(self, info):
+    RLC_FREQ = np.array([1e3, 1e4, 1e8])  # R@1KHz, C@10KHz, L@100MHz
+
+    def __init__(self, info, lazy=False):
         """Load the touchstone file and prepare the networks to work from.
 
         The file is read here, and the mixed-mode conversion is done up front
         when the spec type calls for it, so the plotting methods can assume
         both networks already exist.
 
+        A lazy instance skips all of that and only records ``info``. The
+        network attributes below are then filled in on first access, each
+        stage on its own, so a spec type without mixed-mode keys never builds
+        ``nw_mm``. See :meth:`release` for dropping them again.
+
         Args:
             info (dict): Everything needed to process this one file.
 
@@ -67,6 +170,51 @@ class TouchStone:
                 * ``conn_dict`` (dict): Connectivity lists per post-processing
                   key, telling each plot which ports to draw. All port numbers
                   here are one-based.
+                * ``cache_dir`` (str, optional): Folder of the binary cache to
+                  read the file through. See ``opensipi.snp_cache.SnpCache``.
+                  Omit to parse the file directly.
+                * ``cache_mb`` (float, optional): Size cap of that folder in
+                  MiB. Required with ``cache_dir``.
+                * ``tdr_settings`` (dict, optional): Rise time, window, and
+                  time span of the TDR plots. See :meth:`get_tdr`.
+                * ``mm_settings`` (dict, optional): How the mixed-mode
+                  network is obtained, with the keys ``cache`` (bool, reuse
+                  an earlier conversion from the ``Mixed_Mode`` folder,
+                  defaults to ``True``), ``quadrants`` (``"all"``, the
+                  default, or ``"needed"`` to skip the mode-conversion
+                  quadrants when only ``RL_MM`` asks for a conversion), and
+                  ``write_snp`` (``"sync"``, the default, ``"async"`` to
+                  write the ``_mm`` touchstone file on a background thread,
+                  or ``"off"``).
+                * ``plot_reuse`` (bool, optional): Reuse the figures and
+                  values an earlier report left in ``plt_dir`` when their
+                  inputs have not changed. See :meth:`auto_process`.
+                  Defaults to ``False``.
+                * ``plot_workers`` (int, optional): Number of worker
+                  processes drawing the figures of this one file. See
+                  :meth:`auto_process`. Defaults to ``1``.
+                * ``curve_export`` (bool, optional): Write the curves of every
+                  figure to a shard beside it, for
+                  ``opensipi.result_export.ResultExport``. Defaults to
+                  ``False``.
+                * ``mask_plot`` (bool, optional): Draw a figure per port for
+                  the ``ZMASK`` key. When off, the mask is only checked. See
+                  :meth:`plot_zmask`. Defaults to ``True``.
+                * ``precision`` (str, optional): ``"single"`` to hold the S
+                  matrices as complex64, which halves their memory and takes
+                  the dB and magnitude views in float32. The impedance
+                  solves, port terminations, and mixed-mode conversion still
+                  run in double precision, as they invert matrices close to
+                  singular. See ``opensipi.snp_reader.set_precision``.
+                  Defaults to ``"double"``.
+                * ``quick_look`` (bool, optional): Make a rough report fast.
+                  Only about ``QUICK_LOOK_ROW`` frequency rows of the file
+                  are parsed, the keys in ``QUICK_LOOK_SKIP`` are left out,
+                  the figures are saved at ``QUICK_LOOK_DPI``, and no curves
+                  are exported, whatever ``curve_export`` says. Defaults to
+                  ``False``.
+            lazy (bool, optional): Defer reading the file and converting it
+                until the data is first needed. Defaults to ``False``.
 
         Attributes:
             f (numpy.ndarray): The frequency axis in GHz. The underlying
@@ -74,56 +222,289 @@ class TouchStone:
             nw (skrf.Network): The single-ended network read from the file.
             nw_mm (skrf.Network): The mixed-mode network, or ``nw`` itself when
                 no mixed-mode post-processing was requested.
+            mm_settings (dict): The mixed-mode settings, empty for the
+                defaults.
+            plot_reuse (bool): Whether earlier outputs are reused.
+            plot_workers (int): Number of worker processes drawing the figures.
+            curve_export (bool): Whether the curves of each figure are written
+                to a shard.
+            mask_plot (bool): Whether the ``ZMASK`` figures are drawn.
+            precision (str): The precision the S matrices are held in.
+            quick_look (bool): Whether this is a quick look.
             port_num (int): Port count of the single-ended network.
-            short0 (skrf.Network): A one-port short used to terminate ports.
+            snp_hash (str): Content hash of the snp file. Computed on first
+                use.
+            tdr_settings (dict): The TDR settings, empty for the defaults.
+            z_cache (dict): Self impedances already solved for by
+                :meth:`get_z_self`. Created empty on first use.
         """
         # define constants
         self.MM_KEY = ["IL_MM", "RL_MM"]
+        self.MM_PART = {
+            "IL_MM": ["DD", "CC", "DC", "CD"],
+            "RL_MM": ["DD", "CC"],
+            "TDR_MM": ["DD", "CC"],
+        }
+        self.QUICK_LOOK_ROW = 200
+        self.QUICK_LOOK_DPI = 50
+        self.QUICK_LOOK_SKIP = ["TDR", "IL_MM", "RL_MM", "TDR_MM"]
         # define variables
         self.file_dir = info["file_dir"]
         self.key_name = info["key_name"]
         self.plt_dir = info["plt_dir"]
         self.spec_type = info["spec_type"]
         self.conn_dict = info["conn_dict"]
-        self.nw = rf.Network(self.file_dir)
-        self.f = self.nw.f / 1e9  # GHz
-        self.short0 = self.__get_short_block()
-        self.port_num = self.nw.number_of_ports
-        self.nw_mm = self.__get_mixedmode_network()
+        self.tdr_settings = info.get("tdr_settings", {})
+        self.plot_reuse = info.get("plot_reuse", False)
+        self.mm_settings = info.get("mm_settings", {})
+        self.plot_workers = info.get("plot_workers", 1)
+        self.curve_export = info.get("curve_export", False)
+        self.mask_plot = info.get("mask_plot", True)
+        self.precision = info.get("precision", "double")
+        self.quick_look = info.get("quick_look", False)
+        if self.quick_look:
+            # the row subset must not replace the curves of a full report
+            self.curve_export = False
+            process_key = self.spec_type["POST_PROCESS_KEY"]
+            self.spec_type = dict(self.spec_type)
+            self.spec_type["POST_PROCESS_KEY"] = [
+                key for key in process_key if key not in self.QUICK_LOOK_SKIP
+            ]
+        self.__info = info
+        if not lazy:
+            self.__load_single_ended()
+            self.nw_mm = self.__get_mixedmode_network()
+
+    def __getattr__(self, name):
+        """Build a network attribute a lazy or released instance is missing.
+
+        Only called when normal lookup fails, so an attribute already set is
+        served directly at no cost.
+
+        Args:
+            name (str): The attribute being looked up.
+
+        Returns:
+            object: The freshly built attribute.
+
+        Raises:
+            AttributeError: When ``name`` is not one of the network attributes.
+        """
+        match name:
+            case "nw" | "f" | "port_num":
+                self.__load_single_ended()
+            case "nw_mm":
+                self.nw_mm = self.__get_mixedmode_network()
+            case "z_cache":
+                self.z_cache = {}
+            case "snp_hash":
+                self.snp_hash = get_file_hash(self.file_dir)
+            case _:
+                raise AttributeError(type(self).__name__ + " object has no attribute " + repr(name))
+        return self.__dict__[name]
+
+    def release(self):
+        """Drop the networks so their memory can be reclaimed.
+
+        The instance stays usable. Touching a network attribute afterwards
+        reads the file again, which for ``nw_mm`` also repeats the mixed-mode
+        conversion and rewrites its file.
+        """
+        for name in ("nw", "f", "port_num", "nw_mm", "z_cache"):
+            self.__dict__.pop(name, None)
 
     def auto_process(self):
         """Automatically process SNP files based on spect_type.
 
-        Each key in the spec type's ``POST_PROCESS_KEY`` list is dispatched to
-        the matching plot method. A key with no case here is skipped silently.
+        Each key in the spec type's ``POST_PROCESS_KEY`` list is handed to
+        :meth:`process_key`. A key with no case there is skipped silently.
+
+        With ``plot_reuse`` set, the output of each key is looked up in the
+        ``opensipi.plot_manifest.PlotManifest`` of the plot folder first, under
+        a hash of the snp content, the key, the connectivity, the spec type,
+        the TDR settings, and the rendering style version. A valid entry is
+        returned as is, without loading the network or drawing anything, and
+        a freshly produced output is recorded for the next report.
+
+        With ``plot_workers`` above ``1``, the figures are drawn by that many
+        worker processes instead, see :meth:`__auto_process_parallel`.
 
         Returns:
             dict: Post-processing key to that key's output. The value is a list
             of ``[fig_title, fig_dir, ...]`` entries for the single-ended keys,
             and a dict of mixed-mode type to such a list for the ``_MM`` keys.
         """
+        if self.plot_workers > 1:
+            return self.__auto_process_parallel()
         output_dict = {}
-        process_key = self.spec_type["POST_PROCESS_KEY"]
-        for key in process_key:
-            match key:
-                case "ZOPEN":
-                    output_dict[key] = self.plot_zself(key)
-                case "ZSHORT":
-                    output_dict[key] = self.plot_zself_shortsns(key)
-                case "IL":
-                    output_dict[key] = self.plot_il(self.conn_dict[key], self.nw.s_db, key)
-                case "RL":
-                    output_dict[key] = self.plot_rl(self.conn_dict[key], self.nw.s_db, key)
-                case "IL_MM":
-                    output_dict[key] = self.plot_il_mm(self.conn_dict[key], self.nw_mm.s_db, key)
-                case "RL_MM":
-                    output_dict[key] = self.plot_rl_mm(self.conn_dict[key], self.nw_mm.s_db, key)
-                case "TDR":
-                    output_dict[key] = self.plot_tdr(self.conn_dict[key], self.nw, key)
-                case "TDR_MM":
-                    output_dict[key] = self.plot_tdr_mm(self.conn_dict[key], self.nw_mm, key)
+        for key in self.spec_type["POST_PROCESS_KEY"]:
+            output = self.process_key(key)
+            if output is not None:
+                output_dict[key] = output
         return output_dict
 
+    def __auto_process_parallel(self):
+        """Draw the figures of this file in a pool of worker processes.
+
+        Meant for a single large file, where drawing dominates and the file
+        level parallelism of the report has nothing to spread. The networks
+        are placed in shared memory once, see
+        ``opensipi.shared_network.SharedNetwork``, and every worker attaches
+        to them instead of being sent a copy. Each key is one task, and each
+        quadrant or mode of a mixed-mode key is a task of its own, so the
+        workers draw disjoint sets of figures. The plot manifest is read and
+        written here, as in the serial loop.
+
+        Returns:
+            dict: The same output :meth:`auto_process` gives serially.
+        """
+        output_dict = {}
+        task_list = []
+        for key in self.spec_type["POST_PROCESS_KEY"]:
+            output = self.load_output(key)
+            if output is not None:
+                output_dict[key] = output
+            elif key in self.MM_PART:
+                output_dict[key] = {}
+                task_list += [(key, [part]) for part in self.MM_PART[key]]
+            else:
+                # a placeholder keeps the order of the keys
+                output_dict[key] = None
+                task_list.append((key, None))
+        if not task_list:
+            return output_dict
+        share_list = [SharedNetwork.create(self.nw)]
+        try:
+            nw_mm_spec = None
+            if any(key in self.MM_PART for key, _ in task_list) and self.nw_mm is not self.nw:
+                share_list.append(SharedNetwork.create(self.nw_mm))
+                nw_mm_spec = share_list[1].spec
+            max_workers = min(self.plot_workers, len(task_list))
+            initargs = (self.__info, share_list[0].spec, nw_mm_spec)
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_plot_worker, initargs=initargs
+            ) as pool:
+                for (key, part_list), output in zip(
+                    task_list, pool.map(_process_plot_task, task_list), strict=True
+                ):
+                    if part_list is None:
+                        output_dict[key] = output
+                    else:
+                        output_dict[key].update(output)
+        finally:
+            for shared in share_list:
+                shared.release()
+        for key in dict.fromkeys(key for key, _ in task_list):
+            if output_dict[key] is None:
+                del output_dict[key]
+            else:
+                self.save_output(key, output_dict[key])
+        return output_dict
+
+    def process_key(self, key):
+        """Produce the output of one post-processing key.
+
+        Args:
+            key (str): The post-processing key.
+
+        Returns:
+            list or dict: The output of the key, as :meth:`auto_process` gives
+            it, or ``None`` for a key with no case here.
+        """
+        output = self.load_output(key)
+        if output is not None:
+            return output
+        match key:
+            case "ZOPEN":
+                output = self.plot_zself(key)
+            case "ZSHORT":
+                output = self.plot_zself_shortsns(key)
+            case "ZMASK":
+                output = self.plot_zmask(key)
+            case "IL":
+                output = self.plot_il(self.conn_dict[key], self.nw.s, key)
+            case "RL":
+                output = self.plot_rl(self.conn_dict[key], self.nw.s, key)
+            case "IL_MM":
+                output = self.plot_il_mm(self.conn_dict[key], self.nw_mm.s, key)
+            case "RL_MM":
+                output = self.plot_rl_mm(self.conn_dict[key], self.nw_mm.s, key)
+            case "TDR":
+                output = self.plot_tdr(self.conn_dict[key], self.nw, key)
+            case "TDR_MM":
+                output = self.plot_tdr_mm(self.conn_dict[key], self.nw_mm, key)
+            case _:
+                return None
+        self.save_output(key, output)
+        return output
+
+    def load_output(self, key):
+        """Look up the output an earlier report recorded for one key.
+
+        Args:
+            key (str): The post-processing key.
+
+        Returns:
+            list or dict: The recorded output, or ``None`` when
+            ``plot_reuse`` is off or the manifest holds no valid entry. With
+            ``curve_export`` on, an entry is also left unused while a curve
+            shard of its figures is missing.
+        """
+        if not self.plot_reuse:
+            return None
+        manifest = PlotManifest(self.plt_dir)
+        output = manifest.load(manifest.get_input_hash(self.__get_plot_input(key)))
+        if output is not None and self.curve_export:
+            if isinstance(output, dict):
+                entry_list = [i_entry for value in output.values() for i_entry in value]
+            else:
+                entry_list = output
+            for i_entry in entry_list:
+                if not os.path.isfile(ResultExport.get_shard_dir(self.plt_dir, i_entry[0])):
+                    return None
+        return output
+
+    def save_output(self, key, output):
+        """Record the output of one key for later reports.
+
+        Nothing is recorded unless ``plot_reuse`` is on.
+
+        Args:
+            key (str): The post-processing key.
+            output (list or dict): Its output, as :meth:`auto_process` gives
+                it.
+        """
+        if self.plot_reuse:
+            manifest = PlotManifest(self.plt_dir)
+            manifest.save(manifest.get_input_hash(self.__get_plot_input(key)), output)
+
+    def __get_plot_input(self, key):
+        """Get everything the output of one post-processing key depends on.
+
+        Args:
+            key (str): The post-processing key.
+
+        Returns:
+            dict: The inputs, to be hashed into a manifest entry name.
+        """
+        plot_input = {
+            "snp_hash": self.snp_hash,
+            "key_name": self.key_name,
+            "plt_dir": self.plt_dir,
+            "post_process_key": key,
+            "spec_type": self.spec_type,
+            "conn_dict": self.conn_dict,
+            "tdr_settings": self.tdr_settings,
+            "style_version": _get_canvas().STYLE_VERSION,
+        }
+        if key == "ZMASK":
+            plot_input["mask_plot"] = self.mask_plot
+        if self.precision != "double":
+            plot_input["precision"] = self.precision
+        if self.quick_look:
+            plot_input["quick_look"] = True
+        return plot_input
+
     def plot_zself(self, prockey=None):
         """Plot the self impedance with the sense ports left floating.
 
@@ -142,24 +523,13 @@ class TouchStone:
             resistance slot is left empty, as it is not meaningful with the
             sense ports open.
         """
-        output_list = []
-        if prockey:
-            proc_key_name = "__" + prockey + "_"
-        else:
-            proc_key_name = ""
         last_plot_port_index = len(self.conn_dict["ZIN"])  # starting from 1
-        nw = self.nw.copy()
-        for i_port in range(last_plot_port_index):  # starting from 0
-            zself = nw.z_mag[:, i_port, i_port]
-            fig_data = [[self.f, zself]]
-            fig_title = self.key_name + proc_key_name + "_Port" + str(i_port + 1)
-            fig_dir = self.plt_dir + fig_title + ".png"
-            self.plot_zmag(fig_data, fig_title, fig_dir)
-            # extract LC
-            snp_dir = self.file_dir
-            _, l_hf, c_lf = self.__get_rlc(nw, i_port, snp_dir)
-            output_list.append([fig_title, fig_dir, "", f"{l_hf:.2f}", f"{c_lf:.2f}"])
-        return output_list
+        nw = self.nw
+        port_list = list(range(last_plot_port_index))  # starting from 0
+        # extract LC
+        r_dc, l_hf, c_lf, _ = self.__get_rlc(nw, port_list, self.file_dir)
+        z_self = np.abs(self.get_z_self(nw, port_list))
+        return self.draw_zself(z_self, (r_dc, l_hf, c_lf), False, prockey)
 
     def plot_zself_shortsns(self, prockey=None):
         """Plot the self impedance with the sense ports shorted.
@@ -179,43 +549,174 @@ class TouchStone:
             capacitance slot is left empty, as it is not meaningful with the
             sense ports shorted.
         """
-        output_list = []
+        last_plot_port_index = len(self.conn_dict["ZIN"])  # starting from 1
+        # short all sns ports, from 0
+        sns_port_list = list(range(last_plot_port_index, self.nw.number_of_ports))
+        nw_red = self.terminate_ports(self.nw, sns_port_list)
+
+        port_list = list(range(nw_red.number_of_ports))
+        # extract RL
+        r_dc, l_hf, c_lf, _ = self.__get_rlc(nw_red, port_list, self.file_dir)
+        z_self = np.abs(self.get_z_self(nw_red, port_list))
+        return self.draw_zself(z_self, (r_dc, l_hf, c_lf), True, prockey)
+
+    def draw_zself(self, z_self, rlc, sns_shorted, prockey=None):
+        """Draw one self impedance figure per port and list the outputs.
+
+        Args:
+            z_self (numpy.ndarray): The impedance magnitudes in Ohm, indexed
+                ``[freq, port]``.
+            rlc (tuple): A 3-tuple ``(r_dc, l_hf, c_lf)`` of arrays with one
+                value per port, as :meth:`__get_rlc` gives them.
+            sns_shorted (bool): Whether the sense ports were shorted, which
+                reports the resistance in place of the capacitance.
+            prockey (str, optional): Post-processing key, folded into the
+                figure names.
+
+        Returns:
+            list of list: One entry per port, being
+            ``[fig_title, fig_dir, R_mOhm, L_pH, C_nF]`` with the slot that is
+            not meaningful left empty.
+        """
         if prockey:
             proc_key_name = "__" + prockey + "_"
         else:
             proc_key_name = ""
-        last_plot_port_index = len(self.conn_dict["ZIN"])  # starting from 1
-        short_port_number = self.nw.number_of_ports - last_plot_port_index
-        nw_red = self.nw.copy()
-        # short all sns ports
-        while short_port_number > 0:
-            # from 0
-            last_short_port = last_plot_port_index + short_port_number - 1
-            nw_red = rf.connect(nw_red, last_short_port, self.short0, 0)
-            short_port_number -= 1
-
-        for i_port in range(nw_red.number_of_ports):
-            zself = nw_red.z_mag[:, i_port, i_port]
-            fig_data = [[self.f, zself]]
+        r_dc, l_hf, c_lf = rlc
+        output_list = []
+        for i_port in range(z_self.shape[1]):
+            fig_data = [[self.f, z_self[:, i_port]]]
             fig_title = self.key_name + proc_key_name + "_Port" + str(i_port + 1)
             fig_dir = self.plt_dir + fig_title + ".png"
             self.plot_zmag(fig_data, fig_title, fig_dir)
+            self.save_curves(fig_title, self.f, z_self[:, i_port, None], ["Port" + str(i_port + 1)])
+            if sns_shorted:
+                rlc_list = [f"{r_dc[i_port]:.2f}", f"{l_hf[i_port]:.2f}", ""]
+            else:
+                rlc_list = ["", f"{l_hf[i_port]:.2f}", f"{c_lf[i_port]:.2f}"]
+            output_list.append([fig_title, fig_dir] + rlc_list)
+        return output_list
+
+    def plot_zmask(self, prockey=None):
+        """Check the self impedance against the target impedance mask.
+
+        The ports and the network are those of :meth:`plot_zself`, so the
+        check shares its impedance solve. All ports are checked in one pass,
+        see :meth:`check_zmask`, against the ``Z_MASK`` breakpoints of the
+        spec type. With ``mask_plot`` on, one figure per port shows the
+        impedance and the mask; with it off, nothing is drawn and the figure
+        slot is left empty.
+
+        Args:
+            prockey (str, optional): Post-processing key, folded into the
+                figure names.
 
-            # extract RL
-            snp_dir = self.file_dir
-            r_dc, l_hf, _ = self.__get_rlc(nw_red, i_port, snp_dir)
-            output_list.append([fig_title, fig_dir, f"{r_dc:.2f}", f"{l_hf:.2f}", ""])
+        Returns:
+            list of list: One entry per main port, being
+            ``[fig_title, fig_dir, result, margin_dB, margin_freq_GHz]``. The
+            result is ``"PASS"``, ``"FAIL"``, or ``"N/A"`` when the mask does
+            not overlap the sweep, and the margin is the smallest distance in
+            dB the impedance stays below the mask, negative when it goes
+            above.
+
+        Raises:
+            ValueError: If the spec type holds no ``Z_MASK``.
+        """
+        if "Z_MASK" not in self.spec_type:
+            raise ValueError(f"ZMASK of {self.key_name} needs a Z_MASK in its spec type.")
+        mask = np.asarray(self.spec_type["Z_MASK"], dtype=float)
+        port_list = list(range(len(self.conn_dict["ZIN"])))
+        z_self = np.abs(self.get_z_self(self.nw, port_list))
+        z_limit, margin_db, i_worst = self.check_zmask(self.nw.f, z_self, mask)
+        if prockey:
+            proc_key_name = "__" + prockey + "_"
+        else:
+            proc_key_name = ""
+        mask_option = {"label": "Mask", "color": "red", "linestyle": "--"}
+        output_list = []
+        for i_port in port_list:
+            port_name = "Port" + str(i_port + 1)
+            fig_title = self.key_name + proc_key_name + "_" + port_name
+            fig_dir = ""
+            if self.mask_plot:
+                fig_dir = self.plt_dir + fig_title + ".png"
+                fig_data = [
+                    [self.f, z_self[:, i_port], {"label": port_name}],
+                    [mask[:, 0] / 1e9, mask[:, 1], mask_option],
+                ]
+                self.plot_zmag(fig_data, fig_title, fig_dir)
+            self.save_curves(
+                fig_title, self.f, np.c_[z_self[:, i_port], z_limit], [port_name, "Mask"]
+            )
+            if i_worst[i_port] < 0:
+                result_list = ["N/A", "", ""]
+            else:
+                result_list = [
+                    "PASS" if margin_db[i_port] >= 0 else "FAIL",
+                    f"{margin_db[i_port]:.2f}",
+                    f"{self.f[i_worst[i_port]]:.4g}",
+                ]
+            output_list.append([fig_title, fig_dir] + result_list)
         return output_list
 
-    def plot_il(self, conn_list, nw_s_db, prockey=None, header="S"):
+    @staticmethod
+    def check_zmask(f, z_mag, mask):
+        """Check impedance magnitudes against a piecewise log-log mask.
+
+        The mask is interpolated onto the frequency grid once, linearly in
+        log frequency and log impedance, and every port is compared with it in
+        one array operation. Frequencies outside the mask, and the DC point,
+        are not checked.
+
+        Args:
+            f (numpy.ndarray): The frequency axis in Hz.
+            z_mag (numpy.ndarray): The impedance magnitudes in Ohm, indexed
+                ``[freq, port]``.
+            mask (numpy.ndarray): The mask breakpoints as ``[freq_Hz, Ohm]``
+                rows, in ascending frequency.
+
+        Returns:
+            tuple: A 3-tuple ``(z_limit, margin_db, i_worst)``. ``z_limit`` is
+            the mask on the frequency grid, NaN where it is not checked.
+            ``margin_db`` holds the smallest ``20 * log10(z_limit / |Z|)`` of
+            each port, being negative when the port fails, and ``i_worst`` the
+            frequency index it occurs at. Both are NaN and ``-1`` when the mask
+            does not overlap the grid.
+
+        Raises:
+            ValueError: If the mask has fewer than two breakpoints, or its
+                frequencies or impedances are not positive, or its
+                frequencies are not ascending.
+        """
+        mask = np.asarray(mask, dtype=float)
+        if mask.ndim != 2 or len(mask) < 2 or np.any(mask <= 0) or np.any(np.diff(mask[:, 0]) <= 0):
+            raise ValueError(
+                "A Z mask needs two or more positive [freq, Ohm] points in ascending freq."
+            )
+        f = np.asarray(f, dtype=float)
+        in_span = (f >= mask[0, 0]) & (f <= mask[-1, 0])
+        log_mask = np.log10(mask)
+        z_limit = np.full(f.shape, np.nan)
+        z_limit[in_span] = 10 ** np.interp(np.log10(f[in_span]), log_mask[:, 0], log_mask[:, 1])
+        n_port = z_mag.shape[1]
+        if not in_span.any():
+            return z_limit, np.full(n_port, np.nan), np.full(n_port, -1)
+        with np.errstate(divide="ignore"):
+            margin = 20 * np.log10(z_limit[in_span, None] / z_mag[in_span])
+        i_span = np.flatnonzero(in_span)
+        i_min = np.argmin(margin, axis=0)
+        return z_limit, margin[i_min, np.arange(n_port)], i_span[i_min]
+
+    def plot_il(self, conn_list, nw_s, prockey=None, header="S"):
         """Plot insertion loss based on the connectivity dict.
 
         Every requested through path is drawn as one curve on a single figure.
+        Only those paths are taken out of the S matrix and converted to dB.
 
         Args:
             conn_list (list of list of int): One ``[input_port, output_port]``
                 pair per curve, one-based.
-            nw_s_db (numpy.ndarray): The S-parameters in dB, indexed
+            nw_s (numpy.ndarray): The complex S-parameters, indexed
                 ``[freq, output, input]``.
             prockey (str, optional): Post-processing key, folded into the
                 figure name.
@@ -227,23 +728,13 @@ class TouchStone:
             list of list of str: A single entry ``[fig_title, fig_dir]``, since
             all the curves share one figure.
         """
-        if prockey:
-            proc_key_name = "__" + prockey + "__" + header
-        else:
-            proc_key_name = "__" + header
-        output_list = []
-        fig_data = []
-        for i_conn in conn_list:
-            sil = nw_s_db[:, i_conn[1] - 1, i_conn[0] - 1]  # freq, output, input
-            label = header + str(i_conn[1]) + str(i_conn[0])
-            fig_data.append([self.f, sil, {"label": label}])
-        fig_title = self.key_name + proc_key_name
-        fig_dir = self.plt_dir + fig_title + ".png"
-        self.plot_smag(fig_data, fig_title, fig_dir)
-        output_list.append([fig_title, fig_dir])
-        return output_list
+        out_list = [i_conn[1] - 1 for i_conn in conn_list]
+        in_list = [i_conn[0] - 1 for i_conn in conn_list]
+        sil = self.get_s_path(nw_s, out_list, in_list)
+        label_list = [header + str(i_conn[1]) + str(i_conn[0]) for i_conn in conn_list]
+        return self.draw_s_path(sil, label_list, prockey, header)
 
-    def plot_rl(self, conn_list, nw_s_db, prockey=None, header="S"):
+    def plot_rl(self, conn_list, nw_s, prockey=None, header="S"):
         """Plot return loss based on the connectivity dict.
 
         Every requested port is drawn as one reflection curve on a single
@@ -251,11 +742,30 @@ class TouchStone:
 
         Args:
             conn_list (list of int): The ports to draw, one-based.
-            nw_s_db (numpy.ndarray): The S-parameters in dB.
+            nw_s (numpy.ndarray): The complex S-parameters.
             prockey (str, optional): Post-processing key, folded into the
                 figure name.
             header (str, optional): Curve label prefix. Defaults to ``"S"``.
 
+        Returns:
+            list of list of str: A single entry ``[fig_title, fig_dir]``.
+        """
+        port_list = [i_conn - 1 for i_conn in conn_list]
+        srl = self.get_s_path(nw_s, port_list, port_list)
+        label_list = [header + str(i_conn) + str(i_conn) for i_conn in conn_list]
+        return self.draw_s_path(srl, label_list, prockey, header)
+
+    def draw_s_path(self, s_path, label_list, prockey=None, header="S"):
+        """Draw some S-parameter paths on one figure and list the output.
+
+        Args:
+            s_path (numpy.ndarray): The paths in dB, indexed ``[freq, path]``.
+            label_list (list of str): The curve label of each path.
+            prockey (str, optional): Post-processing key, folded into the
+                figure name.
+            header (str, optional): The mode being drawn, folded into the
+                figure name. Defaults to ``"S"``.
+
         Returns:
             list of list of str: A single entry ``[fig_title, fig_dir]``.
         """
@@ -263,19 +773,16 @@ class TouchStone:
             proc_key_name = "__" + prockey + "__" + header
         else:
             proc_key_name = "__" + header
-        output_list = []
         fig_data = []
-        for i_conn in conn_list:
-            srl = nw_s_db[:, i_conn - 1, i_conn - 1]
-            label = header + str(i_conn) + str(i_conn)
-            fig_data.append([self.f, srl, {"label": label}])
+        for i_path, label in enumerate(label_list):
+            fig_data.append([self.f, s_path[:, i_path], {"label": label}])
         fig_title = self.key_name + proc_key_name
         fig_dir = self.plt_dir + fig_title + ".png"
         self.plot_smag(fig_data, fig_title, fig_dir)
-        output_list.append([fig_title, fig_dir])
-        return output_list
+        self.save_curves(fig_title, self.f, s_path, label_list)
+        return [[fig_title, fig_dir]]
 
-    def plot_il_mm(self, conn_list, nw_mm_s_db, prockey=None):
+    def plot_il_mm(self, conn_list, nw_mm_s, prockey=None, quad_list=None):
         """Plot mixed-mode insertion loss based on the connectivity dict.
 
         All four quadrants are plotted, so both the wanted differential and
@@ -285,27 +792,26 @@ class TouchStone:
         Args:
             conn_list (list of list of int): One ``[input_port, output_port]``
                 pair per curve, numbered in mixed-mode ports.
-            nw_mm_s_db (numpy.ndarray): The mixed-mode S-parameters in dB.
+            nw_mm_s (numpy.ndarray): The complex mixed-mode S-parameters.
             prockey (str, optional): Post-processing key, folded into the
                 figure names.
+            quad_list (list of str, optional): The quadrants to plot, out of
+                ``MM_PART["IL_MM"]``. Defaults to all of them.
 
         Returns:
             dict: Quadrant name to the output of :meth:`plot_il` for it, with
-            the keys ``"DD"``, ``"CC"``, ``"DC"``, and ``"CD"``.
+            the keys ``"DD"``, ``"CC"``, ``"DC"``, and ``"CD"`` in that order.
+            ``DC`` is the differential output from a common input and ``CD``
+            the other way round.
         """
-        nw_dd, nw_dc, nw_cd, nw_cc = self.__split_mixedmode_network(nw_mm_s_db)
+        nw_quad = dict(zip(["DD", "DC", "CD", "CC"], self.__split_mixedmode_network(nw_mm_s)))
         out_dict = {}
-        # Diff_Diff
-        out_dict["DD"] = self.plot_il(conn_list, nw_dd, prockey, "SDD")
-        # Comm_Comm
-        out_dict["CC"] = self.plot_il(conn_list, nw_cc, prockey, "SCC")
-        # Diff_Comm: Diff output from Comm input
-        out_dict["DC"] = self.plot_il(conn_list, nw_dc, prockey, "SDC")
-        # Comm_Diff: Comm output from Diff input
-        out_dict["CD"] = self.plot_il(conn_list, nw_cd, prockey, "SCD")
+        for quad in self.MM_PART["IL_MM"]:
+            if quad_list is None or quad in quad_list:
+                out_dict[quad] = self.plot_il(conn_list, nw_quad[quad], prockey, "S" + quad)
         return out_dict
 
-    def plot_rl_mm(self, conn_list, nw_mm_s_db, prockey=None):
+    def plot_rl_mm(self, conn_list, nw_mm_s, prockey=None, quad_list=None):
         """Plot mixed-mode return loss based on the connectivity dict.
 
         Only the two like-mode quadrants are plotted, as reflection is read
@@ -313,22 +819,78 @@ class TouchStone:
 
         Args:
             conn_list (list of int): The mixed-mode ports to draw, one-based.
-            nw_mm_s_db (numpy.ndarray): The mixed-mode S-parameters in dB.
+            nw_mm_s (numpy.ndarray): The complex mixed-mode S-parameters.
             prockey (str, optional): Post-processing key, folded into the
                 figure names.
+            quad_list (list of str, optional): The quadrants to plot, out of
+                ``MM_PART["RL_MM"]``. Defaults to both.
 
         Returns:
             dict: Quadrant name to the output of :meth:`plot_rl` for it, with
             the keys ``"DD"`` and ``"CC"``.
         """
-        nw_dd, _, _, nw_cc = self.__split_mixedmode_network(nw_mm_s_db)
+        nw_dd, _, _, nw_cc = self.__split_mixedmode_network(nw_mm_s)
+        nw_quad = {"DD": nw_dd, "CC": nw_cc}
         out_dict = {}
-        # Diff_Diff
-        out_dict["DD"] = self.plot_rl(conn_list, nw_dd, prockey, "SDD")
-        # Comm_Comm
-        out_dict["CC"] = self.plot_rl(conn_list, nw_cc, prockey, "SCC")
+        for quad in self.MM_PART["RL_MM"]:
+            if quad_list is None or quad in quad_list:
+                out_dict[quad] = self.plot_rl(conn_list, nw_quad[quad], prockey, "S" + quad)
         return out_dict
 
+    def get_s_path(self, nw_s, out_list, in_list, fmt="db"):
+        """Take some paths out of an S matrix and convert only those.
+
+        The paths are gathered with one fancy-indexing read, so the cost
+        follows the number of paths rather than the size of the matrix.
+
+        Args:
+            nw_s (numpy.ndarray): The complex S-parameters, indexed
+                ``[freq, output, input]``. A quadrant view of a mixed-mode
+                matrix works as well, and so does a stack of matrices with
+                leading axes.
+            out_list (list of int): The output port of each path, zero-based.
+            in_list (list of int): The input port of each path, zero-based.
+                Same length as ``out_list``.
+            fmt (str, optional): ``"db"`` for ``20*log10(|S|)``, ``"mag"`` for
+                ``|S|``, or ``"complex"`` for the raw values. Defaults to
+                ``"db"``.
+
+        Returns:
+            numpy.ndarray: The paths, indexed ``[freq, path]`` after any
+            leading axes.
+        """
+        s_path = nw_s[..., out_list, in_list]
+        match fmt:
+            case "db":
+                return 20 * np.log10(np.abs(s_path))
+            case "mag":
+                return np.abs(s_path)
+        return s_path
+
+    def save_curves(self, fig_title, x, y, port_list):
+        """Write the curves of one figure to its shard, if the export is on.
+
+        The full curves are written, not the ones thinned out for drawing.
+
+        Args:
+            fig_title (str): Title of the figure, which names the shard.
+            x (numpy.ndarray): The x values shared by the curves.
+            y (numpy.ndarray): The y values, indexed ``[point, curve]``.
+            port_list (list of str): The label of each curve.
+        """
+        if self.curve_export:
+            shard_dir = ResultExport.get_shard_dir(self.plt_dir, fig_title)
+            ResultExport.save_shard(shard_dir, x, np.asarray(y).T, port_list)
+
+    def get_dpi(self):
+        """Get the resolution the figures are saved at.
+
+        Returns:
+            float: ``QUICK_LOOK_DPI`` for a quick look, else ``None`` for the
+            resolution of the figure.
+        """
+        return self.QUICK_LOOK_DPI if self.quick_look else None
+
     def plot_zmag(self, fig_data, fig_title, fig_dir):
         """Plot Zmag vs. freq (GHz) and save it to a png.
 
@@ -343,24 +905,7 @@ class TouchStone:
             fig_title (str): Title drawn on the figure.
             fig_dir (str): Full path of the png to write.
         """
-        plt.figure(figsize=(8, 5))
-        for i_curve in fig_data:
-            data_col = len(i_curve)
-            if data_col == 2:
-                plt.plot(i_curve[0], i_curve[1])
-            elif data_col == 3:
-                plt.plot(i_curve[0], i_curve[1], **i_curve[2])
-                if "label" in i_curve[2]:
-                    plt.legend()
-        plt.title(fig_title)
-        plt.xscale("log")
-        plt.yscale("log")
-        plt.xlabel("Frequency (GHz)")
-        plt.ylabel("Z(Ohm)")
-        plt.grid(which="major", linestyle="-")
-        plt.grid(which="minor", linestyle="--")
-        plt.savefig(fig_dir)
-        plt.close()
+        _get_canvas().render("zmag", fig_data, fig_title, fig_dir, self.get_dpi())
 
     def plot_smag(self, fig_data, fig_title, fig_dir):
         """Plot Smag vs. freq (GHz) and save it to a png.
@@ -379,36 +924,18 @@ class TouchStone:
             The y axis is always labelled ``"S21 (dB)"``, including on the
             return loss figures.
         """
-        plt.figure(figsize=(8, 5))
-        for i_curve in fig_data:
-            data_col = len(i_curve)
-            if data_col == 2:
-                plt.plot(i_curve[0], i_curve[1])
-            elif data_col == 3:
-                plt.plot(i_curve[0], i_curve[1], **i_curve[2])
-                if "label" in i_curve[2]:
-                    plt.legend()
-        plt.title(fig_title)
-        plt.xlabel("Frequency (GHz)")
-        plt.ylabel("S21 (dB)")
-        plt.grid(which="major", linestyle="-")
-        plt.grid(which="minor", linestyle="--")
-        plt.savefig(fig_dir)
-        plt.close()
+        _get_canvas().render("smag", fig_data, fig_title, fig_dir, self.get_dpi())
 
     def plot_tdr(self, conn_list, nw_raw, prockey=None, header="SE"):
         """Plot TDR for given ports.
 
-        A time-domain view needs a network that starts at DC and is sampled on
-        an even frequency grid, so the network is first extrapolated to DC when
-        it does not already reach it and then resampled onto a 10 MHz linear
-        step. Two figures are produced, one per end of the link.
+        The step responses of every port on both ends of the link are computed
+        together by :meth:`get_tdr`, then split into two figures, one per end.
 
         Args:
             conn_list (list of list of int): Two lists, being the left-side and
                 the right-side ports, one-based.
-            nw_raw (skrf.Network): The network to transform. Copied, not
-                modified.
+            nw_raw (skrf.Network): The network to transform. Not modified.
             prockey (str, optional): Post-processing key, folded into the
                 figure names.
             header (str, optional): Name of the mode being drawn, e.g.
@@ -422,27 +949,102 @@ class TouchStone:
             proc_key_name = "__" + prockey + "__" + header
         else:
             proc_key_name = "__" + header
-        nw = nw_raw.copy()
-        # DC point extrapolation
-        if nw.f[0] > 0:
-            nw = nw.extrapolate_to_dc(kind="linear")
-        lin_step = int(10e6)
-        lin_freq_list = list(range(0, int(nw.f[-1]) + lin_step, lin_step))
-        nw.resample(lin_freq_list)
+        port_list = [i_conn - 1 for i_conn in conn_list[0] + conn_list[1]]
+        t, zc = self.get_tdr(nw_raw, port_list)
+        t_ns = t * 1e9
         output_list = []
-        # left ports
-        fig_title_l = self.key_name + proc_key_name + "_Left"
-        fig_dir_l = self.plt_dir + fig_title_l + ".png"
-        self.plot_time_domain(conn_list[0], nw, fig_title_l, fig_dir_l)
-        output_list.append([fig_title_l, fig_dir_l])
-        # right ports
-        fig_title_r = self.key_name + proc_key_name + "_Right"
-        fig_dir_r = self.plt_dir + fig_title_r + ".png"
-        self.plot_time_domain(conn_list[1], nw, fig_title_r, fig_dir_r)
-        output_list.append([fig_title_r, fig_dir_r])
+        i_col = 0
+        for side, side_list in zip(["_Left", "_Right"], conn_list):
+            fig_data = []
+            for i_conn in side_list:
+                fig_data.append([t_ns, zc[:, i_col], {"label": "Port_" + str(i_conn)}])
+                i_col += 1
+            fig_title = self.key_name + proc_key_name + side
+            fig_dir = self.plt_dir + fig_title + ".png"
+            self.plot_time_domain(fig_data, fig_title, fig_dir)
+            self.save_curves(
+                fig_title,
+                t_ns,
+                zc[:, i_col - len(side_list) : i_col],
+                [i_curve[2]["label"] for i_curve in fig_data],
+            )
+            output_list.append([fig_title, fig_dir])
         return output_list
 
-    def plot_tdr_mm(self, conn_list, nw_raw, prockey=None):
+    def get_tdr(self, nw, port_list):
+        """Compute the step-response characteristic impedance of some ports.
+
+        Only the reflection terms of the requested ports are taken out of the
+        network. They are extrapolated to DC when the network does not reach
+        it, brought onto a uniform grid, windowed, and turned into impulse
+        responses by one inverse real FFT over all ports at once. The grid
+        follows the TDR settings rather than a fixed step: the time span sets
+        the frequency step, and the rise time caps the highest frequency used.
+
+        The TDR settings come from :attr:`tdr_settings`, and all have defaults.
+
+            * ``rise_time`` (float): 10-90 % rise time of the incident step in
+              s, shaped by a Gaussian filter. ``None`` uses the full bandwidth
+              of the network. Defaults to ``None``.
+            * ``window`` (str): Window applied to the spectrum, any name
+              ``scipy.signal.get_window`` takes, or ``None`` for none.
+              Defaults to ``"hamming"``.
+            * ``span`` (float): Length of the returned time axis in s.
+              Defaults to ``50e-9``, which gives the 10 MHz step used so far.
+
+        Args:
+            nw (skrf.Network): The network to transform. Not modified.
+            port_list (list of int): The ports to transform, zero-based. A
+                port may appear more than once.
+
+        Returns:
+            tuple: A 2-tuple ``(t, zc)``. ``t`` (numpy.ndarray) is the time
+            axis in s, starting at 0. ``zc`` (numpy.ndarray) is the
+            characteristic impedance in Ohm, indexed ``[time, port]`` in the
+            order of ``port_list``.
+        """
+        rise_time = self.tdr_settings.get("rise_time")
+        window = self.tdr_settings.get("window", "hamming")
+        span = self.tdr_settings.get("span", 50e-9)
+        f = nw.f
+        s_self = nw.s[:, port_list, port_list]
+        z0 = nw.z0[0, port_list].real
+        mag = np.abs(s_self)
+        rad = np.unwrap(np.angle(s_self), axis=0)
+        if f[0] > 0:
+            # linear extrapolation of the first two points in polar form
+            slope = f[0] / (f[1] - f[0])
+            mag = np.vstack([mag[0] - slope * (mag[1] - mag[0]), mag])
+            rad = np.vstack([rad[0] - slope * (rad[1] - rad[0]), rad])
+            f = np.concatenate([[0.0], f])
+        # the time span is half the period, leaving room for the wrap-around
+        f_step = 1 / (2 * span)
+        f_stop = f[-1] if rise_time is None else min(f[-1], 1.5 / rise_time)
+        f_grid = np.arange(int(f_stop / f_step) + 1) * f_step
+        s_grid = np.empty((len(f_grid), len(port_list)), dtype=complex)
+        for i_col in range(len(port_list)):
+            s_grid[:, i_col] = np.interp(f_grid, f, mag[:, i_col]) * np.exp(
+                1j * np.interp(f_grid, f, rad[:, i_col])
+            )
+        if window is not None:
+            s_grid *= get_window(window, 2 * len(f_grid))[len(f_grid) :, None]
+        if rise_time is not None:
+            # a Gaussian step rises from 10 % to 90 % in 2.563 sigma
+            sigma = rise_time / 2.563
+            s_grid *= np.exp(-((2 * np.pi * f_grid * sigma) ** 2) / 2)[:, None]
+        n_time = 2 * (len(f_grid) - 1)
+        # the windowed impulse is two-sided, so integrate from the most
+        # negative time rather than from 0
+        impulse = np.fft.fftshift(np.fft.irfft(s_grid, n=n_time, axis=0), axes=0)
+        step = np.cumsum(impulse, axis=0)
+        t = (np.arange(n_time) - n_time // 2) / (n_time * f_step)
+        in_span = (t >= 0) & (t <= span)
+        # solve numerical singularity
+        step = np.minimum(step[in_span], 1 - 1e-12)
+        zc = z0 * (1 + step) / (1 - step)
+        return t[in_span], zc
+
+    def plot_tdr_mm(self, conn_list, nw_raw, prockey=None, mode_list=None):
         """Plot TDR for Mixed-mode ports.
 
         In a mixed-mode network the differential ports occupy the first half of
@@ -455,6 +1057,8 @@ class TouchStone:
             nw_raw (skrf.Network): The mixed-mode network.
             prockey (str, optional): Post-processing key, folded into the
                 figure names.
+            mode_list (list of str, optional): The modes to plot, out of
+                ``MM_PART["TDR_MM"]``. Defaults to both.
 
         Returns:
             dict: Mode name to the output of :meth:`plot_tdr` for it, with the
@@ -462,73 +1066,300 @@ class TouchStone:
         """
         out_dict = {}
         # Diff_Diff
-        out_dict["DD"] = self.plot_tdr(conn_list, nw_raw, prockey, "DD")
+        if mode_list is None or "DD" in mode_list:
+            out_dict["DD"] = self.plot_tdr(conn_list, nw_raw, prockey, "DD")
         # Comm_Comm
-        mm_port_num = int(self.port_num / 2)
-        conn_list_cc = lol_numerical_add_num(conn_list, mm_port_num)
-        out_dict["CC"] = self.plot_tdr(conn_list_cc, nw_raw, prockey, "CC")
+        if mode_list is None or "CC" in mode_list:
+            mm_port_num = int(self.port_num / 2)
+            conn_list_cc = lol_numerical_add_num(conn_list, mm_port_num)
+            out_dict["CC"] = self.plot_tdr(conn_list_cc, nw_raw, prockey, "CC")
         return out_dict
 
-    def plot_time_domain(self, conn_list, fig_data, fig_title, fig_dir):
+    def plot_time_domain(self, fig_data, fig_title, fig_dir):
         """Plot the step-response characteristic impedance and save it to a png.
 
         Args:
-            conn_list (list of int): The ports to draw, one-based.
-            fig_data (skrf.Network): The network to read the step response
-                from. Named for symmetry with the other plot methods, though it
-                is a network rather than pre-computed curves.
+            fig_data (list of list): One ``[x, y, kwargs]`` entry per curve,
+                being the time axis in ns, the impedance in Ohm, and the keyword
+                arguments passed to ``Axes.plot``.
             fig_title (str): Title drawn on the figure.
             fig_dir (str): Full path of the png to write.
         """
-        plt.figure(figsize=(8, 5))
-        for i_conn in conn_list:
-            label = "Port_" + str(i_conn)
-            fig_data.plot_z_time_step(i_conn - 1, i_conn - 1, label=label)
-        plt.title(fig_title)
-        plt.xlabel("Time (ns)")
-        plt.ylabel("Zc (Ohm)")
-        plt.grid(which="major", linestyle="-")
-        plt.grid(which="minor", linestyle="--")
-        plt.savefig(fig_dir)
-        plt.close()
-
-    def convert_snp_se2mm(self):
+        _get_canvas().render("time_domain", fig_data, fig_title, fig_dir, self.get_dpi())
+
+    def get_z_self(self, nw, port_list):
+        """Get the self impedances of some ports without a full Z conversion.
+
+        With real reference impedances ``Z = sqrt(z0) (I - S)^-1 (I + S)
+        sqrt(z0)``, so the columns of the requested ports follow from one
+        batched ``numpy.linalg.solve`` over the frequency axis with only those
+        columns of ``I + S`` on the right-hand side, instead of inverting the
+        whole matrix the way ``nw.z`` does.
+
+        The result is kept in :attr:`z_cache`, so the RLC extraction and the
+        plot of the same network share one solve.
+
+        Args:
+            nw (skrf.Network): The network to read. Its reference impedances
+                are taken as real.
+            port_list (list of int): Zero-based port indices.
+
+        Returns:
+            numpy.ndarray: The complex self impedances in Ohm, indexed
+            ``[freq, port]`` in the order of ``port_list``.
+
+        Note:
+            ``nw.z`` nudges nearly singular ``I - S`` matrices, which only
+            happens where the network is close to an ideal open, e.g. at the
+            lowest frequencies of a PDN with no DC path. This solve leaves
+            them as they are and only falls back to the nudge when a matrix is
+            exactly singular, so values there may differ from ``nw.z``.
+        """
+        cache_key = (id(nw), tuple(port_list))
+        if cache_key in self.z_cache and self.z_cache[cache_key][0] is nw:
+            return self.z_cache[cache_key][1]
+        z_self = self.solve_z_self(nw.s, nw.z0, port_list)
+        # the network is held as well, so its id cannot be reused meanwhile
+        self.z_cache[cache_key] = (nw, z_self)
+        return z_self
+
+    @staticmethod
+    def solve_z_self(s, z0, port_list):
+        """Solve for the self impedances of some ports, see :meth:`get_z_self`.
+
+        Args:
+            s (numpy.ndarray): The S-parameters, indexed
+                ``[freq, output, input]`` after any leading axes, e.g. the
+                file axis of a stack of networks.
+            z0 (numpy.ndarray): The reference impedances, indexed
+                ``[freq, port]`` after the same leading axes.
+            port_list (list of int): Zero-based port indices.
+
+        Returns:
+            numpy.ndarray: The complex self impedances in Ohm, indexed
+            ``[freq, port]`` after the leading axes.
+        """
+        n_col = len(port_list)
+        col_index = np.arange(n_col)
+        rhs = s[..., port_list].copy()
+        rhs[..., port_list, col_index] += 1
+        lhs = np.eye(s.shape[-1]) - s
+        try:
+            z_col = np.linalg.solve(lhs, rhs)
+        except np.linalg.LinAlgError:
+            if s.ndim > 3:
+                # one network at a time, so only the singular ones are nudged
+                return np.stack(
+                    [
+                        TouchStone.solve_z_self(s_i, z0_i, port_list)
+                        for s_i, z0_i in zip(s, z0, strict=True)
+                    ]
+                )
+            z_col = np.linalg.solve(nudge_eig(lhs), rhs)
+        return z0[..., port_list].real * z_col[..., port_list, col_index]
+
+    def terminate_ports(self, nw, port_list, z_term=0):
+        """Terminate a set of ports and return the network of the others.
+
+        Every terminated port is replaced by its reflection coefficient against
+        its own reference impedance, and the remaining ports are solved for in
+        one batched Schur complement over the whole frequency axis,
+
+        ``S_red = S_kk + S_kt G (I - S_tt G)^-1 S_tk``,
+
+        with ``k`` the kept ports, ``t`` the terminated ones, and ``G`` the
+        diagonal of reflection coefficients. Working on the S matrix keeps the
+        reduction well defined at DC, where the Z matrix of a PDN with floating
+        nets does not exist.
+
+        Args:
+            nw (skrf.Network): The network to reduce. Not modified.
+            port_list (list of int): Ports to terminate, zero-based.
+            z_term (complex or list of complex, optional): Termination
+                impedance in Ohm, one value for all ports or one per entry of
+                ``port_list``. ``0`` is a short and ``numpy.inf`` an open.
+                Defaults to ``0``.
+
+        Returns:
+            skrf.Network: The reduced network, keeping the other ports in their
+            original order together with their reference impedances.
+
+        Note:
+            The reflection coefficients assume real reference impedances,
+            which is what the solver writes.
+        """
+        s_red, z0_red = self.terminate_s(nw.s, nw.z0, port_list, z_term)
+        return rf.Network(frequency=nw.frequency, s=s_red, z0=z0_red, name=nw.name)
+
+    @staticmethod
+    def terminate_s(s, z0, port_list, z_term=0):
+        """Terminate a set of ports of S-parameters, see :meth:`terminate_ports`.
+
+        Args:
+            s (numpy.ndarray): The S-parameters, indexed
+                ``[freq, output, input]`` after any leading axes.
+            z0 (numpy.ndarray): The reference impedances, indexed
+                ``[freq, port]`` after the same leading axes.
+            port_list (list of int): Ports to terminate, zero-based.
+            z_term (complex or list of complex, optional): Termination
+                impedance in Ohm, as for :meth:`terminate_ports`. Defaults to
+                ``0``.
+
+        Returns:
+            tuple: A 2-tuple ``(s_red, z0_red)``, being the S-parameters and
+            the reference impedances of the other ports.
+        """
+        port_list = list(port_list)
+        keep_list = [i for i in range(s.shape[-1]) if i not in port_list]
+        z0_t = z0[..., port_list]
+        z_term = np.broadcast_to(np.asarray(z_term, dtype=complex), z0_t.shape)
+        is_open = np.isinf(z_term)
+        gamma = np.ones(z0_t.shape, dtype=complex)
+        gamma[~is_open] = (z_term - z0_t)[~is_open] / (z_term + z0_t)[~is_open]
+        s_kk = s[..., keep_list, :][..., keep_list]
+        s_kt = s[..., keep_list, :][..., port_list]
+        s_tk = s[..., port_list, :][..., keep_list]
+        s_tt = s[..., port_list, :][..., port_list]
+        # scaling the columns by gamma is the product with a diagonal matrix
+        eye = np.eye(len(port_list))
+        b_t = np.linalg.solve(eye - s_tt * gamma[..., None, :], s_tk)
+        s_red = s_kk + (s_kt * gamma[..., None, :]) @ b_t
+        return s_red, z0[..., keep_list]
+
+    def convert_snp_se2mm(self, quad_list=None):
         """Convert SNP files from single-ended to mixed-mode Spara.
 
-        The single-ended ports are first renumbered into the pair order given
-        by ``MM_ORDER_IN_SE``, since the conversion expects each differential
-        pair to sit in consecutive positions, and the result is written
-        alongside the input file in a ``Mixed_Mode`` sub-folder.
+        The single-ended ports are paired up in the order given by
+        ``MM_ORDER_IN_SE``, the two ports of each pair sitting next to each
+        other in it. With one real reference impedance shared by all ports,
+        which is what the solvers write, each mixed-mode quadrant is a signed
+        sum of four single-ended blocks, so only the requested quadrants are
+        computed, straight from the single-ended matrix. Any other reference
+        impedances go through scikit-rf's full ``se2gmm`` instead.
+
+        Args:
+            quad_list (list of str, optional): The quadrants to compute, out of
+                ``"DD"``, ``"DC"``, ``"CD"``, and ``"CC"``. Defaults to all
+                four. The entries of the quadrants left out are NaN.
 
         Returns:
             skrf.Network: The mixed-mode network. The differential ports come
             first, the common-mode ports second.
         """
-        sedata = self.nw.copy()
-        se_port_index = list(range(self.port_num))
+        if quad_list is None:
+            quad_list = ["DD", "DC", "CD", "CC"]
         mm_port_index = self.conn_dict["MM_ORDER_IN_SE"]
-        sedata.renumber(se_port_index, mm_port_index)
-        sedata.se2gmm(p=int(self.port_num / 2))
-        # save mm snp files
-        se_snp_dir, se_snp_name = split_str_at_last_symbol(self.file_dir, SL)
-        se_snp_dir = se_snp_dir + SL
-        mm_snp_dir = se_snp_dir + "Mixed_Mode" + SL
+        z0 = self.nw.z0
+        if np.any(z0 != z0[0, 0]) or z0[0, 0].imag != 0:
+            mmdata = self.nw.copy()
+            mmdata.renumber(list(range(self.port_num)), mm_port_index)
+            mmdata.se2gmm(p=int(self.port_num / 2))
+            return mmdata
+        # renumbering puts single-ended port order[i] at position i
+        se_order = np.argsort(mm_port_index)
+        pos_list = se_order[0::2]
+        neg_list = se_order[1::2]
+        s = self.nw.s
+        block = {
+            ("P", "P"): s[:, pos_list][:, :, pos_list],
+            ("P", "N"): s[:, pos_list][:, :, neg_list],
+            ("N", "P"): s[:, neg_list][:, :, pos_list],
+            ("N", "N"): s[:, neg_list][:, :, neg_list],
+        }
+        # a differential mode takes the difference of the pair, common the sum
+        sign = {"D": -1, "C": 1}
+        mm_port_num = int(self.port_num / 2)
+        mm_range = {"D": slice(0, mm_port_num), "C": slice(mm_port_num, None)}
+        s_mm = np.full_like(s, np.nan)
+        for quad in quad_list:
+            row_sign, col_sign = sign[quad[0]], sign[quad[1]]
+            s_mm[:, mm_range[quad[0]], mm_range[quad[1]]] = 0.5 * (
+                block[("P", "P")]
+                + col_sign * block[("P", "N")]
+                + row_sign * block[("N", "P")]
+                + row_sign * col_sign * block[("N", "N")]
+            )
+        # one row per frequency, so a port count equal to the point count is not misread
+        z0_mm = np.empty_like(z0)
+        z0_mm[:, :mm_port_num] = 2 * z0[0, 0]
+        z0_mm[:, mm_port_num:] = z0[0, 0] / 2
+        return rf.Network(frequency=self.nw.frequency, s=s_mm, z0=z0_mm, name=self.nw.name)
+
+    def write_mm_snp(self, nw_mm):
+        """Write a mixed-mode network as a touchstone file.
+
+        The file goes alongside the input file, into a ``Mixed_Mode``
+        sub-folder, named after the input with an ``_mm`` suffix.
+
+        Args:
+            nw_mm (skrf.Network): The mixed-mode network.
+        """
+        mm_snp_dir = self.__get_mm_dir()
         make_dir(mm_snp_dir)
+        _, se_snp_name = split_str_at_last_symbol(self.file_dir, SL)
         file_name, _ = split_str_at_last_symbol(se_snp_name, ".")
         mm_snp_name = file_name + "_mm"
-        # sedata is actually mmdata
-        sedata.write_touchstone(filename=mm_snp_name, dir=mm_snp_dir, write_z0=True)
-        return sedata
+        nw_mm.write_touchstone(filename=mm_snp_name, dir=mm_snp_dir, write_z0=True)
+
+    @staticmethod
+    def wait_mm_writes():
+        """Wait for the mixed-mode files being written in the background.
+
+        Raises:
+            Exception: The first error a background write ran into.
+        """
+        _, future_list = _get_mm_writer()
+        while future_list:
+            future_list.pop(0).result()
+
+    def __get_mm_dir(self):
+        """Get the ``Mixed_Mode`` folder beside the input file.
+
+        Returns:
+            str: The separator-ending folder path.
+        """
+        se_snp_dir, _ = split_str_at_last_symbol(self.file_dir, SL)
+        return se_snp_dir + SL + "Mixed_Mode" + SL
+
+    def __load_single_ended(self):
+        """Read the file and set the attributes derived from it directly."""
+        self.nw = self.__load_network(self.__info)
+        self.f = self.nw.f / 1e9  # GHz
+        self.port_num = self.nw.number_of_ports
+
+    def __load_network(self, info):
+        """Read the touchstone file, through the binary cache if configured.
+
+        Args:
+            info (dict): The constructor's ``info`` dict.
+
+        Returns:
+            skrf.Network: The single-ended network of the file, in the
+            precision of ``precision``.
+        """
+        if self.quick_look:
+            # the cache holds whole files, so a quick look reads past it
+            nw = read_touchstone(self.file_dir, n_row=self.QUICK_LOOK_ROW)
+        elif "cache_dir" in info:
+            nw = SnpCache(info["cache_dir"], info["cache_mb"]).load(self.file_dir)
+        else:
+            nw = read_touchstone(self.file_dir)
+        return set_precision(nw, self.precision)
 
     def __get_mixedmode_network(self):
         """Get mixedmode network if necessary.
 
         The conversion is skipped unless the spec type actually asks for a
-        mixed-mode result, so a single-ended run does not pay for it.
+        mixed-mode result, so a single-ended run does not pay for it. A
+        conversion an earlier report left in the ``Mixed_Mode`` folder is
+        reused while it fits, see ``opensipi.mm_cache.MixedModeCache``.
+        Otherwise the network is converted, cached, and written out as a
+        touchstone file as ``mm_settings`` asks.
 
         Returns:
-            skrf.Network: The converted mixed-mode network, or the untouched
-            single-ended network when no conversion was needed.
+            skrf.Network: The converted mixed-mode network, in the precision
+            of ``precision``, or the untouched single-ended network when no
+            conversion was needed.
 
         Note:
             Only the keys in ``MM_KEY`` trigger the conversion, and ``TDR_MM``
@@ -541,18 +1372,37 @@ class TouchStone:
         for key in process_key:
             if key in self.MM_KEY:
                 se2mm = True
-        if se2mm:
-            mmdata = self.convert_snp_se2mm()
-        else:
-            mmdata = self.nw
-        return mmdata
+        if not se2mm:
+            return self.nw
+        # return loss and TDR only read the like-mode quadrants
+        quad_list = ["DD", "DC", "CD", "CC"]
+        if self.mm_settings.get("quadrants") == "needed" and "IL_MM" not in process_key:
+            quad_list = ["DD", "CC"]
+        use_cache = self.mm_settings.get("cache", True)
+        if use_cache:
+            mm_cache = MixedModeCache(self.__get_mm_dir())
+            mmdata = mm_cache.load(self.file_dir, self.conn_dict, quad_list)
+            if mmdata is not None:
+                return set_precision(mmdata, self.precision)
+        mmdata = self.convert_snp_se2mm(quad_list)
+        if use_cache:
+            mm_cache.save(self.file_dir, self.conn_dict, quad_list, mmdata)
+        # a file with NaN quadrants is of no use to anyone
+        match self.mm_settings.get("write_snp", "sync"):
+            case "sync" if len(quad_list) == 4:
+                self.write_mm_snp(mmdata)
+            case "async" if len(quad_list) == 4:
+                executor, future_list = _get_mm_writer()
+                future_list.append(executor.submit(self.write_mm_snp, mmdata))
+        return set_precision(mmdata, self.precision)
 
     def __split_mixedmode_network(self, nw_mm):
         """Split one mixed-mode network into four sub-networks.
 
         Slices the S-parameter block into its quadrants, relying on the
         differential ports occupying the first half of the port range and the
-        common-mode ports the second half.
+        common-mode ports the second half. The quadrants are views, so nothing
+        is copied.
 
         Args:
             nw_mm (numpy.ndarray): The mixed-mode S-parameters, indexed
@@ -570,168 +1420,195 @@ class TouchStone:
         nw_cc = nw_mm[:, mm_port_num:, mm_port_num:]
         return nw_dd, nw_dc, nw_cd, nw_cc
 
-    def __get_short_block(self):
-        """Get a 1-port short block based on the input touchstone file.
-
-        Built from a scikit-rf sample short and resampled onto this file's
-        frequency axis, so it can be connected to a port of this network.
-
-        Returns:
-            skrf.Network: A one-port short on the same frequency axis.
-        """
-        short0 = rf.data.wr2p2_short
-        short0.resample(self.nw.frequency.npoints)
-        short0.f = self.f
-        return short0
-
-    def __get_rlc(self, nw, i_port, snp_dir):
+    def __get_rlc(self, nw, port_list, snp_dir):
         """Return RLC at specified frequencies.
 
         Each element is read at the frequency where it dominates the impedance:
         resistance low enough to be flat, capacitance where the rail still
-        looks capacitive, and inductance where it already looks inductive.
+        looks capacitive, and inductance where it already looks inductive. All
+        three are read for every requested port in one pass.
 
         Args:
             nw (skrf.Network): The network to read.
-            i_port (int): Zero-based port index.
+            port_list (list of int): Zero-based port indices.
             snp_dir (str): Path of the source snp file, quoted in the
                 interpolation warnings.
 
         Returns:
-            tuple: A 3-tuple ``(r_dc, l_hf, c_lf)``, being the resistance at
-            1 kHz in mOhm, the inductance at 100 MHz in pH, and the capacitance
-            at 10 kHz in nF.
+            tuple: A 4-tuple ``(r_dc, l_hf, c_lf, extrap)``. The first three
+            are arrays with one value per entry of ``port_list``, being the
+            resistance at 1 kHz in mOhm, the inductance at 100 MHz in pH, and
+            the capacitance at 10 kHz in nF. ``extrap`` is a bool array of
+            shape ``[3, len(port_list)]`` flagging, in the order R, C, L, the
+            values extrapolated beyond the simulated sweep.
 
         Note:
             The reactance conversions use ``3.14`` for pi, so the reported
             inductance and capacitance carry a systematic error of about
             0.05 percent.
         """
-        # extract R@1KHz
-        freq_tgt = 1e3
-        r_dc, _ = self.__get_z_interp(nw, freq_tgt, i_port, i_port, snp_dir)
-        r_dc = r_dc * 1e3  # mOhm
-        # extract C@10KHz
-        freq_tgt = 1e4
-        z_lf, _ = self.__get_z_interp(nw, freq_tgt, i_port, i_port, snp_dir)
-        c_lf = 1 / z_lf / (2 * 3.14 * freq_tgt) * 1e9  # nF
-        # extract L@100MHz
-        freq_tgt = 1e8
-        z_hf, _ = self.__get_z_interp(nw, freq_tgt, i_port, i_port, snp_dir)
-        l_hf = z_hf / (2 * 3.14 * freq_tgt) * 1e12  # pH
+        freq_tgt = self.RLC_FREQ
+        z_interp, _, extrap = self.__get_z_interp(nw, freq_tgt, port_list, snp_dir)
+        r_dc, l_hf, c_lf = self.convert_z_to_rlc(z_interp, freq_tgt)
+        return r_dc, l_hf, c_lf, extrap
+
+    @staticmethod
+    def convert_z_to_rlc(z_interp, freq_tgt):
+        """Convert impedances read at the RLC frequencies to R, L, and C.
+
+        Args:
+            z_interp (numpy.ndarray): The impedance magnitudes in Ohm, indexed
+                ``[target, port]`` after any leading axes, the targets being
+                ``freq_tgt``.
+            freq_tgt (numpy.ndarray): The frequencies in Hz the resistance, the
+                capacitance, and the inductance are read at, in that order.
+
+        Returns:
+            tuple: A 3-tuple ``(r_dc, l_hf, c_lf)`` of arrays indexed
+            ``[port]`` after the leading axes, in mOhm, pH, and nF.
+        """
+        r_dc = z_interp[..., 0, :] * 1e3  # mOhm
+        c_lf = 1 / z_interp[..., 1, :] / (2 * 3.14 * freq_tgt[1]) * 1e9  # nF
+        l_hf = z_interp[..., 2, :] / (2 * 3.14 * freq_tgt[2]) * 1e12  # pH
         return r_dc, l_hf, c_lf
 
-    def __get_z_interp(self, nw, freq_tgt, i_port, j_port, snp_name):
-        """Interpolate the impedance at a target frequency.
+    def __get_z_interp(self, nw, freq_tgt, port_list, snp_name):
+        """Interpolate the self impedance at a list of target frequencies.
 
-        Input network class, target freq, and target port. Output interpolated
-        z in Ohm and angle in unwrapped rad.
+        Input network class, target freqs, and target ports. Output
+        interpolated z in Ohm and angle in unwrapped rad for every pair of
+        target frequency and port.
 
-        The simulated frequency points rarely land exactly on the target, so a
-        bracketing point is searched for by stepping away from the target in
-        10 percent increments, up to ten steps, and the value is then
-        interpolated between the two. The magnitude is interpolated in log-log
-        space, matching how impedance behaves across decades, while the angle
-        is interpolated linearly.
+        Only the self impedances of the requested ports are solved for, see
+        :meth:`get_z_self`. Every target is bracketed by its two
+        neighbouring samples with one ``numpy.searchsorted`` call, and the
+        values are interpolated between them as arrays. The magnitude is
+        interpolated in log-log space, matching how impedance behaves across
+        decades, while the angle is interpolated linearly. A bracket starting
+        at DC has no logarithm, so the magnitude falls back to linear
+        interpolation there.
 
         Args:
             nw (skrf.Network): The network to read.
-            freq_tgt (float): Target frequency in Hz.
-            i_port (int): Zero-based output port index.
-            j_port (int): Zero-based input port index.
+            freq_tgt (array_like of float): Target frequencies in Hz.
+            port_list (list of int): Zero-based port indices.
             snp_name (str): Name quoted in the warnings.
 
         Returns:
-            tuple: A 2-tuple ``(z_interp, ang_interp)``, being the impedance
-            magnitude in Ohm and the unwrapped angle in rad.
+            tuple: A 3-tuple ``(z_interp, ang_interp, extrap)`` of arrays
+            shaped ``[len(freq_tgt), len(port_list)]``, being the impedance
+            magnitude in Ohm, the unwrapped angle in rad, and whether the
+            value was extrapolated from the two closest samples because the
+            target lies outside the simulated sweep.
 
         Note:
-            If no bracketing point is found within ten steps, a warning is
-            printed and the value is extrapolated from the two closest points
-            instead. The result is still returned, so the caller cannot tell
-            this happened.
-        """
-        z_1 = nw[str(freq_tgt)].z_mag[0, i_port, j_port]
-        f_1 = nw[str(freq_tgt)].f[0]
-        ang_1 = nw[str(freq_tgt)].z_rad_unwrap[0, i_port, j_port]
-        rate = 0.1
-        if f_1 == freq_tgt:
-            z_interp = z_1
-            ang_interp = ang_1
-        elif f_1 < freq_tgt:
-            z_2 = nw[str(freq_tgt * (1 + rate))].z_mag[0, i_port, j_port]
-            f_2 = nw[str(freq_tgt * (1 + rate))].f[0]
-            ang_2 = nw[str(freq_tgt * (1 + rate))].z_rad_unwrap[0, i_port, j_port]
-            n = 2
-            while (f_2 <= freq_tgt) and (n < 11):
-                z_2 = nw[str(freq_tgt * (1 + n * rate))].z_mag[0, i_port, j_port]
-                f_2 = nw[str(freq_tgt * (1 + n * rate))].f[0]
-                ang_2 = nw[str(freq_tgt * (1 + n * rate))].z_rad_unwrap[0, i_port, j_port]
-                n = n + 1
-            if f_2 <= freq_tgt:
-                print(
-                    "Warning: Frequency samples are not"
-                    + " sufficiently dense for interpolation in "
-                    + snp_name
-                )
-                print("The results may not be accurate!")
-                print("Please raise frequency points and rerun simulations!")
-            # linear log scale
-            z_interp = 10 ** (
-                log10(z_1)
-                + (log10(freq_tgt) - log10(f_1))
-                / (log10(f_2) - log10(f_1))
-                * (log10(z_2) - log10(z_1))
-            )
-            # linear scale
-            ang_interp = ang_1 + (freq_tgt - f_1) / (f_2 - f_1) * (ang_2 - ang_1)
-        else:
-            z_2 = nw[str(freq_tgt * (1 - rate))].z_mag[0, i_port, j_port]
-            f_2 = nw[str(freq_tgt * (1 - rate))].f[0]
-            ang_2 = nw[str(freq_tgt * (1 - rate))].z_rad_unwrap[0, i_port, j_port]
-            n = 2
-            while (f_2 >= freq_tgt) and (n < 10):
-                z_2 = nw[str(freq_tgt * (1 - n * rate))].z_mag[0, i_port, j_port]
-                f_2 = nw[str(freq_tgt * (1 - n * rate))].f[0]
-                ang_2 = nw[str(freq_tgt * (1 - n * rate))].z_rad_unwrap[0, i_port, j_port]
-                n = n + 1
-            if f_2 >= freq_tgt:
-                print(
-                    "Warning: Frequency samples are not"
-                    + " sufficiently dense for interpolation in "
-                    + snp_name
-                )
-                print("The results may not be accurate!")
-                print("Please raise frequency points and rerun simulations!")
-            # linear log scale
-            z_interp = 10 ** (
-                log10(z_1)
-                + (log10(freq_tgt) - log10(f_1))
-                / (log10(f_2) - log10(f_1))
-                * (log10(z_2) - log10(z_1))
-            )
-            # linear scale
-            ang_interp = ang_1 + (freq_tgt - f_1) / (f_2 - f_1) * (ang_2 - ang_1)
-        return z_interp, ang_interp
+            Extrapolated values are still returned. A warning is printed as
+            well, so a run without a caller inspecting ``extrap`` still shows
+            it.
+        """
+        z_self = self.get_z_self(nw, port_list)  # freq, port
+        z_interp, ang_interp, extrap = self.interp_z_self(nw.f, z_self, freq_tgt)
+        if extrap.any():
+            self.warn_sparse_sweep(snp_name)
+        return z_interp, ang_interp, extrap
+
+    @staticmethod
+    def interp_z_self(f, z_self, freq_tgt):
+        """Interpolate self impedances at target frequencies, see :meth:`__get_z_interp`.
+
+        Args:
+            f (numpy.ndarray): The frequency axis in Hz.
+            z_self (numpy.ndarray): The complex self impedances, indexed
+                ``[freq, port]`` after any leading axes.
+            freq_tgt (array_like of float): Target frequencies in Hz.
+
+        Returns:
+            tuple: A 3-tuple ``(z_interp, ang_interp, extrap)`` of arrays
+            indexed ``[target, port]`` after the leading axes, as
+            :meth:`__get_z_interp` gives them.
+        """
+        freq_tgt = np.atleast_1d(np.asarray(freq_tgt, dtype=float))
+        z_mag = np.abs(z_self)
+        z_ang = np.unwrap(np.angle(z_self), axis=-2)
+        # bracketing samples, clipped so the outermost pair extrapolates
+        i_hi = np.clip(np.searchsorted(f, freq_tgt), 1, len(f) - 1)
+        i_lo = i_hi - 1
+        f_lo = f[i_lo][:, np.newaxis]
+        f_hi = f[i_hi][:, np.newaxis]
+        f_tgt = freq_tgt[:, np.newaxis]
+        z_mag_lo = z_mag[..., i_lo, :]
+        z_mag_hi = z_mag[..., i_hi, :]
+        # linear scale
+        w_lin = (f_tgt - f_lo) / (f_hi - f_lo)
+        ang_interp = z_ang[..., i_lo, :] + w_lin * (z_ang[..., i_hi, :] - z_ang[..., i_lo, :])
+        # linear log scale
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w_log = (np.log10(f_tgt) - np.log10(f_lo)) / (np.log10(f_hi) - np.log10(f_lo))
+            z_log = 10 ** (np.log10(z_mag_lo) + w_log * (np.log10(z_mag_hi) - np.log10(z_mag_lo)))
+        z_lin = z_mag_lo + w_lin * (z_mag_hi - z_mag_lo)
+        z_interp = np.where(f_lo > 0, z_log, z_lin)
+        extrap = np.broadcast_to((f_tgt < f[0]) | (f_tgt > f[-1]), z_interp.shape).copy()
+        return z_interp, ang_interp, extrap
+
+    @staticmethod
+    def warn_sparse_sweep(snp_name):
+        """Print the warning for an RLC read outside the simulated sweep.
+
+        Args:
+            snp_name (str): Name of the snp file quoted in the warning.
+        """
+        print(
+            "Warning: Frequency samples are not"
+            + " sufficiently dense for interpolation in "
+            + snp_name
+        )
+        print("The results may not be accurate!")
+        print("Please raise frequency points and rerun simulations!")
 
     @classmethod
-    def from_list(cls, info_list):
+    def from_list(cls, info_list, stream=False):
         """Input a list of dict and output a list of snp class.
 
         Args:
             info_list (list of dict): One ``info`` dict per touchstone file, as
                 described in :meth:`__init__`.
+            stream (bool, optional): Yield lazy instances one at a time
+                instead of building them all up front. Defaults to ``False``.
 
         Returns:
             list of TouchStone: One instance per input dict, in order. Every
             file is read as its instance is built, so the mixed-mode
-            conversions all happen here.
+            conversions all happen here. With ``stream`` a generator of the
+            same instances is returned instead, see :meth:`__stream_list`.
         """
+        if stream:
+            return cls.__stream_list(info_list)
         ts_list = []
         for info in info_list:
             ts_list.append(cls(info))
         return ts_list
 
+    @classmethod
+    def __stream_list(cls, info_list):
+        """Yield lazy instances, releasing each before building the next.
+
+        An instance is released once the consumer asks for the next one, which
+        is after it has been processed in a plain ``for`` loop. Only one
+        network is held at a time, however large the folder is.
+
+        Args:
+            info_list (list of dict): One ``info`` dict per touchstone file.
+
+        Yields:
+            TouchStone: One lazy instance per input dict, in order.
+        """
+        for info in info_list:
+            ts = cls(info, lazy=True)
+            try:
+                yield ts
+            finally:
+                ts.release()
+
 
 if __name__ == "__main__":
     file_dir = r"S.s2p"
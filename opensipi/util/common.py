@@ -28,6 +28,7 @@ Attributes:
 
 import base64
 import csv
+import hashlib
 import os
 from datetime import datetime
 from os.path import expanduser
@@ -755,6 +756,26 @@ def img2str(img_dir):
     return img_str
 
 
+def get_file_hash(file_dir, chunk_size=1 << 20):
+    """Get the content hash of a file.
+
+    The file is read in chunks, so a multi-gigabyte touchstone file is hashed
+    without being held in memory.
+
+    Args:
+        file_dir (str): Full path of the file to hash.
+        chunk_size (int, optional): Bytes read per chunk. Defaults to 1 MiB.
+
+    Returns:
+        str: The hex digest of the file's sha256 hash.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_dir, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
 class Vividict(dict):
     """Implement nested dict
 
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Time the touchstone reader against scikit-rf on synthetic snp files."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import skrf as rf
+
+from opensipi.snp_reader import read_touchstone
+
+
+def write_snp(dir_name, port_num, freq_num, seed=0):
+    """Write a synthetic snp file in the RI format PowerSI uses.
+
+    Args:
+        dir_name (str): Folder to write the file into.
+        port_num (int): Number of ports.
+        freq_num (int): Number of frequency points, log-spaced from 1 kHz to
+            20 GHz.
+        seed (int): Seed of the random S matrices.
+
+    Returns:
+        str: Full path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (freq_num, port_num, port_num)
+    s = 0.1 * (rng.standard_normal(shape) + 1j * rng.standard_normal(shape))
+    frequency = rf.Frequency.from_f(np.logspace(3, np.log10(20e9), freq_num), unit="Hz")
+    name = "BENCH_" + str(port_num) + "P_" + str(freq_num) + "F"
+    nw = rf.Network(frequency=frequency, s=s, z0=50, name=name)
+    nw.write_touchstone(filename=name, dir=dir_name, form="ri")
+    return os.path.join(dir_name, name + ".s" + str(port_num) + "p")
+
+
+def time_read(reader, file_dir, repeat):
+    """Get the best wall time of reading a file.
+
+    Args:
+        reader (callable): Takes the file path and returns a network.
+        file_dir (str): Full path of the snp file.
+        repeat (int): Number of reads to take the best of.
+
+    Returns:
+        float: The fastest read in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reader(file_dir)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    """Print a timing table of both readers over the requested sizes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ports", type=int, nargs="+", default=[4, 16, 50, 100, 200])
+    parser.add_argument("--points", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=512,
+        help="skip sizes whose file would exceed this many MiB",
+    )
+    args = parser.parse_args(argv)
+    print(
+        f"{'ports':>6} {'points':>7} {'MiB':>8} {'scikit-rf':>10} {'opensipi':>10} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as dir_name:
+        for port_num in args.ports:
+            for freq_num in args.points:
+                # about 42 characters per value pair in the RI format
+                size_mb = freq_num * port_num**2 * 42 / 2**20
+                if size_mb > args.max_mb:
+                    print(f"{port_num:>6} {freq_num:>7} {size_mb:>8.1f} {'skipped':>10}")
+                    continue
+                file_dir = write_snp(dir_name, port_num, freq_num)
+                t_skrf = time_read(rf.Network, file_dir, args.repeat)
+                t_fast = time_read(read_touchstone, file_dir, args.repeat)
+                size_mb = os.path.getsize(file_dir) / 2**20
+                print(
+                    f"{port_num:>6} {freq_num:>7} {size_mb:>8.1f} "
+                    f"{t_skrf:>9.3f}s {t_fast:>9.3f}s {t_skrf / t_fast:>7.1f}x"
+                )
+                os.remove(file_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
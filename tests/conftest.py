@@ -185,6 +185,14 @@ def touchstone_factory():
             TouchStone,
             {
                 "MM_KEY": ["IL_MM", "RL_MM"],
+                "MM_PART": {
+                    "IL_MM": ["DD", "CC", "DC", "CD"],
+                    "RL_MM": ["DD", "CC"],
+                    "TDR_MM": ["DD", "CC"],
+                },
+                "QUICK_LOOK_ROW": 200,
+                "QUICK_LOOK_DPI": 50,
+                "QUICK_LOOK_SKIP": ["TDR", "IL_MM", "RL_MM", "TDR_MM"],
                 "file_dir": "",
                 "key_name": "test_key",
                 "plt_dir": "",
@@ -194,7 +202,14 @@ def touchstone_factory():
                 "nw_mm": None,
                 "f": [],
                 "port_num": 0,
-                "short0": None,
+                "tdr_settings": {},
+                "plot_reuse": False,
+                "mm_settings": {},
+                "plot_workers": 1,
+                "curve_export": False,
+                "mask_plot": True,
+                "precision": "double",
+                "quick_look": False,
             },
             attrs,
         )
@@ -96,3 +96,14 @@ def test_get_run_time_uses_datetime_without_real_clock(monkeypatch):
 
     monkeypatch.setattr(common, "datetime", FrozenDateTime)
     assert common.get_run_time() == "20250304_050607"
+
+
+def test_get_file_hash_matches_sha256_and_tracks_content(tmp_path):
+    import hashlib
+
+    path = tmp_path / "sample.s1p"
+    path.write_bytes(b"# Hz S RI R 50\n1 0 0\n")
+    first = common.get_file_hash(str(path), chunk_size=4)
+    assert first == hashlib.sha256(b"# Hz S RI R 50\n1 0 0\n").hexdigest()
+    path.write_bytes(b"# Hz S RI R 50\n1 1 0\n")
+    assert common.get_file_hash(str(path)) != first
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the curve decimation drawn before plotting."""
+
+import numpy as np
+
+from opensipi.curve_decimation import lttb_index, minmax_log_index
+
+
+def _resonant_curves(size):
+    f = np.logspace(-4, 1, size)
+    resonance = np.abs(1 - (f / 0.7654) ** 2 + 1j * f / 0.7654 / 300)
+    return f, np.stack([1e-3 / resonance, 2e-3 * resonance])
+
+
+def _lttb_one_curve(x, y, n_out):
+    edge = np.linspace(1, x.size - 1, n_out - 1).astype(int)
+    keep = [0]
+    for i_bucket in range(n_out - 2):
+        start, stop = edge[i_bucket], edge[i_bucket + 1]
+        if i_bucket + 2 < n_out - 1:
+            next_slice = slice(edge[i_bucket + 1], edge[i_bucket + 2])
+            x_c, y_c = x[next_slice].mean(), y[next_slice].mean()
+        else:
+            x_c, y_c = x[-1], y[-1]
+        x_a, y_a = x[keep[-1]], y[keep[-1]]
+        area = [
+            abs((x_a - x_c) * (y[i] - y_a) - (x_a - x[i]) * (y_c - y_a)) for i in range(start, stop)
+        ]
+        keep.append(start + int(np.argmax(area)))
+    return keep + [x.size - 1]
+
+
+def test_minmax_log_keeps_the_extremes_of_every_log_bin():
+    f, y_stack = _resonant_curves(5000)
+    n_bin = 100
+
+    index_list = minmax_log_index(f, y_stack, n_bin)
+
+    bin_id = np.minimum((np.log10(f / f[0]) / 5 * n_bin).astype(int), n_bin - 1)
+    for y, index in zip(y_stack, index_list):
+        assert np.all(np.diff(index) > 0)
+        assert index[0] == 0 and index[-1] == f.size - 1
+        assert index.size <= 2 * n_bin + 2
+        for i_bin in range(n_bin):
+            in_bin = bin_id == i_bin
+            assert y[in_bin].max() in y[index] and y[in_bin].min() in y[index]
+
+
+def test_minmax_log_keeps_short_curves_and_non_positive_points():
+    f, y_stack = _resonant_curves(300)
+    f_dc = np.r_[0.0, np.logspace(-4, 1, 999)]
+
+    short = minmax_log_index(f, y_stack, 200)
+    (with_dc,) = minmax_log_index(f_dc, np.ones((1, 1000)), 10)
+
+    np.testing.assert_array_equal(short[0], np.arange(300))
+    assert with_dc[0] == 0 and 1 in with_dc
+
+
+def test_lttb_matches_the_reference_loop_and_keeps_global_extremes():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.01, 40, 3000)
+    y_stack = np.cumsum(rng.standard_normal((3, 3000)), axis=1)
+    y_stack[1, 1234] = -1e3
+
+    index_list = lttb_index(x, y_stack, 101)
+
+    for y, index in zip(y_stack, index_list):
+        expected = set(_lttb_one_curve(x, y, 101)) | {int(np.argmin(y)), int(np.argmax(y))}
+        assert index.tolist() == sorted(expected)
+    assert 1234 in index_list[1]
+
+
+def test_lttb_keeps_short_curves_whole():
+    (index,) = lttb_index(np.arange(50.0), np.zeros((1, 50)), 100)
+
+    np.testing.assert_array_equal(index, np.arange(50))
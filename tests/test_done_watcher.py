@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the ``.done`` marker watcher."""
+
+import sys
+import threading
+from time import perf_counter
+
+import pytest
+
+import opensipi.done_watcher as done_watcher_module
+from opensipi.done_watcher import DoneWatcher
+from opensipi.util.common import SL
+
+
+def _write_later(path, delay=0.1):
+    timer = threading.Timer(delay, lambda: path.write_text(""))
+    timer.start()
+    return timer
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "polling"])
+def test_wait_wakes_on_any_marker_of_the_list(monkeypatch, tmp_path, use_inotify):
+    if not use_inotify:
+        monkeypatch.setattr(done_watcher_module, "_init_inotify", lambda run_dir: None)
+    watcher = DoneWatcher(f"{tmp_path}{SL}")
+    assert (watcher.inotify_fd is not None) == (use_inotify and sys.platform.startswith("linux"))
+    timer = _write_later(tmp_path / "K2.done")
+
+    tic = perf_counter()
+    done_list = watcher.wait(["K1.done", "K2.done", "K3.done"], timeout=10)
+    watcher.close()
+    timer.join()
+
+    assert done_list == ["K2.done"]
+    assert perf_counter() - tic < 2
+
+
+def test_wait_returns_existing_markers_in_order_and_nothing_on_timeout(tmp_path):
+    (tmp_path / "K3.done").write_text("")
+    (tmp_path / "K1.done").write_text("")
+    watcher = DoneWatcher(f"{tmp_path}{SL}")
+
+    assert watcher.wait(["K1.done", "K2.done", "K3.done"]) == ["K1.done", "K3.done"]
+    assert watcher.wait(["K2.done"], timeout=0.2) == []
+    watcher.close()
+    watcher.close()
@@ -92,6 +92,20 @@ def _spec_type_table():
     ]
 
 
+def test_parse_spec_type_reads_an_optional_target_impedance_mask(file_in_factory):
+    table = [
+        ["Spec Type", "Freq", "Post_Process_Key", "Z_Mask"],
+        [" rail ", " 0, 1e9 ", " zopen, zmask ", " 1e3:0.01, 1e8 : 0.1 "],
+        [" plain ", " 0, 1e9 ", " zopen ", ""],
+    ]
+
+    parsed = file_in_factory()._FileIn__parse_spec_type(table)
+
+    assert parsed["RAIL"]["Z_MASK"] == [[1e3, 0.01], [1e8, 0.1]]
+    assert parsed["RAIL"]["POST_PROCESS_KEY"] == ["ZOPEN", "ZMASK"]
+    assert "Z_MASK" not in parsed["PLAIN"]
+
+
 def _expected_input_data(parts):
     return dict(
         zip(
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the machine-wide license token pool."""
+
+import os
+import subprocess
+import sys
+import threading
+
+from opensipi.license_pool import LicensePool
+from opensipi.util.common import SL
+
+
+def _pool(tmp_path, capacity):
+    pool = LicensePool({"SIG_LIC_CAP": {"powersi": capacity}, "SIG_LIC_POOL_DIR": str(tmp_path)})
+    pool.POLL_TIME = 0.01
+    return pool
+
+
+def _acquire_in_thread(pool, priority=0):
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(pool.acquire("powersi", priority)), daemon=True
+    )
+    thread.start()
+    return thread, result
+
+
+def test_launches_past_the_capacity_wait_for_a_released_token(tmp_path):
+    pool = _pool(tmp_path, 2)
+    first = pool.acquire("powersi")
+    second = pool.acquire("PowerSI")
+    assert pool.get_usage("powersi") == (2, 0)
+
+    thread, result = _acquire_in_thread(pool)
+    thread.join(0.2)
+    assert thread.is_alive()
+    assert pool.get_usage("powersi") == (2, 1)
+    pool.release(first)
+    thread.join(5)
+
+    assert not thread.is_alive() and result[0] is not None
+    assert pool.get_usage("powersi") == (2, 0)
+    pool.release(second)
+    pool.release(result[0])
+    assert pool.get_usage("powersi") == (0, 0)
+
+
+def test_a_higher_priority_ticket_is_served_first_and_dead_tickets_are_dropped(tmp_path):
+    pool = _pool(tmp_path, 1)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    tool_dir = f"{tmp_path}{SL}POWERSI{SL}"
+    os.makedirs(tool_dir)
+    dead_ticket = f"{tool_dir}9_1_{dead.pid}_0.wait"
+    open(dead_ticket, "w").close()
+    ahead = f"{tool_dir}5_2_{os.getpid()}_0.wait"
+    open(ahead, "w").close()
+
+    thread, result = _acquire_in_thread(pool, priority=1)
+    thread.join(0.2)
+    assert thread.is_alive()
+    assert not os.path.exists(dead_ticket)
+    assert len([name for name in os.listdir(tool_dir) if name.endswith(".wait")]) == 2
+    os.remove(ahead)
+    thread.join(5)
+
+    assert not thread.is_alive() and result[0] is not None
+    assert [name for name in os.listdir(tool_dir) if name.endswith(".wait")] == []
+    pool.release(result[0])
+
+
+def test_a_tool_without_a_capacity_is_not_accounted_for(tmp_path):
+    pool = LicensePool({"SIG_LIC_CAP": {"POWERDC": 1}, "SIG_LIC_POOL_DIR": str(tmp_path)})
+
+    token = pool.acquire("powersi")
+    pool.release(token)
+
+    assert token is None
+    assert pool.get_usage("powersi") == (0, 0)
+    assert pool.pool_dir == f"{tmp_path}{SL}"
@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the mixed-mode conversion cache."""
+
+import os
+
+import numpy as np
+import skrf as rf
+
+from opensipi.mm_cache import MixedModeCache
+from opensipi.util.common import SL
+
+CONN = {"MM_ORDER_IN_SE": [0, 1, 2, 3]}
+ALL_QUAD = ["DD", "DC", "CD", "CC"]
+
+
+def _source(tmp_path):
+    source = tmp_path / "SIM_A__S.s4p"
+    source.write_text("touchstone", encoding="utf-8")
+    return str(source)
+
+
+def _mm_network():
+    s = np.arange(32, dtype=complex).reshape(2, 4, 4) * (1 + 1j)
+    frequency = rf.Frequency.from_f([1e9, 2e9], unit="Hz")
+    return rf.Network(frequency=frequency, s=s, z0=[100, 100, 25, 25])
+
+
+def _cache(tmp_path):
+    return MixedModeCache(f"{tmp_path / 'Mixed_Mode'}{SL}")
+
+
+def test_save_then_load_returns_the_converted_network(tmp_path):
+    source = _source(tmp_path)
+    nw = _mm_network()
+
+    _cache(tmp_path).save(source, CONN, ALL_QUAD, nw)
+    loaded = _cache(tmp_path).load(source, CONN, ALL_QUAD)
+
+    assert os.path.isfile(f"{tmp_path / 'Mixed_Mode'}{SL}SIM_A__S_mm.npz")
+    np.testing.assert_array_equal(loaded.s, nw.s)
+    np.testing.assert_array_equal(loaded.f, nw.f)
+    np.testing.assert_array_equal(loaded.z0, nw.z0)
+    assert loaded.name == "SIM_A__S"
+
+
+def test_load_misses_without_an_entry(tmp_path):
+    assert _cache(tmp_path).load(_source(tmp_path), CONN, ALL_QUAD) is None
+
+
+def test_load_misses_when_the_source_is_newer(tmp_path):
+    source = _source(tmp_path)
+    cache = _cache(tmp_path)
+    cache.save(source, CONN, ALL_QUAD, _mm_network())
+    entry_mtime = os.stat(cache.get_entry_dir(source)).st_mtime_ns
+    os.utime(source, ns=(entry_mtime + 10**9, entry_mtime + 10**9))
+
+    assert cache.load(source, CONN, ALL_QUAD) is None
+
+
+def test_load_misses_when_the_pairing_or_termination_changed(tmp_path):
+    source = _source(tmp_path)
+    cache = _cache(tmp_path)
+    cache.save(source, CONN, ALL_QUAD, _mm_network())
+
+    assert cache.load(source, {"MM_ORDER_IN_SE": [2, 3, 0, 1]}, ALL_QUAD) is None
+    assert cache.load(source, {**CONN, "TERM_MM": [50, 50]}, ALL_QUAD) is None
+
+
+def test_load_needs_every_requested_quadrant(tmp_path):
+    source = _source(tmp_path)
+    cache = _cache(tmp_path)
+    cache.save(source, CONN, ["DD", "CC"], _mm_network())
+
+    assert cache.load(source, CONN, ["CC", "DD"]) is not None
+    assert cache.load(source, CONN, ALL_QUAD) is None
+
+
+def test_load_misses_on_a_corrupt_entry(tmp_path):
+    source = _source(tmp_path)
+    cache = _cache(tmp_path)
+    with open(cache.get_entry_dir(source), "wb") as f:
+        f.write(b"not an npz file")
+
+    assert cache.load(source, CONN, ALL_QUAD) is None
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the reused Agg plot canvases."""
+
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from opensipi.plot_canvas import PlotCanvas
+
+
+def _pyplot_zmag(fig_data, fig_title, fig_dir):
+    plt.figure(figsize=(8, 5))
+    for i_curve in fig_data:
+        plt.plot(i_curve[0], i_curve[1], **(i_curve[2] if len(i_curve) == 3 else {}))
+    if any(len(i_curve) == 3 and "label" in i_curve[2] for i_curve in fig_data):
+        plt.legend()
+    plt.title(fig_title)
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Frequency (GHz)")
+    plt.ylabel("Z(Ohm)")
+    plt.grid(which="major", linestyle="-")
+    plt.grid(which="minor", linestyle="--")
+    plt.savefig(fig_dir)
+    plt.close()
+
+
+def test_render_reuses_one_figure_and_matching_lines(tmp_path):
+    canvas = PlotCanvas()
+    x = np.asarray([1.0, 2.0, 3.0])
+
+    canvas.render("smag", [[x, -x, {"label": "S21"}]], "First", str(tmp_path / "a.png"))
+    fig, ax, _ = canvas.get_figure("smag")
+    line = ax.lines[0]
+    canvas.render("smag", [[x, -2 * x, {"label": "S31"}]], "Second", str(tmp_path / "b.png"))
+
+    assert canvas.get_figure("smag")[0] is fig
+    assert list(ax.lines) == [line]
+    np.testing.assert_array_equal(line.get_ydata(), -2 * x)
+    assert line.get_label() == "S31"
+    assert ax.get_title() == "Second"
+    assert ax.get_ylim()[0] <= -6
+    assert (tmp_path / "a.png").is_file() and (tmp_path / "b.png").is_file()
+
+
+def test_render_rebuilds_changed_lines_and_drops_extra_ones(tmp_path):
+    canvas = PlotCanvas()
+    x = np.asarray([1.0, 2.0])
+    canvas.render(
+        "smag",
+        [[x, x, {"label": "A"}], [x, x, {"label": "B"}], [x, x, {"label": "C"}]],
+        "Three",
+        str(tmp_path / "three.png"),
+    )
+    _, ax, _ = canvas.get_figure("smag")
+    first = ax.lines[0]
+
+    canvas.render("smag", [[x, x], [x, x, {"color": "red"}]], "Two", str(tmp_path / "two.png"))
+
+    assert len(ax.lines) == 2
+    assert ax.lines[0] is first
+    assert ax.lines[1].get_color() == "red"
+    assert ax.get_legend() is None
+
+
+def test_time_domain_style_always_draws_a_legend(tmp_path):
+    canvas = PlotCanvas()
+
+    canvas.render(
+        "time_domain",
+        [[np.asarray([0.0, 1.0]), np.asarray([50.0, 50.0]), {"label": "Port_1"}]],
+        "TDR",
+        str(tmp_path / "tdr.png"),
+    )
+
+    assert canvas.get_figure("time_domain")[1].get_legend() is not None
+
+
+def test_render_batch_writes_every_spec_in_order(tmp_path):
+    canvas = PlotCanvas()
+    x = np.asarray([0.01, 0.1])
+    spec_list = [
+        {
+            "style": "zmag",
+            "fig_data": [[x, x * (i_spec + 1)]],
+            "fig_title": "Z" + str(i_spec),
+            "fig_dir": str(tmp_path / f"z{i_spec}.png"),
+        }
+        for i_spec in range(3)
+    ]
+
+    assert canvas.render_batch(spec_list) == [spec["fig_dir"] for spec in spec_list]
+    assert all((tmp_path / f"z{i_spec}.png").is_file() for i_spec in range(3))
+    assert canvas.get_figure("zmag")[1].get_title() == "Z2"
+
+
+def test_unknown_style_raises_key_error():
+    with pytest.raises(KeyError):
+        PlotCanvas().get_figure("polar")
+
+
+def test_reused_canvas_writes_the_same_pixels_as_pyplot(tmp_path):
+    canvas = PlotCanvas()
+    f = np.logspace(-5, 1, 50)
+    sequence = [
+        [[f, 1e-3 * (1 + f)]],
+        [[f, f * 2, {"label": "Z22", "color": "red"}], [f, f * 3]],
+        [[f, f + 1, {"label": "Z11"}]],
+        [[f, 1 / f]],
+    ]
+
+    for i_fig, fig_data in enumerate(sequence):
+        canvas.render("zmag", fig_data, "Z" + str(i_fig), str(tmp_path / f"canvas{i_fig}.png"))
+        _pyplot_zmag(fig_data, "Z" + str(i_fig), str(tmp_path / f"pyplot{i_fig}.png"))
+
+        np.testing.assert_array_equal(
+            mpimg.imread(tmp_path / f"canvas{i_fig}.png"),
+            mpimg.imread(tmp_path / f"pyplot{i_fig}.png"),
+        )
+
+
+def test_long_curves_are_thinned_before_drawing_and_short_ones_are_kept(tmp_path):
+    canvas = PlotCanvas()
+    f = np.logspace(-4, 1, 20000)
+    z = 1e-3 / np.abs(1 - (f / 0.5) ** 2 + 1j * f / 50)
+    short = [f[:10], z[:10]]
+    fig_data = [[f, z, {"label": "Z11"}], [f, 2 * z], short]
+
+    thin_data = canvas.decimate("zmag", fig_data)
+    canvas.render("zmag", fig_data, "Z", str(tmp_path / "z.png"))
+
+    assert len(thin_data[0][0]) < 2000 and thin_data[0][2] == {"label": "Z11"}
+    assert thin_data[0][1].max() == z.max() and thin_data[1][1].max() == 2 * z.max()
+    assert thin_data[2] is short
+    assert len(canvas.get_figure("zmag")[1].lines[0].get_xdata()) == len(thin_data[0][0])
+    assert canvas.decimate("time_domain", fig_data) is fig_data
+    assert canvas.STYLE_VERSION == 2
@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the plot manifest."""
+
+import os
+
+from opensipi.plot_manifest import PlotManifest
+from opensipi.util.common import SL
+
+
+def _write_png(path, content=b"png"):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_input_hash_ignores_key_order_and_follows_values(tmp_path):
+    manifest = PlotManifest(f"{tmp_path}{SL}")
+
+    first = manifest.get_input_hash({"a": 1, "b": [1, 2]})
+
+    assert first == manifest.get_input_hash({"b": [1, 2], "a": 1})
+    assert first != manifest.get_input_hash({"a": 1, "b": [2, 1]})
+
+
+def test_save_then_load_returns_the_recorded_output(tmp_path):
+    manifest = PlotManifest(f"{tmp_path}{SL}")
+    fig_dir = _write_png(tmp_path / "SIM__ZOPEN_Port1.png")
+    output = [["SIM__ZOPEN_Port1", fig_dir, "", "12.00", "3.00"]]
+
+    manifest.save("abc", output)
+
+    assert os.path.isfile(f"{tmp_path}{SL}Manifest{SL}abc.json")
+    assert manifest.load("abc") == output
+    assert PlotManifest(f"{tmp_path}{SL}").load("abc") == output
+
+
+def test_load_covers_every_figure_of_a_mixed_mode_output(tmp_path):
+    manifest = PlotManifest(f"{tmp_path}{SL}")
+    dd_dir = _write_png(tmp_path / "dd.png")
+    cc_dir = _write_png(tmp_path / "cc.png")
+    output = {"DD": [["dd", dd_dir]], "CC": [["cc", cc_dir]]}
+    manifest.save("mm", output)
+
+    assert manifest.load("mm") == output
+
+    os.remove(cc_dir)
+
+    assert manifest.load("mm") is None
+
+
+def test_load_rejects_an_overwritten_figure_and_a_missing_entry(tmp_path):
+    manifest = PlotManifest(f"{tmp_path}{SL}")
+    fig_dir = _write_png(tmp_path / "shared.png", b"first file")
+    manifest.save("first", [["shared", fig_dir]])
+
+    _write_png(tmp_path / "shared.png", b"second file")
+
+    assert manifest.load("first") is None
+    assert manifest.load("never_saved") is None
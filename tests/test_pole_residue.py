@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the pole-residue models of touchstone networks."""
+
+import numpy as np
+import pytest
+import skrf as rf
+
+from opensipi.pole_residue import PoleResidueModel
+from opensipi.touchstone import TouchStone
+from opensipi.util.common import SL
+
+
+def _rational_network():
+    # a passive 2-port made of one real and one complex pole pair
+    poles = np.array([-2e7, -5e7 + 2e9j])
+    residues = np.array(
+        [
+            [[-1e6, -4e7 + 1e7j], [2e5, 1e7 - 3e6j]],
+            [[2e5, 1e7 - 3e6j], [-8e5, -3e7 + 2e7j]],
+        ]
+    )
+    source = PoleResidueModel(poles, residues, np.full((2, 2), 0.1), np.zeros((2, 2)), [50, 50])
+    f = np.linspace(1e6, 1e9, 400)
+    return source, rf.Network(frequency=rf.Frequency.from_f(f, unit="Hz"), s=source.get_s(f), z0=50)
+
+
+def test_fit_recovers_a_rational_network_with_one_shared_pole_set():
+    source, nw = _rational_network()
+
+    model = PoleResidueModel.fit(nw, n_poles_real=1, n_poles_cmplx=1)
+
+    assert model.residues.shape == (2, 2, len(model.poles))
+    assert model.get_rms_error(nw) < 1e-6
+    f = np.array([3e6, 123.4e6, 1.2e9])
+    np.testing.assert_allclose(model.get_s(f), source.get_s(f), atol=1e-6)
+
+
+def test_get_s_matches_the_scikit_rf_model_response():
+    _, nw = _rational_network()
+    vf = rf.VectorFitting(nw)
+    vf.vector_fit(n_poles_real=2, n_poles_cmplx=2, init_pole_spacing="log")
+    model = PoleResidueModel(
+        vf.poles,
+        vf.residues.reshape(2, 2, -1),
+        vf.constant_coeff.reshape(2, 2),
+        vf.proportional_coeff.reshape(2, 2),
+        [50, 50],
+    )
+    f = np.geomspace(1e5, 2e9, 7)
+
+    s = model.get_s(f)
+
+    for i_out in range(2):
+        for i_in in range(2):
+            np.testing.assert_allclose(s[:, i_out, i_in], vf.get_model_response(i_out, i_in, f))
+
+
+def test_saved_model_reads_back_and_gives_the_impedances_of_the_network(tmp_path):
+    source, nw = _rational_network()
+    model_dir = PoleResidueModel.get_model_dir(f"{tmp_path}{SL}Pole_Residue{SL}", "/r/SIM_A__S.s2p")
+
+    source.save(model_dir)
+    model = PoleResidueModel.load(model_dir)
+
+    assert model_dir.endswith(f"Pole_Residue{SL}SIM_A__S.npz")
+    np.testing.assert_array_equal(model.residues, source.residues)
+    z_self = model.get_z_self(nw.f, [1, 0])
+    np.testing.assert_allclose(z_self, nw.z[:, [1, 0], [1, 0]], rtol=1e-9)
+    freq_tgt = np.array([2e6, 1e7, 5e8])
+    z_tgt = np.abs(TouchStone.solve_z_self(source.get_s(freq_tgt), np.full((3, 2), 50.0), [0, 1]))
+    for value, expected in zip(
+        model.get_rlc([0, 1], freq_tgt), TouchStone.convert_z_to_rlc(z_tgt, freq_tgt)
+    ):
+        assert value == pytest.approx(expected)
+    for value, expected in zip(model.get_rlc([0]), model.get_rlc([0], TouchStone.RLC_FREQ)):
+        np.testing.assert_array_equal(value, expected)
@@ -35,6 +35,7 @@ def test_report_templates_have_summary_tables_and_figure_sections(template_name)
             {
                 "ZOPEN": ["Title", "DCR (mOhm)", "L@100MHz (pH)", "C@10kHz (nF)", "Figure"],
                 "ZSHORT": ["Title", "DCR (mOhm)", "L@100MHz (pH)", "C@10kHz (nF)", "Figure"],
+                "ZMASK": ["Title", "Mask", "Margin (dB)", "@ Freq (GHz)", "Figure"],
             },
         ),
         (
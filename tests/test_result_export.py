@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the columnar export of curves and values."""
+
+import numpy as np
+import pytest
+
+from opensipi.result_export import ResultExport
+from opensipi.util.common import SL
+
+
+def test_written_columns_read_back_one_curve_at_a_time(tmp_path):
+    export_dir = f"{tmp_path}{SL}Export{SL}"
+    f = np.linspace(0.001, 1.0, 5)
+    export = ResultExport(export_dir, "Run_A")
+    export.add_curve("SIM_A", "IL", "S21", f, -f)
+    export.add_curve("SIM_A", "IL", "S31", f, -2 * f)
+    export.add_curve("SIM_B", "TDR", "Port_1", np.arange(3.0), np.full(3, 50.0))
+    export.add_scalar("SIM_A", "ZOPEN", "Port1", "L_pH", 12.5)
+
+    export.write()
+
+    x, y = ResultExport.read_curve(export_dir, "SIM_A", "IL", "S31")
+    np.testing.assert_array_equal(x, f.astype(np.float32))
+    np.testing.assert_array_equal(y, (-2 * f).astype(np.float32))
+    assert y.dtype == np.float32
+    curve_index = ResultExport.read_index(export_dir)
+    assert curve_index["port"].tolist() == ["S21", "S31", "Port_1"]
+    assert set(curve_index["run"]) == {"Run_A"}
+    # the shared frequency axis is stored once
+    assert np.load(export_dir + "curve_x.npy").size == 5 + 3
+    (scalar,) = ResultExport.read_scalar(export_dir)
+    assert (scalar["sim_key"], scalar["quantity"], scalar["value"]) == ("SIM_A", "L_pH", 12.5)
+    with pytest.raises(KeyError):
+        ResultExport.read_curve(export_dir, "SIM_A", "RL", "S11")
+
+
+def test_an_empty_export_still_writes_every_column(tmp_path):
+    export_dir = f"{tmp_path}{SL}"
+
+    ResultExport(export_dir, "Run_A").write()
+
+    assert ResultExport.read_index(export_dir).size == 0
+    assert ResultExport.read_scalar(export_dir).size == 0
+
+
+def test_shards_round_trip_as_float32_and_feed_an_export(tmp_path):
+    shard_dir = ResultExport.get_shard_dir(f"{tmp_path}{SL}", "SIM_A__IL__S")
+    y_stack = np.array([[-1.0, -2.0], [-3.0, -4.0]])
+
+    ResultExport.save_shard(shard_dir, [1.0, 2.0], y_stack, ["S21", "S43"])
+    export = ResultExport(f"{tmp_path}{SL}", "Run_A")
+    port_list = export.add_shard(shard_dir, "SIM_A", "IL")
+
+    x, y, port = ResultExport.load_shard(shard_dir)
+    assert shard_dir == f"{tmp_path}{SL}Curves{SL}SIM_A__IL__S.npz"
+    assert port == port_list == ["S21", "S43"]
+    assert x.dtype == y.dtype == np.float32
+    np.testing.assert_array_equal(y, y_stack)
+    assert [curve[2] for curve in export.curve_list] == ["S21", "S43"]
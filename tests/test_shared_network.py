@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the networks placed in shared memory."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+import skrf as rf
+
+from opensipi.shared_network import SharedNetwork
+
+
+def _network():
+    s = np.arange(3 * 2 * 2, dtype=complex).reshape(3, 2, 2) * (1 - 1j)
+    frequency = rf.Frequency.from_f([1e9, 2e9, 3e9], unit="Hz")
+    return rf.Network(frequency=frequency, s=s, z0=[50, 75], name="shared")
+
+
+def _sum_in_child(spec):
+    view = SharedNetwork.attach(spec)
+    total = complex(view.s.sum())
+    view.release()
+    return total
+
+
+def test_attached_view_reads_the_network_without_a_copy():
+    nw = _network()
+    owner = SharedNetwork.create(nw)
+    try:
+        view = SharedNetwork.attach(owner.spec)
+        np.testing.assert_array_equal(view.f, nw.f)
+        np.testing.assert_array_equal(view.s, nw.s)
+        np.testing.assert_array_equal(view.z0, nw.z0)
+        np.testing.assert_array_equal(view.frequency.f, nw.f)
+        assert view.name == "shared"
+        assert view.number_of_ports == 2
+        assert view.s.base is not None and not view.s.flags.owndata
+        view.release()
+    finally:
+        owner.release()
+
+
+def test_child_processes_attach_by_name():
+    nw = _network()
+    owner = SharedNetwork.create(nw)
+    try:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            total_list = list(pool.map(_sum_in_child, [owner.spec] * 2))
+    finally:
+        owner.release()
+
+    assert total_list == [nw.s.sum()] * 2
+
+
+def test_owner_release_removes_the_blocks():
+    owner = SharedNetwork.create(_network())
+    spec = owner.spec
+
+    owner.release()
+
+    with pytest.raises(FileNotFoundError):
+        SharedNetwork.attach(spec)
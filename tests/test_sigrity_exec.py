@@ -6,18 +6,28 @@
 """Offline characterization tests for Sigrity executor domain logic."""
 
 import logging
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from time import perf_counter, sleep
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 
 from opensipi.constants.CONSTANTS import SIM_INPUT_COL_TITLE
+from opensipi.result_export import ResultExport
 from opensipi.sigrity_exec import (
     ClarityExec,
     PowerdcExec,
     PowersiIOExec,
     PowersiPdnExec,
 )
+from opensipi.solver_process import SolverProcess
 from opensipi.util.common import SL
+from opensipi.util.exceptions import UnequalPortCounts
 
 UNIKEY, CKBOX, SPECTYPE, POSNET, NEGNET, POSMP, NEGMP, POSAP, NEGAP = SIM_INPUT_COL_TITLE[:9]
 
@@ -350,3 +360,235 @@ def test_dcr_relocate_results_copies_resistance_csv(executor_factory, tmp_path):
     assert (csv_dir / "Resis.csv").read_text(encoding="utf-8") == (
         "name,resistance\nrail_a,0.001\n"
     )
+
+
+def test_dcr_export_writes_the_worst_resistances_as_values(executor_factory, tmp_path):
+    executor = executor_factory(
+        PowerdcExec,
+        report_dir=f"{tmp_path}{SL}",
+        spd_proj=SimpleNamespace(run_name="A"),
+    )
+
+    executor._PowerdcExec__export_dcr({"RAIL_A": "1.5", "RAIL_B": "0.25"})
+
+    scalar = ResultExport.read_scalar(f"{tmp_path}{SL}Export{SL}")
+    assert scalar[["run", "sim_key", "quantity"]].tolist() == [
+        ("Run_A", "RAIL_A", "DCR_worst_mOhm"),
+        ("Run_A", "RAIL_B", "DCR_worst_mOhm"),
+    ]
+    assert scalar["value"].tolist() == [1.5, 0.25]
+
+
+def test_sharded_stage_deals_keys_round_robin_and_marks_the_stage_done(executor_factory, tmp_path):
+    run_dir = f"{tmp_path}{SL}"
+    (tmp_path / "sim_1.done").write_text("")  # left over from an interrupted run
+    executor = _executor(executor_factory)
+    monitored = []
+    executor._run_monitor = lambda mntr_info, run_info: monitored.append(
+        (run_info, (tmp_path / run_info["done_file"]).exists())
+    )
+    mk_shard_tcl = Mock(side_effect=lambda keys, i: (f"run_{i}.tcl", f"sim_{i}.done"))
+    run_info = {
+        "tool": "powersi",
+        "tcl_dir": "run.tcl",
+        "run_dir": run_dir,
+        "key2sim": ["K1", "K2", "K3", "K4", "K5"],
+        "done_file": "sim.done",
+    }
+
+    executor._run_stage({"op_solver_shards": 2}, run_info, mk_shard_tcl)
+
+    assert [call.args for call in mk_shard_tcl.call_args_list] == [
+        (["K1", "K3", "K5"], 0),
+        (["K2", "K4"], 1),
+    ]
+    assert sorted(info["tcl_dir"] for info, _ in monitored) == ["run_0.tcl", "run_1.tcl"]
+    assert all(info["tool"] == "powersi" and not stale for info, stale in monitored)
+    assert (tmp_path / "sim.done").exists()
+    assert run_info["key2sim"] == ["K1", "K2", "K3", "K4", "K5"]
+
+
+def test_unsharded_stage_runs_the_stage_script(executor_factory):
+    executor = _executor(executor_factory)
+    executor._run_monitor = Mock()
+    mk_shard_tcl = Mock()
+    run_info = {"key2sim": ["K1"], "run_dir": "", "done_file": "check.done"}
+
+    executor._run_stage({"op_solver_shards": 4}, run_info, mk_shard_tcl)
+
+    executor._run_monitor.assert_called_once_with({"op_solver_shards": 4}, run_info)
+    mk_shard_tcl.assert_not_called()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="no sessions on this OS")
+def test_monitor_follows_a_solver_its_launcher_left_in_the_background(
+    executor_factory, monkeypatch, tmp_path
+):
+    executor = _executor(executor_factory)
+    pid_dir = f"{tmp_path / 'run.pid'}"
+    child = (
+        "import os, pathlib, time\n"
+        f"pathlib.Path({pid_dir!r}).write_text(str(os.getpid()))\n"
+        "time.sleep(3)\n"
+        "for name in ['K1', 'K2', 'K3', 'sim']:\n"
+        f"    pathlib.Path({str(tmp_path)!r}, name + '.done').write_text('')\n"
+    )
+    script = (
+        "import subprocess, sys\n"
+        f"subprocess.Popen([sys.executable, '-c', {child!r}], start_new_session=True)\n"
+    )
+
+    elapsed, logged = _monitor(
+        executor, monkeypatch, tmp_path, script, {"op_sample_sec": 1}, pid_dir
+    )
+
+    # the launcher is gone at once, the solver is found through its PID
+    assert elapsed < 10
+    assert "powersi is found running again." in logged
+    assert [line.split(" after")[0] for line in logged if " is done for K" in line] == [
+        "Sim is done for K1",
+        "Sim is done for K2",
+        "Sim is done for K3",
+    ]
+    assert not any(line.startswith("Restart") for line in logged)
+
+
+@pytest.mark.skipif(shutil.which("tclsh") is None, reason="no tclsh")
+def test_launch_tcl_records_the_solver_pid_and_runs_the_script(executor_factory, tmp_path):
+    executor = _executor(executor_factory)
+    tcl_dir = f"{tmp_path / 'run.tcl'}"
+    (tmp_path / "run.tcl").write_text(f'close [open "{tmp_path / "ran"}" w]\n'.replace(SL, "/"))
+
+    launch_tcl_dir, pid_dir = executor._PowersiPdnExec__mk_launch_tcl(tcl_dir)
+    tclsh = subprocess.Popen([shutil.which("tclsh"), launch_tcl_dir])
+
+    assert tclsh.wait(30) == 0
+    assert launch_tcl_dir == f"{tmp_path / 'run_launch.tcl'}"
+    assert pid_dir == f"{tmp_path / 'run.pid'}"
+    assert int((tmp_path / "run.pid").read_text()) == tclsh.pid
+    assert (tmp_path / "ran").exists()
+
+
+def test_pipeline_simulates_each_checked_key_before_the_model_check_ends(
+    executor_factory, tmp_path
+):
+    check_dir = f"{tmp_path / 'ck'}{SL}"
+    sim_dir = f"{tmp_path / 'sim'}{SL}"
+    os.makedirs(sim_dir)
+    port_count = {"K1": 2, "K2": 2, "K3": 1, "K4": 2}
+    simulated = []
+    overlapped = []
+
+    def write_check(i_key):
+        port_csv = "Name,Type\n" + "Port_x,Lumped\n" * port_count[i_key]
+        _write_files(tmp_path / "ck", {f"Ports_{i_key}.csv": port_csv})
+        _write_files(tmp_path / "ck", {f"Caps_{i_key}.csv": 'C1,"a\nb\nc\nd\ne\nf",'})
+        _write_files(tmp_path / "ck", {f"{i_key}.done": ""})
+
+    def check_stage(mntr_info, run_info, mk_shard_tcl):
+        write_check("K2")
+        write_check("K3")
+        tic = perf_counter()
+        while "K2" not in simulated and perf_counter() - tic < 5:
+            sleep(0.01)
+        overlapped.append("K2" in simulated)
+        write_check("K4")
+        _write_files(tmp_path / "ck", {"check.done": ""})
+
+    write_check("K1")  # checked by an earlier run
+    executor = _executor(
+        executor_factory,
+        spd_proj=SimpleNamespace(
+            model_check_dir=check_dir,
+            mk_check_shard_tcl=Mock(),
+            mk_run_shard_tcl=Mock(side_effect=lambda keys, i: (f"run_{i}.tcl", f"sim_{i}.done")),
+        ),
+        run_info={
+            "run_info_check": {"run_dir": check_dir, "key2sim": ["K2", "K3", "K4"]},
+            "run_info_sim": {
+                "run_dir": sim_dir,
+                "key2sim": ["K1", "K2", "K3", "K4"],
+                "done_file": "sim.done",
+            },
+        },
+        _port_count_defined=dict.fromkeys(port_count, 2),
+    )
+    executor._run_stage = check_stage
+    executor._run_monitor = lambda mntr_info, run_info: simulated.extend(run_info["key2sim"])
+
+    with pytest.raises(UnequalPortCounts):
+        executor._model_pipeline({})
+
+    assert overlapped == [True]
+    assert sorted(simulated) == ["K1", "K2", "K4"]
+    assert os.path.exists(sim_dir + "sim.done")
+    logged = [call.args[0] for call in executor.lg.debug.call_args_list]
+    assert "Sim is dropped for K3 due to unequal port counts!" in logged
+
+
+def _solver_command(script):
+    argv = [sys.executable, "-c", script]
+    return subprocess.list2cmdline(argv) if os.name == "nt" else shlex.join(argv)
+
+
+def _monitor(executor, monkeypatch, tmp_path, script, mntr_info, pid_dir=None):
+    command = _solver_command(script)
+    monkeypatch.setattr(
+        executor,
+        "_PowersiPdnExec__run_tcl",
+        lambda run_info: SolverProcess(command, pid_dir).launch(),
+    )
+    run_info = {
+        "tool": "powersi",
+        "tool_config": {},
+        "run_dir": f"{tmp_path}{SL}",
+        "key2sim": ["K1", "K2", "K3"],
+        "done_file": "sim.done",
+    }
+    tic = perf_counter()
+    executor._run_monitor({"email": "", **mntr_info}, run_info)
+    return perf_counter() - tic, [call.args[0] for call in executor.lg.debug.call_args_list]
+
+
+def test_monitor_follows_every_marker_and_samples_the_solver_processes(
+    executor_factory, monkeypatch, tmp_path
+):
+    executor = _executor(executor_factory)
+    script = (
+        "import pathlib, time\n"
+        "time.sleep(0.5)\n"
+        "for name in ['K1', 'K2', 'K3', 'sim']:\n"
+        f"    pathlib.Path({str(tmp_path)!r}, name + '.done').write_text('')\n"
+    )
+
+    elapsed, logged = _monitor(executor, monkeypatch, tmp_path, script, {"op_sample_sec": 0.1})
+
+    assert elapsed < 5
+    assert [line.split(" after")[0] for line in logged if " is done for K" in line] == [
+        "Sim is done for K1",
+        "Sim is done for K2",
+        "Sim is done for K3",
+    ]
+    assert any(line.startswith("powersi PIDs [") for line in logged)
+    assert "Successfully finished all runs!" in logged
+
+
+def test_monitor_restarts_a_crashed_solver_after_a_backoff_and_then_skips_the_key(
+    executor_factory, monkeypatch, tmp_path
+):
+    executor = _executor(executor_factory)
+
+    elapsed, logged = _monitor(
+        executor, monkeypatch, tmp_path, "raise SystemExit(3)", {"op_sample_sec": 0.2}
+    )
+
+    # one backoff before each of the nine relaunches
+    assert 9 * 0.2 <= elapsed < 30
+    assert "powersi has exited with code 3 before finishing K1!" in logged
+    assert [line.split(" after")[0] for line in logged if line.startswith("Sim is SKIPPED")] == [
+        "Sim is SKIPPED for K1",
+        "Sim is SKIPPED for K2",
+        "Sim is SKIPPED for K3",
+    ]
+    assert sum(line.startswith("Restart the tool") for line in logged) == 9
+    assert (tmp_path / "K2.done").exists()
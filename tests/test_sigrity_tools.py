@@ -9,6 +9,7 @@ import pytest
 
 from opensipi.constants.CONSTANTS import SIM_INPUT_COL_TITLE
 from opensipi.sigrity_tools import ClarityModeler, PowersiPdnModeler, SpdModeler
+from opensipi.util.common import SL, get_dir
 from opensipi.util.exceptions import WrongAreaPortDef, WrongGrowSolderFormat
 
 POSITIVE_MAIN_PORTS = SIM_INPUT_COL_TITLE[5]
@@ -486,3 +487,24 @@ def test_optional_disable_all_caps_emits_command_only_when_requested(modeler_fac
 
     assert enabled_tcl == ""
     assert "turn_off_all_enabled_caps" in disabled_tcl
+
+
+def test_shard_tcl_runs_only_its_keys_and_marks_its_own_done_file(modeler_factory, tmp_path):
+    modeler = modeler_factory(
+        template_dir=get_dir()[2],
+        loc_script_dir=f"{tmp_path}{SL}",
+        model_check_dir="/run/Check/",
+        sim_dir="/run/Sim/",
+        run_name="2026_10_18",
+        SIM_DONE_FILENAME="sim.done",
+        TEMP_RUN_TCL="temp_run.tcl",
+        RUN_TCL="run.tcl",
+    )
+
+    tcl_dir, done_file = modeler.mk_run_shard_tcl(["SIM_A", "SIM_C"], 1)
+
+    assert (tcl_dir, done_file) == (f"{tmp_path}{SL}run_1.tcl", "sim_1.done")
+    tcl = (tmp_path / "run_1.tcl").read_text()
+    assert "set run_key_array {\nSIM_A\nSIM_C\n}" in tcl
+    assert 'set done_file [open "/run/Sim/sim_1.done" w]' in tcl
+    assert 'set spd_path "/run/Check/"' in tcl
@@ -10,9 +10,13 @@ from copy import deepcopy
 from pathlib import Path
 from unittest.mock import Mock, call, sentinel
 
+import numpy as np
 import pytest
+import skrf as rf
 
 from opensipi import sipi_infra
+from opensipi.pole_residue import PoleResidueModel
+from opensipi.result_export import ResultExport
 from opensipi.sipi_infra import Platform
 from opensipi.templates import temp_report
 from opensipi.util.common import SL
@@ -445,6 +449,78 @@ def test_get_plt_list_filters_unchecked_snp_files_and_builds_touchstone_info(
     ]
 
 
+def test_get_plt_list_points_touchstones_at_a_shared_cache_when_enabled(platform_factory, tmp_path):
+    result_dir = tmp_path / "Result" / "SNP_S"
+    result_dir.mkdir(parents=True)
+    (result_dir / "SIM_A__S.s2p").write_text("touchstone", encoding="utf-8")
+    platform = platform_factory(lg=Mock(spec=logging.Logger))
+    result_config = {
+        "result_sub_dirs": {"SNP_S": f"{result_dir}{SL}"},
+        "plot_dir": f"{tmp_path}{SL}",
+        "checked_keys": ["SIM_A"],
+        "spectype": {"SIM_A": {}},
+        "CONNECTIVITY": {"SIM_A": {}},
+        "op_snp_cache_mb": 256,
+    }
+
+    (info,) = platform._get_plt_list("SNP_S", result_config)
+
+    assert info["cache_dir"] == f"{tmp_path / 'Result' / 'SNP_Cache'}{SL}"
+    assert info["cache_mb"] == 256
+
+
+def test_get_plt_list_enables_plot_reuse_when_configured(platform_factory, tmp_path):
+    result_dir = tmp_path / "Result" / "SNP_S"
+    result_dir.mkdir(parents=True)
+    (result_dir / "SIM_A__S.s2p").write_text("touchstone", encoding="utf-8")
+    platform = platform_factory(lg=Mock(spec=logging.Logger))
+    result_config = {
+        "result_sub_dirs": {"SNP_S": f"{result_dir}{SL}"},
+        "plot_dir": f"{tmp_path}{SL}",
+        "checked_keys": ["SIM_A"],
+        "spectype": {"SIM_A": {}},
+        "CONNECTIVITY": {"SIM_A": {}},
+        "op_plot_reuse": 1,
+    }
+
+    (info,) = platform._get_plt_list("SNP_S", result_config)
+
+    assert info["plot_reuse"] is True
+
+
+def test_get_plt_list_passes_the_optional_touchstone_settings_when_configured(
+    platform_factory, tmp_path
+):
+    result_dir = tmp_path / "Result" / "SNP_S"
+    result_dir.mkdir(parents=True)
+    (result_dir / "SIM_A__S.s4p").write_text("touchstone", encoding="utf-8")
+    platform = platform_factory(lg=Mock(spec=logging.Logger))
+    result_config = {
+        "result_sub_dirs": {"SNP_S": f"{result_dir}{SL}"},
+        "plot_dir": f"{tmp_path}{SL}",
+        "checked_keys": ["SIM_A"],
+        "spectype": {"SIM_A": {}},
+        "CONNECTIVITY": {"SIM_A": {}},
+        "op_mm_settings": {"quadrants": "needed", "write_snp": "async"},
+        "op_plot_workers": 4,
+        "op_export": 1,
+        "op_mask_plot": 0,
+        "op_precision": "single",
+    }
+
+    (info,) = platform._get_plt_list("SNP_S", result_config)
+    (quick_info,) = platform._get_plt_list("SNP_S", {**result_config, "quick_look": True})
+
+    assert info["mm_settings"] == {"quadrants": "needed", "write_snp": "async"}
+    assert info["plot_workers"] == 4
+    assert info["curve_export"] is True
+    assert info["mask_plot"] is False
+    assert info["precision"] == "single"
+    assert "plot_reuse" not in info and "quick_look" not in info
+    assert quick_info["quick_look"] is True
+    assert "curve_export" not in quick_info
+
+
 def test_snp_plot_xtract_processes_touchstones_and_keys_output_by_touchstone_name(
     monkeypatch, platform_factory
 ):
@@ -460,7 +536,7 @@ def test_snp_plot_xtract_processes_touchstones_and_keys_output_by_touchstone_nam
 
     output = platform._Platform__snp_plot_xtract("SNP_S", {"result_sub_dirs": {}})
 
-    from_list.assert_called_once_with(plot_list)
+    from_list.assert_called_once_with(plot_list, stream=True)
     assert output == {
         "SNP_S__SIM_A": {"IL": [["a", "a.png"]]},
         "SNP_S__SIM_B": {"RL": [["b", "b.png"]]},
@@ -469,6 +545,101 @@ def test_snp_plot_xtract_processes_touchstones_and_keys_output_by_touchstone_nam
     second.auto_process.assert_called_once_with()
 
 
+class _InlinePool:
+    """Process-pool double that runs tasks in order in the calling process."""
+
+    instances = []
+
+    def __init__(self, max_workers, initializer):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        _InlinePool.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, function, items):
+        return [function(item) for item in items]
+
+
+def test_snp_plot_xtract_parallel_mode_keeps_plot_list_order(monkeypatch, platform_factory):
+    platform = platform_factory()
+    plot_list = [
+        {"file_dir": "b.s2p", "key_name": "SNP_S__SIM_B"},
+        {"file_dir": "a.s2p", "key_name": "SNP_S__SIM_A"},
+        {"file_dir": "c.s2p", "key_name": "SNP_S__SIM_C"},
+    ]
+    monkeypatch.setattr(platform, "_get_plt_list", Mock(return_value=plot_list))
+    monkeypatch.setattr(
+        sipi_infra, "_auto_process_snp", lambda info: (info["key_name"], {"IL": info["file_dir"]})
+    )
+    from_list = Mock()
+    monkeypatch.setattr(sipi_infra.TouchStone, "from_list", from_list)
+    _InlinePool.instances = []
+    monkeypatch.setattr(sipi_infra, "ProcessPoolExecutor", _InlinePool)
+
+    output = platform._Platform__snp_plot_xtract("SNP_S", {"op_snp_workers": 8})
+
+    assert list(output.items()) == [
+        ("SNP_S__SIM_B", {"IL": "b.s2p"}),
+        ("SNP_S__SIM_A", {"IL": "a.s2p"}),
+        ("SNP_S__SIM_C", {"IL": "c.s2p"}),
+    ]
+    assert [pool.max_workers for pool in _InlinePool.instances] == [3]
+    assert _InlinePool.instances[0].initializer is sipi_infra._init_snp_worker
+    from_list.assert_not_called()
+
+
+def test_snp_plot_xtract_single_worker_stays_in_process(monkeypatch, platform_factory):
+    platform = platform_factory()
+    monkeypatch.setattr(platform, "_get_plt_list", Mock(return_value=[{"file_dir": "a.s2p"}]))
+    only = Mock(key_name="SNP_S__SIM_A")
+    only.auto_process.return_value = {"IL": []}
+    monkeypatch.setattr(sipi_infra.TouchStone, "from_list", Mock(return_value=[only]))
+    pool = Mock()
+    monkeypatch.setattr(sipi_infra, "ProcessPoolExecutor", pool)
+
+    output = platform._Platform__snp_plot_xtract("SNP_S", {"op_snp_workers": 4})
+
+    assert output == {"SNP_S__SIM_A": {"IL": []}}
+    pool.assert_not_called()
+
+
+def test_snp_plot_xtract_stacks_same_grid_files_when_a_batch_cap_is_set(
+    monkeypatch, platform_factory
+):
+    platform = platform_factory()
+    plot_list = [{"file_dir": "a.s2p"}, {"file_dir": "b.s2p"}]
+    monkeypatch.setattr(platform, "_get_plt_list", Mock(return_value=plot_list))
+    process_list = Mock(return_value={"SNP_S__SIM_A": {"IL": []}})
+    monkeypatch.setattr(sipi_infra.SnpBatch, "process_list", process_list)
+    from_list = Mock()
+    monkeypatch.setattr(sipi_infra.TouchStone, "from_list", from_list)
+
+    output = platform._Platform__snp_plot_xtract("SNP_S", {"op_snp_batch_mb": 64})
+
+    assert output == {"SNP_S__SIM_A": {"IL": []}}
+    process_list.assert_called_once_with(plot_list, 64)
+    from_list.assert_not_called()
+
+
+def test_auto_process_snp_builds_one_touchstone_and_returns_its_output(monkeypatch):
+    touchstone = Mock(key_name="SNP_S__SIM_A")
+    touchstone.auto_process.return_value = {"ZOPEN": [["zin", "zin.png", "", "1", "2"]]}
+    factory = Mock(return_value=touchstone)
+    monkeypatch.setattr(sipi_infra, "TouchStone", factory)
+    info = {"file_dir": "a.s2p"}
+
+    assert sipi_infra._auto_process_snp(info) == (
+        "SNP_S__SIM_A",
+        {"ZOPEN": [["zin", "zin.png", "", "1", "2"]]},
+    )
+    factory.assert_called_once_with(info, lazy=True)
+
+
 def test_process_snp_loads_config_and_processes_each_result_subdirectory(
     monkeypatch, platform_factory
 ):
@@ -491,6 +662,111 @@ def test_process_snp_loads_config_and_processes_each_result_subdirectory(
     ]
 
 
+def test_process_snp_exports_the_curves_and_values_of_the_run_when_asked(
+    monkeypatch, platform_factory, tmp_path
+):
+    platform = platform_factory()
+    plot_dir = f"{tmp_path}{SL}Run_A{SL}Report{SL}Plot{SL}"
+    ResultExport.save_shard(
+        ResultExport.get_shard_dir(plot_dir, "SNP_S__SIM_A__ZOPEN__Port1"),
+        [1.0, 2.0],
+        [[0.5, 0.25]],
+        ["Port1"],
+    )
+    ResultExport.save_shard(
+        ResultExport.get_shard_dir(plot_dir, "SNP_S__SIM_A__IL_MM__SDD"), [1.0], [[-1.0]], ["SDD21"]
+    )
+    ResultExport.save_shard(
+        ResultExport.get_shard_dir(plot_dir, "SNP_S__SIM_A__ZMASK__Port1"),
+        [1.0],
+        [[0.5], [0.1]],
+        ["Port1", "Mask"],
+    )
+    output = {
+        "ZOPEN": [["SNP_S__SIM_A__ZOPEN__Port1", "z.png", "", "12.00", "3.00"]],
+        "IL_MM": {"DD": [["SNP_S__SIM_A__IL_MM__SDD", "il.png"]]},
+        "ZMASK": [["SNP_S__SIM_A__ZMASK__Port1", "", "FAIL", "-13.98", "1"]],
+    }
+    result_config = {"result_sub_dirs": {"SNP_S": "/s/"}, "plot_dir": plot_dir, "op_export": 1}
+    monkeypatch.setattr(sipi_infra, "load_yaml_to_dict", Mock(return_value=result_config))
+    monkeypatch.setattr(sipi_infra, "expand_home_dir", lambda path: path)
+    monkeypatch.setattr(
+        platform, "_Platform__snp_plot_xtract", Mock(return_value={"SNP_S__SIM_A": output})
+    )
+
+    platform.process_snp("result.yaml")
+
+    export_dir = f"{tmp_path}{SL}Run_A{SL}Report{SL}Export{SL}"
+    x, y = ResultExport.read_curve(export_dir, "SIM_A", "IL_MM", "SDD21")
+    assert x.tolist() == [1.0] and y.tolist() == [-1.0]
+    assert ResultExport.read_index(export_dir)["run"].tolist() == ["Run_A"] * 4
+    scalar = ResultExport.read_scalar(export_dir)
+    assert scalar[["prockey", "port", "quantity"]].tolist() == [
+        ("ZOPEN", "Port1", "L_pH"),
+        ("ZOPEN", "Port1", "C_nF"),
+        ("ZMASK", "Port1", "pass"),
+        ("ZMASK", "Port1", "margin_dB"),
+        ("ZMASK", "Port1", "margin_freq_GHz"),
+    ]
+    assert scalar["value"].tolist() == [12.0, 3.0, 0.0, -13.98, 1.0]
+
+
+def test_process_snp_fits_a_model_per_touchstone_and_keeps_up_to_date_ones(
+    monkeypatch, platform_factory, tmp_path
+):
+    platform = platform_factory()
+    result_dir = tmp_path / "Result" / "SNP_S"
+    result_dir.mkdir(parents=True)
+    f = rf.Frequency.from_f(np.linspace(1e6, 1e9, 50), unit="Hz")
+    rf.Network(frequency=f, s=np.full((50, 1, 1), 0.5 + 0j), z0=50).write_touchstone(
+        str(result_dir / "SIM_A__S")
+    )
+    result_config = {
+        "result_sub_dirs": {"SNP_S": f"{result_dir}{SL}"},
+        "plot_dir": f"{tmp_path}{SL}Plot{SL}",
+        "checked_keys": ["SIM_A"],
+        "spectype": {"SIM_A": {"POST_PROCESS_KEY": []}},
+        "CONNECTIVITY": {"SIM_A": {}},
+        "op_vf_settings": {"n_poles_real": 1, "n_poles_cmplx": 0},
+    }
+    monkeypatch.setattr(sipi_infra, "load_yaml_to_dict", Mock(return_value=result_config))
+    monkeypatch.setattr(platform, "_Platform__snp_plot_xtract", Mock(return_value={}))
+    fit = Mock(wraps=PoleResidueModel.fit)
+    monkeypatch.setattr(PoleResidueModel, "fit", fit)
+
+    platform.process_snp("result.yaml")
+    platform.process_snp("result.yaml")
+
+    model_dir = tmp_path / "Result" / "Pole_Residue" / "SNP_S" / "SIM_A__S.npz"
+    model = PoleResidueModel.load(str(model_dir))
+    np.testing.assert_allclose(model.get_s([2e8]), [[[0.5]]], atol=1e-9)
+    fit.assert_called_once()
+    assert fit.call_args.kwargs == {"n_poles_real": 1, "n_poles_cmplx": 0}
+
+
+def test_quick_look_process_snp_only_draws_the_figures(monkeypatch, platform_factory):
+    platform = platform_factory()
+    result_config = {
+        "result_sub_dirs": {"SNP_S": "/r/SNP_S/"},
+        "op_vf_settings": {"n_poles_real": 1},
+        "op_export": 1,
+    }
+    monkeypatch.setattr(sipi_infra, "load_yaml_to_dict", Mock(return_value=result_config))
+    monkeypatch.setattr(sipi_infra, "expand_home_dir", lambda path: path)
+    plot_xtract = Mock(return_value={"SIM_A": {}})
+    fit_models = Mock()
+    export_results = Mock()
+    monkeypatch.setattr(platform, "_Platform__snp_plot_xtract", plot_xtract)
+    monkeypatch.setattr(platform, "_Platform__fit_models", fit_models)
+    monkeypatch.setattr(platform, "_Platform__export_results", export_results)
+
+    assert platform.process_snp("result.yaml", quick_look=True) == {"SNP_S": {"SIM_A": {}}}
+
+    assert plot_xtract.call_args.args[1]["quick_look"] is True
+    fit_models.assert_not_called()
+    export_results.assert_not_called()
+
+
 def _report_config(report_type, output_path):
     return {
         "report_type": report_type,
@@ -677,6 +953,35 @@ def test_html_generator_renders_through_mocked_jinja_environment(
     assert output_path.read_text(encoding="utf-8") == "<html>report</html>"
 
 
+def test_pdn_html_template_renders_the_mask_results_with_and_without_figures(
+    platform_factory, tmp_path
+):
+    template_dir = f"{Path(sipi_infra.__file__).parent / 'templates'}{SL}"
+    platform = platform_factory(TEMPLATE_DIR=template_dir)
+    output_path = tmp_path / "report.html"
+    result_dict = {
+        "SNP_S": {
+            "SIM_A": {
+                "ZOPEN": [["SIM_A_ZOPEN", "png-a", "1.0", "20", "3.3"]],
+                "ZMASK": [
+                    ["SIM_A_MASK_Port1", "png-b", "PASS", "1.50", "0.1"],
+                    ["SIM_A_MASK_Port2", "", "FAIL", "-2.00", "0.3"],
+                ],
+            }
+        }
+    }
+
+    platform._Platform__gen_pdn_html_report(
+        [], result_dict, {"company_logo": "logo"}, str(output_path)
+    )
+
+    html = output_path.read_text(encoding="utf-8")
+    assert "<th>Margin (dB)</th>" in html
+    assert "<td>PASS</td>" in html and "<td>-2.00</td>" in html
+    assert "href=#SIM_A_MASK_Port1" in html and "name=SIM_A_MASK_Port1" in html
+    assert "href=#SIM_A_MASK_Port2" not in html and "name=SIM_A_MASK_Port2" not in html
+
+
 def test_convert_html_to_pdf_uses_hardened_command_without_running_wkhtmltopdf(
     monkeypatch, platform_factory, tmp_path
 ):
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the stacked same-grid post-processing."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import skrf as rf
+
+import opensipi.touchstone as touchstone_module
+from opensipi.snp_batch import SnpBatch
+from opensipi.touchstone import TouchStone
+from opensipi.util.common import SL
+
+SPEC = {"POST_PROCESS_KEY": ["ZOPEN", "ZSHORT", "IL", "RL", "TDR"]}
+Z_SPEC = {"POST_PROCESS_KEY": ["ZOPEN", "ZSHORT"]}
+CONN = {"ZIN": [1, 2], "IL": [[1, 3], [2, 4]], "RL": [1, 4], "TDR": [[1], [3]]}
+
+
+def _write_snp(dir_path, name, seed, f=None):
+    rng = np.random.default_rng(seed)
+    f = np.logspace(2, 9, 40) if f is None else f
+    s = 0.2 * (rng.standard_normal((len(f), 4, 4)) + 1j * rng.standard_normal((len(f), 4, 4)))
+    s = (s + s.transpose(0, 2, 1)) / 2
+    nw = rf.Network(frequency=rf.Frequency.from_f(f, unit="Hz"), s=s, z0=50, name=name)
+    nw.write_touchstone(filename=name, dir=str(dir_path))
+    return str(dir_path / (name + ".s4p"))
+
+
+def _info_list(tmp_path, plt_name, seed_list, **info):
+    plt_dir = tmp_path / plt_name
+    plt_dir.mkdir(exist_ok=True)
+    info_list = []
+    for seed in seed_list:
+        name = "SIM_" + str(seed) + "__S"
+        file_dir = str(tmp_path / (name + ".s4p"))
+        info_list.append(
+            {
+                "file_dir": file_dir,
+                "key_name": "SNP_S__SIM_" + str(seed),
+                "plt_dir": f"{plt_dir}{SL}",
+                "spec_type": SPEC,
+                "conn_dict": CONN,
+                **info,
+            }
+        )
+    return info_list
+
+
+def _serial(info_list):
+    output_dict = {}
+    for ts in TouchStone.from_list(info_list, stream=True):
+        output_dict[ts.key_name] = ts.auto_process()
+    return output_dict
+
+
+def test_stacked_outputs_and_figures_match_the_serial_loop(tmp_path):
+    for seed in (3, 1):
+        _write_snp(tmp_path, "SIM_" + str(seed) + "__S", seed)
+    _write_snp(tmp_path, "SIM_4__S", 4, f=np.logspace(2, 9, 30))
+
+    expected = _serial(_info_list(tmp_path, "serial", [3, 4, 1]))
+    output = SnpBatch.process_list(_info_list(tmp_path, "batch", [3, 4, 1]), 64)
+
+    assert list(output) == list(expected)
+    assert str(output).replace(f"batch{SL}", f"serial{SL}") == str(expected)
+    for png in (tmp_path / "serial").glob("*.png"):
+        assert (tmp_path / "batch" / png.name).read_bytes() == png.read_bytes()
+
+
+def test_stacks_are_flushed_at_the_size_cap(monkeypatch, tmp_path):
+    for seed in (1, 2, 3):
+        _write_snp(tmp_path, "SIM_" + str(seed) + "__S", seed)
+    size_list = []
+
+    class RecordingBatch(SnpBatch):
+        def __init__(self, ts_list):
+            super().__init__(ts_list)
+            size_list.append(len(ts_list))
+
+    # two 40x4x4 complex matrices fill the cap
+    RecordingBatch.process_list(
+        _info_list(tmp_path, "plot", [1, 2, 3], spec_type=Z_SPEC), 2 * 40 * 16 * 16 / 2**20
+    )
+
+    assert size_list == [2, 1]
+
+
+def test_signature_separates_what_cannot_share_a_stack(tmp_path):
+    _write_snp(tmp_path, "SIM_1__S", 1)
+    _write_snp(tmp_path, "SIM_2__S", 2, f=np.logspace(2, 9, 30))
+    first, other_grid = TouchStone.from_list(_info_list(tmp_path, "plot", [1, 2]), stream=False)
+    other_zin = TouchStone(
+        {**_info_list(tmp_path, "plot", [1])[0], "conn_dict": {**CONN, "ZIN": [1]}}, lazy=True
+    )
+    tdr_only = TouchStone(
+        {**_info_list(tmp_path, "plot", [1])[0], "spec_type": {"POST_PROCESS_KEY": ["TDR"]}},
+        lazy=True,
+    )
+
+    assert SnpBatch.get_signature(first) != SnpBatch.get_signature(other_grid)
+    assert SnpBatch.get_signature(first) != SnpBatch.get_signature(other_zin)
+    assert SnpBatch.get_signature(tdr_only) is None
+
+
+def test_fully_reused_files_are_never_read(monkeypatch, tmp_path):
+    for seed in (1, 2):
+        _write_snp(tmp_path, "SIM_" + str(seed) + "__S", seed)
+    info_list = _info_list(tmp_path, "plot", [1, 2], spec_type=Z_SPEC, plot_reuse=True)
+    expected = SnpBatch.process_list(info_list, 64)
+    monkeypatch.setattr(
+        touchstone_module, "read_touchstone", Mock(side_effect=AssertionError("read"))
+    )
+
+    assert SnpBatch.process_list(info_list, 64) == expected
+
+
+@pytest.mark.parametrize("key", ["ZOPEN", "ZSHORT"])
+def test_only_files_missing_a_manifest_entry_are_stacked(monkeypatch, tmp_path, key):
+    for seed in (1, 2):
+        _write_snp(tmp_path, "SIM_" + str(seed) + "__S", seed)
+    info_list = _info_list(tmp_path, "plot", [1, 2], spec_type=Z_SPEC, plot_reuse=True)
+    expected = SnpBatch.process_list(info_list, 64)
+    (tmp_path / "plot" / ("SNP_S__SIM_2__" + key + "__Port1.png")).unlink()
+    solve = Mock(side_effect=TouchStone.solve_z_self)
+    monkeypatch.setattr(TouchStone, "solve_z_self", solve)
+
+    assert SnpBatch.process_list(info_list, 64) == expected
+    solve.assert_called_once()
+    assert solve.call_args.args[0].shape[0] == 1
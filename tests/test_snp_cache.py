@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the binary touchstone cache."""
+
+import os
+from unittest.mock import Mock
+
+import numpy as np
+import skrf as rf
+
+import opensipi.snp_cache as snp_cache_module
+from opensipi.snp_cache import SnpCache
+from opensipi.snp_reader import read_touchstone
+from opensipi.util.common import SL
+
+
+def _write_snp(directory, name="SIM_A__S", port_count=2, offset=0.0):
+    frequency = rf.Frequency.from_f([1e6, 1e7, 1e8], unit="Hz")
+    s = np.full((3, port_count, port_count), 0.1 + offset, dtype=complex)
+    network = rf.Network(frequency=frequency, s=s, z0=50, name=name)
+    network.write_touchstone(filename=name, dir=str(directory))
+    return str(directory / f"{name}.s{port_count}p")
+
+
+def _count_parses(monkeypatch):
+    parse = Mock(side_effect=read_touchstone)
+    monkeypatch.setattr(snp_cache_module, "read_touchstone", parse)
+    return parse
+
+
+def test_load_parses_once_then_serves_an_identical_network(monkeypatch, tmp_path):
+    snp = _write_snp(tmp_path)
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+    direct = rf.Network(snp)
+    parse = _count_parses(monkeypatch)
+
+    first = cache.load(snp)
+    second = cache.load(snp)
+
+    parse.assert_called_once_with(snp)
+    assert os.path.exists(cache.get_entry_dir(snp))
+    for network in (first, second):
+        np.testing.assert_array_equal(network.f, direct.f)
+        np.testing.assert_array_equal(network.s, direct.s)
+        np.testing.assert_array_equal(network.z0, direct.z0)
+        assert network.name == direct.name
+
+
+def test_single_precision_is_served_from_the_double_precision_entry(tmp_path):
+    snp = _write_snp(tmp_path)
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+
+    first = cache.load(snp, precision="single")
+    second = cache.load(snp)
+
+    assert first.s.dtype == np.complex64
+    assert second.s.dtype == np.complex128
+    np.testing.assert_array_equal(second.s, rf.Network(snp).s)
+
+
+def test_changed_content_invalidates_the_entry(monkeypatch, tmp_path):
+    snp = _write_snp(tmp_path)
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+    cache.load(snp)
+    _write_snp(tmp_path, offset=0.2)
+
+    network = cache.load(snp)
+
+    np.testing.assert_allclose(network.s, 0.3)
+
+
+def test_touched_file_with_same_content_is_still_served_from_cache(monkeypatch, tmp_path):
+    snp = _write_snp(tmp_path)
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+    cache.load(snp)
+    stat = os.stat(snp)
+    os.utime(snp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    parse = _count_parses(monkeypatch)
+
+    network = cache.load(snp)
+
+    parse.assert_not_called()
+    np.testing.assert_allclose(network.s, 0.1)
+
+
+def test_same_file_name_in_two_folders_gets_two_entries(tmp_path):
+    first_dir = tmp_path / "SNP_S"
+    second_dir = tmp_path / "SNP_DCfitted"
+    first_dir.mkdir()
+    second_dir.mkdir()
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+
+    assert cache.get_entry_dir(_write_snp(first_dir)) != cache.get_entry_dir(_write_snp(second_dir))
+
+
+def test_evict_removes_least_recently_used_entries_first(tmp_path):
+    cache_dir = tmp_path / "SNP_Cache"
+    cache = SnpCache(f"{cache_dir}{SL}", 64)
+    snps = [_write_snp(tmp_path, name=f"SIM_{index}__S") for index in range(3)]
+    for index, snp in enumerate(snps):
+        cache.load(snp)
+        entry = cache.get_entry_dir(snp)
+        os.utime(entry, (1_000 + index, 1_000 + index))
+    entry_size = os.path.getsize(cache.get_entry_dir(snps[0]))
+    cache.cap_bytes = 2 * entry_size
+
+    cache.evict()
+
+    assert not os.path.exists(cache.get_entry_dir(snps[0]))
+    assert os.path.exists(cache.get_entry_dir(snps[1]))
+    assert os.path.exists(cache.get_entry_dir(snps[2]))
+
+
+def test_corrupt_entry_is_rebuilt(tmp_path):
+    snp = _write_snp(tmp_path)
+    cache = SnpCache(f"{tmp_path / 'SNP_Cache'}{SL}", 64)
+    with open(cache.get_entry_dir(snp), "wb") as entry:
+        entry.write(b"not an npz")
+
+    network = cache.load(snp)
+
+    np.testing.assert_allclose(network.s, 0.1)
+    with np.load(cache.get_entry_dir(snp)) as entry:
+        assert int(entry["src_size"]) == os.path.getsize(snp)
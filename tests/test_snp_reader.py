@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the vectorized touchstone reader."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import skrf as rf
+
+import opensipi.snp_reader as snp_reader_module
+from opensipi.snp_reader import read_touchstone
+
+
+def _random_network(port_count, name, seed=0):
+    rng = np.random.default_rng(seed)
+    frequency = rf.Frequency.from_f([1e6, 1e7, 1e8, 1e9], unit="Hz")
+    shape = (4, port_count, port_count)
+    s = 0.4 * (rng.standard_normal(shape) + 1j * rng.standard_normal(shape))
+    return rf.Network(frequency=frequency, s=s, z0=50, name=name)
+
+
+def _assert_same_network(network, expected):
+    np.testing.assert_allclose(network.f, expected.f)
+    np.testing.assert_allclose(network.s, expected.s, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(network.z0, expected.z0)
+    assert network.name == expected.name
+
+
+@pytest.mark.parametrize("port_count", [1, 2, 3, 4])
+@pytest.mark.parametrize("form", ["ri", "ma", "db"])
+def test_read_matches_scikit_rf_for_version_1_files(tmp_path, port_count, form):
+    name = f"SIM_{form}"
+    _random_network(port_count, name, seed=port_count).write_touchstone(
+        filename=name, dir=str(tmp_path), form=form
+    )
+    snp = str(tmp_path / f"{name}.s{port_count}p")
+
+    _assert_same_network(read_touchstone(snp), rf.Network(snp))
+
+
+def test_read_handles_wrapped_rows_units_and_port_names(tmp_path):
+    snp = tmp_path / "wrapped.s3p"
+    snp.write_text(
+        "! Port[1] = VDD\n! Port[2] = VSS\n! Port[3] = SNS\n"
+        "# MHz S RI R 50\n"
+        "1 0.1 0.0 0.2 0.0 0.3 0.0 ! row one\n"
+        "  0.4 0.0 0.5 0.0 0.6 0.0\n"
+        "  0.7 0.0 0.8 0.0 0.9 0.0\n"
+        "2 0.1 0.1 0.2 0.1 0.3 0.1 0.4 0.1 0.5 0.1 0.6 0.1 0.7 0.1 0.8 0.1 0.9 0.1\n"
+    )
+
+    network = read_touchstone(str(snp))
+
+    _assert_same_network(network, rf.Network(str(snp)))
+    np.testing.assert_allclose(network.f, [1e6, 2e6])
+    np.testing.assert_allclose(network.s[0].real, np.arange(1, 10).reshape(3, 3) / 10)
+    assert network.port_names == ["VDD", "VSS", "SNS"]
+
+
+def test_read_converts_normalized_version_1_impedance(tmp_path):
+    snp = tmp_path / "param_z.s2p"
+    snp.write_text(
+        "# GHz Z RI R 25\n"
+        "1 0.5 0.1 0.2 0.0 0.2 0.0 0.7 -0.1\n"
+        "2 0.6 0.2 0.1 0.0 0.1 0.0 0.8 -0.2\n"
+        "3 0.7 0.3 0.3 0.1 0.3 0.1 0.9 -0.3\n"
+    )
+
+    network = read_touchstone(str(snp))
+
+    # more frequencies than ports, so a mis-broadcast reference would show
+    _assert_same_network(network, rf.Network(str(snp)))
+    assert network.s.shape == (3, 2, 2)
+
+
+@pytest.mark.parametrize("matrix_format", ["Full", "Lower", "Upper"])
+def test_read_matches_scikit_rf_for_version_2_matrix_formats(tmp_path, matrix_format):
+    value = {
+        "Full": "0.1 0 0.2 0 0.3 0 0.2 0 0.4 0 0.5 0 0.3 0 0.5 0 0.6 0",
+        "Lower": "0.1 0 0.2 0 0.4 0 0.3 0 0.5 0 0.6 0",
+        "Upper": "0.1 0 0.2 0 0.3 0 0.4 0 0.5 0 0.6 0",
+    }[matrix_format]
+    ts = tmp_path / f"v2_{matrix_format}.ts"
+    ts.write_text(
+        "[Version] 2.0\n# GHz S RI R 50\n[Number of Ports] 3\n"
+        f"[Number of Frequencies] 2\n[Matrix Format] {matrix_format}\n"
+        "[Reference] 50 25\n75\n[Network Data]\n"
+        f"1 {value}\n2 {value}\n[End]\n"
+    )
+
+    network = read_touchstone(str(ts))
+
+    _assert_same_network(network, rf.Network(str(ts)))
+    np.testing.assert_allclose(network.z0[0], [50, 25, 75])
+    np.testing.assert_allclose(network.s[0], network.s[0].T)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "# GHz S MA R 50\n1 0.5 0 0.1 0 0.1 0 0.5 0\n2 0.5 0 0.1 0 0.1 0 0.5 0\n1 1.2 0.3 20 0.4\n",
+        "# GHz Y RI R 50\n1 0.5 0 0.1 0 0.1 0 0.5 0\n",
+        "# GHz H RI R 50\n1 0.5 0 0.1 0 0.1 0 0.5 0\n",
+    ],
+    ids=["noise", "admittance", "hybrid"],
+)
+def test_read_leaves_unhandled_content_to_scikit_rf(monkeypatch, tmp_path, text):
+    snp = tmp_path / "other.s2p"
+    snp.write_text(text)
+    fallback = Mock(return_value="scikit-rf network")
+    monkeypatch.setattr(snp_reader_module.rf, "Network", fallback)
+
+    assert read_touchstone(str(snp)) == "scikit-rf network"
+    fallback.assert_called_once_with(str(snp))
+
+
+def test_read_rejects_a_truncated_data_section(tmp_path):
+    snp = tmp_path / "truncated.s3p"
+    snp.write_text("# GHz S RI R 50\n1 0.1 0 0.2 0 0.3 0\n")
+
+    with pytest.raises(ValueError, match="not a whole number of frequency points"):
+        read_touchstone(str(snp))
+
+
+def test_single_precision_keeps_s_in_complex64_without_touching_the_source(tmp_path):
+    _random_network(3, "SIM_A").write_touchstone(filename="SIM_A", dir=str(tmp_path))
+    snp = str(tmp_path / "SIM_A.s3p")
+    double = read_touchstone(snp)
+
+    single = read_touchstone(snp, precision="single")
+
+    assert single.s.dtype == np.complex64 and double.s.dtype == np.complex128
+    assert single.s_db.dtype == np.float32
+    np.testing.assert_allclose(single.s, double.s, rtol=1e-6)
+    np.testing.assert_array_equal(single.z0, double.z0)
+    assert snp_reader_module.set_precision(double, "single").s is not double.s
+    with pytest.raises(ValueError, match="neither double nor single"):
+        snp_reader_module.set_precision(double, "half")
+
+
+@pytest.mark.parametrize("port_count", [2, 3, 6])
+def test_row_subset_matches_the_full_read_at_the_picked_rows(tmp_path, port_count):
+    rng = np.random.default_rng(1)
+    f = np.r_[0.0, np.geomspace(1e3, 1e9, 999)]
+    shape = (len(f), port_count, port_count)
+    s = 0.4 * (rng.standard_normal(shape) + 1j * rng.standard_normal(shape))
+    network = rf.Network(frequency=rf.Frequency.from_f(f, unit="Hz"), s=s, z0=50)
+    network.write_touchstone(filename="SIM_A", dir=str(tmp_path))
+    snp = str(tmp_path / f"SIM_A.s{port_count}p")
+    full = read_touchstone(snp)
+    row_index = snp_reader_module.get_row_index(full.f, 50)
+
+    subset = read_touchstone(snp, n_row=50)
+
+    assert row_index[0] == 0 and row_index[-1] == len(f) - 1
+    assert 45 <= len(row_index) <= 52
+    assert np.all(np.diff(row_index) > 0)
+    np.testing.assert_allclose(subset.f, full.f[row_index])
+    np.testing.assert_allclose(subset.s, full.s[row_index], rtol=1e-9, atol=1e-12)
+    assert subset.name == full.name
+    np.testing.assert_array_equal(snp_reader_module.get_row_index(f[:10], 50), np.arange(10))
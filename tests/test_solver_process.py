@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: Copyright (c) Meta Platforms, Inc. and affiliates.
+# SPDX-FileCopyrightText: © 2024 Rivos Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hermetic tests for the PID-tracked solver processes."""
+
+import os
+import select
+import shlex
+import subprocess
+import sys
+import time
+
+import pytest
+
+from opensipi.solver_process import SolverProcess
+
+
+def _command(script):
+    argv = [sys.executable, "-c", script]
+    return subprocess.list2cmdline(argv) if os.name == "nt" else shlex.join(argv)
+
+
+def test_sample_measures_the_launched_tree_until_it_exits():
+    child = "import time; time.sleep(1)"
+    solver = SolverProcess(
+        _command(f"import subprocess, sys; subprocess.run([sys.executable, '-c', {child!r}])")
+    ).launch()
+
+    sample = solver.sample()
+    while len(sample["pid_list"]) < 2 and solver.poll() is None:
+        sample = solver.sample()
+
+    assert solver.popen.pid in sample["pid_list"] and len(sample["pid_list"]) >= 2
+    assert sample["exit_code"] is None
+    assert sample["rss_mb"] > 0 and sample["cpu_time"] >= 0
+    assert solver.is_alive()
+    solver.popen.wait(30)
+    assert solver.sample() == {"pid_list": [], "exit_code": 0, "cpu_time": 0.0, "rss_mb": 0.0}
+    assert not solver.is_alive()
+    solver.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="no pidfd on this OS")
+def test_exit_fd_turns_readable_when_the_solver_exits_and_launch_starts_it_again():
+    solver = SolverProcess(_command("raise SystemExit(3)")).launch()
+    first_pid = solver.popen.pid
+
+    assert select.select([solver.exit_fd], [], [], 30)[0] == [solver.exit_fd]
+    assert solver.poll() == 3
+    solver.launch()
+
+    assert solver.popen.pid != first_pid
+    assert solver.popen.wait(30) == 3
+    solver.close()
+    assert solver.exit_fd is None
+
+
+def _detach_command(child):
+    # the launcher starts the child outside its tree and exits at once
+    return _command(
+        "import subprocess, sys\n"
+        f"subprocess.Popen([sys.executable, '-c', {child!r}], start_new_session=True)\n"
+    )
+
+
+def test_a_solver_left_in_the_background_is_followed_through_its_pid_file(tmp_path):
+    pid_dir = f"{tmp_path / 'run.pid'}"
+    (tmp_path / "run.pid").write_text("1")  # left by an earlier launch
+    child = (
+        "import os, pathlib, time\n"
+        f"pathlib.Path({pid_dir!r}).write_text(str(os.getpid()))\n"
+        "time.sleep(2)\n"
+    )
+    solver = SolverProcess(_detach_command(child), pid_dir).launch()
+    solver.popen.wait(30)
+    tic = time.perf_counter()
+    while not os.path.exists(pid_dir) and time.perf_counter() - tic < 10:
+        time.sleep(0.05)
+    time.sleep(0.1)
+
+    sample = solver.sample()
+
+    assert solver.poll() == 0
+    assert solver.is_alive() and sample["pid_list"] == [int(open(pid_dir).read())]
+    time.sleep(3)
+    assert not solver.is_alive()
+    solver.close()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinked executable")
+def test_a_same_named_process_outside_the_tree_does_not_keep_the_solver_alive(tmp_path):
+    solver_exe = tmp_path / "fakesolver"
+    solver_exe.symlink_to(sys.executable)
+    other = subprocess.Popen([str(solver_exe), "-c", "import time; time.sleep(30)"])
+    try:
+        solver = SolverProcess(
+            _detach_command("import time; time.sleep(3)").replace(
+                shlex.quote(sys.executable), shlex.quote(str(solver_exe)), 1
+            ),
+            f"{tmp_path / 'run.pid'}",
+        ).launch()
+        solver.popen.wait(30)
+
+        assert not solver.is_alive()
+        assert other.poll() is None
+        solver.close()
+    finally:
+        other.kill()
+        other.wait()
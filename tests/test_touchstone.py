@@ -8,13 +8,16 @@
 import math
 from copy import deepcopy
 from types import SimpleNamespace
-from unittest.mock import Mock, call
+from unittest.mock import Mock
 
 import matplotlib
 import numpy as np
 import pytest
+import skrf as rf
 
 import opensipi.touchstone as touchstone_module
+from opensipi.plot_canvas import PlotCanvas
+from opensipi.result_export import ResultExport
 from opensipi.touchstone import TouchStone
 from opensipi.util.common import SL
 
@@ -37,7 +40,6 @@ class FakeNetwork:
         )
         self.number_of_ports = port_count
         self.frequency = SimpleNamespace(npoints=len(self.f))
-        self.time_step_calls = []
 
     def copy(self):
         return deepcopy(self)
@@ -52,9 +54,6 @@ class FakeNetwork:
         reduced.number_of_ports -= 1
         return reduced
 
-    def plot_z_time_step(self, output_port, input_port, label):
-        self.time_step_calls.append((output_port, input_port, label))
-
 
 class FakeConversionNetwork(FakeNetwork):
     def __init__(self, f, port_count=4):
@@ -74,108 +73,23 @@ class FakeConversionNetwork(FakeNetwork):
         self.write_calls.append(kwargs)
 
 
-class FakeTdrNetwork(FakeNetwork):
-    def __init__(self, f, port_count=4):
-        values = np.zeros((len(f), port_count, port_count))
-        super().__init__(f, s_db=values)
-        self.extrapolate_calls = []
-        self.resample_calls = []
-
-    def extrapolate_to_dc(self, kind):
-        extrapolated = self.copy()
-        extrapolated.extrapolate_calls.append(kind)
-        if extrapolated.f[0] > 0:
-            extrapolated.f = np.insert(extrapolated.f, 0, 0.0)
-            extrapolated.frequency = SimpleNamespace(npoints=len(extrapolated.f))
-        return extrapolated
-
-    def resample(self, frequencies):
-        self.resample_calls.append(list(frequencies))
-        self.f = np.asarray(frequencies, dtype=float)
-        self.frequency = SimpleNamespace(npoints=len(self.f))
-
-
-class LookupNetwork:
-    """Network double implementing scikit-rf's nearest-frequency string lookup."""
-
-    def __init__(self, frequencies, magnitudes, angles):
-        self.frequencies = np.asarray(frequencies, dtype=float)
-        self.magnitudes = np.asarray(magnitudes, dtype=float)
-        self.angles = np.asarray(angles, dtype=float)
-
-    def __getitem__(self, frequency):
-        target = float(frequency)
-        index = int(np.argmin(np.abs(self.frequencies - target)))
-        return SimpleNamespace(
-            f=np.asarray([self.frequencies[index]]),
-            z_mag=np.asarray([[[self.magnitudes[index]]]]),
-            z_rad_unwrap=np.asarray([[[self.angles[index]]]]),
-        )
-
-
-class SparseLookupNetwork:
-    """Return two same-side samples to exercise the interpolation warning path."""
-
-    def __getitem__(self, frequency):
-        if float(frequency) == 100.0:
-            sample = (80.0, 8.0, 0.8)
-        else:
-            sample = (90.0, 9.0, 0.9)
-        return SimpleNamespace(
-            f=np.asarray([sample[0]]),
-            z_mag=np.asarray([[[sample[1]]]]),
-            z_rad_unwrap=np.asarray([[[sample[2]]]]),
-        )
-
-
-class PyplotRecorder:
-    """Record plot semantics without creating GUI windows or image files."""
-
-    def __init__(self):
-        self.figures = []
-        self.plots = []
-        self.legend_count = 0
-        self.titles = []
-        self.xscales = []
-        self.yscales = []
-        self.xlabels = []
-        self.ylabels = []
-        self.grids = []
-        self.saved = []
-        self.close_count = 0
+def _z_network(frequencies, z_self):
+    """Build a network double holding complex self impedances and the matching S matrix."""
+    z_self = np.asarray(z_self, dtype=complex)
+    if z_self.ndim == 1:
+        z_self = z_self[:, np.newaxis]
+    port_count = z_self.shape[1]
+    z = np.zeros((len(frequencies), port_count, port_count), dtype=complex)
+    for port in range(port_count):
+        z[:, port, port] = z_self[:, port]
+    z0 = np.full((len(frequencies), port_count), 50.0)
+    return SimpleNamespace(f=np.asarray(frequencies, dtype=float), z=z, s=rf.z2s(z, z0), z0=z0)
 
-    def figure(self, **kwargs):
-        self.figures.append(kwargs)
 
-    def plot(self, *args, **kwargs):
-        self.plots.append((args, kwargs))
-
-    def legend(self):
-        self.legend_count += 1
-
-    def title(self, value):
-        self.titles.append(value)
-
-    def xscale(self, value):
-        self.xscales.append(value)
-
-    def yscale(self, value):
-        self.yscales.append(value)
-
-    def xlabel(self, value):
-        self.xlabels.append(value)
-
-    def ylabel(self, value):
-        self.ylabels.append(value)
-
-    def grid(self, **kwargs):
-        self.grids.append(kwargs)
-
-    def savefig(self, path):
-        self.saved.append(path)
-
-    def close(self):
-        self.close_count += 1
+def _fresh_canvas(monkeypatch):
+    canvas = PlotCanvas()
+    monkeypatch.setattr(touchstone_module, "_CANVAS", canvas)
+    return canvas
 
 
 def test_touchstone_tests_use_headless_agg_backend():
@@ -208,10 +122,8 @@ def test_init_loads_network_and_selects_supported_mixed_mode_processing(
 ):
     single_ended = FakeConversionNetwork([1e9, 2e9])
     mixed_mode = FakeConversionNetwork([1e9, 2e9])
-    short = object()
     converter = Mock(return_value=mixed_mode)
-    monkeypatch.setattr(touchstone_module.rf, "Network", Mock(return_value=single_ended))
-    monkeypatch.setattr(TouchStone, "_TouchStone__get_short_block", Mock(return_value=short))
+    monkeypatch.setattr(touchstone_module, "read_touchstone", Mock(return_value=single_ended))
     monkeypatch.setattr(TouchStone, "convert_snp_se2mm", converter)
     info = {
         "file_dir": str(tmp_path / "input.s4p"),
@@ -219,25 +131,50 @@ def test_init_loads_network_and_selects_supported_mixed_mode_processing(
         "plt_dir": f"{tmp_path}{SL}",
         "spec_type": {"POST_PROCESS_KEY": post_process_keys},
         "conn_dict": {"MM_ORDER_IN_SE": [0, 1, 2, 3]},
+        "mm_settings": {"cache": False},
     }
 
     touchstone = TouchStone(info)
 
-    touchstone_module.rf.Network.assert_called_once_with(info["file_dir"])
+    touchstone_module.read_touchstone.assert_called_once_with(info["file_dir"])
     np.testing.assert_array_equal(touchstone.f, np.asarray([1.0, 2.0]))
     assert touchstone.nw is single_ended
-    assert touchstone.short0 is short
     assert touchstone.port_num == 4
     assert touchstone.MM_KEY == ["IL_MM", "RL_MM"]
     assert touchstone.nw_mm is (mixed_mode if expects_conversion else single_ended)
     assert converter.call_count == int(expects_conversion)
 
 
+def test_init_loads_network_through_the_cache_when_one_is_given(monkeypatch, tmp_path):
+    network = FakeConversionNetwork([1e9, 2e9])
+    cache = Mock()
+    cache.return_value.load.return_value = network
+    direct = Mock()
+    monkeypatch.setattr(touchstone_module, "SnpCache", cache)
+    monkeypatch.setattr(touchstone_module, "read_touchstone", direct)
+    info = {
+        "file_dir": str(tmp_path / "input.s4p"),
+        "key_name": "SIM_A",
+        "plt_dir": f"{tmp_path}{SL}",
+        "spec_type": {"POST_PROCESS_KEY": ["IL"]},
+        "conn_dict": {},
+        "cache_dir": f"{tmp_path}{SL}SNP_Cache{SL}",
+        "cache_mb": 64,
+    }
+
+    touchstone = TouchStone(info)
+
+    cache.assert_called_once_with(info["cache_dir"], 64)
+    cache.return_value.load.assert_called_once_with(info["file_dir"])
+    direct.assert_not_called()
+    assert touchstone.nw is network
+
+
 def test_auto_process_dispatches_every_supported_key_with_network_data(touchstone_factory):
-    se_db = np.full((2, 4, 4), 11.0)
-    mm_db = np.full((2, 4, 4), 22.0)
-    single_ended = SimpleNamespace(s_db=se_db)
-    mixed_mode = SimpleNamespace(s_db=mm_db)
+    se_s = np.full((2, 4, 4), 0.1 + 0.1j)
+    mm_s = np.full((2, 4, 4), 0.2 + 0.2j)
+    single_ended = SimpleNamespace(s=se_s)
+    mixed_mode = SimpleNamespace(s=mm_s)
     keys = ["ZOPEN", "ZSHORT", "IL", "RL", "IL_MM", "RL_MM", "TDR", "TDR_MM"]
     connectivity = {
         "IL": [[1, 2]],
@@ -286,19 +223,65 @@ def test_auto_process_dispatches_every_supported_key_with_network_data(touchston
     }
     methods["ZOPEN"].assert_called_once_with("ZOPEN")
     methods["ZSHORT"].assert_called_once_with("ZSHORT")
-    methods["IL"].assert_called_once_with(connectivity["IL"], se_db, "IL")
-    methods["RL"].assert_called_once_with(connectivity["RL"], se_db, "RL")
-    methods["IL_MM"].assert_called_once_with(connectivity["IL_MM"], mm_db, "IL_MM")
-    methods["RL_MM"].assert_called_once_with(connectivity["RL_MM"], mm_db, "RL_MM")
+    methods["IL"].assert_called_once_with(connectivity["IL"], se_s, "IL")
+    methods["RL"].assert_called_once_with(connectivity["RL"], se_s, "RL")
+    methods["IL_MM"].assert_called_once_with(connectivity["IL_MM"], mm_s, "IL_MM")
+    methods["RL_MM"].assert_called_once_with(connectivity["RL_MM"], mm_s, "RL_MM")
     methods["TDR"].assert_called_once_with(connectivity["TDR"], single_ended, "TDR")
     methods["TDR_MM"].assert_called_once_with(connectivity["TDR_MM"], mixed_mode, "TDR_MM")
 
 
+def _reusing_touchstone(touchstone_factory, tmp_path, conn_dict):
+    snp = tmp_path / "SIM__S.s2p"
+    if not snp.exists():
+        snp.write_text("# GHz S RI R 50\n1 0 0 0 0 0 0 0 0\n")
+    touchstone = touchstone_factory(
+        file_dir=str(snp),
+        key_name="SNP_S__SIM",
+        plt_dir=f"{tmp_path}{SL}",
+        spec_type={"POST_PROCESS_KEY": ["ZOPEN"]},
+        conn_dict=conn_dict,
+        plot_reuse=True,
+    )
+
+    def plot_zself(prockey):
+        fig_dir = f"{tmp_path}{SL}SNP_S__SIM__ZOPEN__Port1.png"
+        with open(fig_dir, "w", encoding="utf-8") as f:
+            f.write("png of " + str(conn_dict))
+        return [["SNP_S__SIM__ZOPEN__Port1", fig_dir, "", "1.00", "2.00"]]
+
+    touchstone.plot_zself = Mock(side_effect=plot_zself)
+    return touchstone
+
+
+def test_auto_process_reuses_recorded_outputs_while_the_inputs_match(touchstone_factory, tmp_path):
+    first = _reusing_touchstone(touchstone_factory, tmp_path, {"ZIN": [1]})
+    expected = first.auto_process()
+    again = _reusing_touchstone(touchstone_factory, tmp_path, {"ZIN": [1]})
+    changed = _reusing_touchstone(touchstone_factory, tmp_path, {"ZIN": [1, 2]})
+
+    assert again.auto_process() == expected
+    again.plot_zself.assert_not_called()
+    changed.auto_process()
+    changed.plot_zself.assert_called_once_with("ZOPEN")
+    (tmp_path / "SIM__S.s2p").write_text("# GHz S RI R 50\n1 1 0 0 0 0 0 1 0\n")
+    edited = _reusing_touchstone(touchstone_factory, tmp_path, {"ZIN": [1, 2]})
+    edited.auto_process()
+    edited.plot_zself.assert_called_once_with("ZOPEN")
+
+
 def test_plot_zopen_uses_main_port_diagonals_and_formats_lc(touchstone_factory, tmp_path):
     z_mag = _diagonal_values(2, 4)
     network = FakeNetwork([1e6, 1e8], z_mag=z_mag)
     plot_zmag = Mock()
-    get_rlc = Mock(side_effect=[(1.0, 2.345, 3.456), (4.0, 5.678, 6.789)])
+    get_rlc = Mock(
+        return_value=(
+            np.asarray([1.0, 4.0]),
+            np.asarray([2.345, 5.678]),
+            np.asarray([3.456, 6.789]),
+            np.zeros((3, 2), dtype=bool),
+        )
+    )
     touchstone = touchstone_factory(
         file_dir="source.s4p",
         key_name="SIM",
@@ -309,6 +292,7 @@ def test_plot_zopen_uses_main_port_diagonals_and_formats_lc(touchstone_factory,
     )
     touchstone.plot_zmag = plot_zmag
     touchstone._TouchStone__get_rlc = get_rlc
+    touchstone.get_z_self = Mock(side_effect=lambda nw, ports: -nw.z_mag[:, ports, ports])
 
     result = touchstone.plot_zself("ZOPEN")
 
@@ -318,60 +302,225 @@ def test_plot_zopen_uses_main_port_diagonals_and_formats_lc(touchstone_factory,
     ]
     np.testing.assert_array_equal(plot_zmag.call_args_list[0].args[0][0][1], z_mag[:, 0, 0])
     np.testing.assert_array_equal(plot_zmag.call_args_list[1].args[0][0][1], z_mag[:, 1, 1])
-    assert get_rlc.call_args_list == [
-        call(get_rlc.call_args_list[0].args[0], 0, "source.s4p"),
-        call(get_rlc.call_args_list[1].args[0], 1, "source.s4p"),
-    ]
-    assert all(args.args[0].number_of_ports == 4 for args in get_rlc.call_args_list)
-
+    get_rlc.assert_called_once_with(network, [0, 1], "source.s4p")
+    touchstone.get_z_self.assert_called_once_with(network, [0, 1])
 
-def test_plot_zshort_terminates_aux_ports_from_last_to_first(
-    monkeypatch, touchstone_factory, tmp_path
-):
-    z_mag = _diagonal_values(2, 4)
-    network = FakeNetwork([1e6, 1e8], z_mag=z_mag)
-    short = object()
-    connections = []
-
-    def connect(network_to_reduce, port_index, short_block, short_port):
-        connections.append((network_to_reduce.number_of_ports, port_index, short_block, short_port))
-        return network_to_reduce.without_port(port_index)
 
-    monkeypatch.setattr(touchstone_module.rf, "connect", connect)
+def test_plot_zshort_shorts_every_aux_port_in_one_termination(touchstone_factory, tmp_path):
+    network = FakeNetwork([1e6, 1e8], z_mag=_diagonal_values(2, 4))
+    reduced = network.without_port(3).without_port(2)
+    terminate_ports = Mock(return_value=reduced)
     plot_zmag = Mock()
-    get_rlc = Mock(side_effect=[(1.234, 2.345, 3.0), (4.567, 5.678, 6.0)])
+    get_rlc = Mock(
+        return_value=(
+            np.asarray([1.234, 4.567]),
+            np.asarray([2.345, 5.678]),
+            np.asarray([3.0, 6.0]),
+            np.zeros((3, 2), dtype=bool),
+        )
+    )
     touchstone = touchstone_factory(
         file_dir="source.s4p",
         key_name="SIM",
         plt_dir=f"{tmp_path}{SL}",
         conn_dict={"ZIN": [1, 2]},
         nw=network,
-        short0=short,
         f=np.asarray([0.001, 0.1]),
     )
+    touchstone.terminate_ports = terminate_ports
     touchstone.plot_zmag = plot_zmag
     touchstone._TouchStone__get_rlc = get_rlc
+    touchstone.get_z_self = Mock(side_effect=lambda nw, ports: -nw.z_mag[:, ports, ports])
 
     result = touchstone.plot_zself_shortsns("ZSHORT")
 
-    assert connections == [(4, 3, short, 0), (3, 2, short, 0)]
+    terminate_ports.assert_called_once_with(network, [2, 3])
     assert result == [
         ["SIM__ZSHORT__Port1", str(tmp_path / "SIM__ZSHORT__Port1.png"), "1.23", "2.35", ""],
         ["SIM__ZSHORT__Port2", str(tmp_path / "SIM__ZSHORT__Port2.png"), "4.57", "5.68", ""],
     ]
-    assert all(args.args[0].number_of_ports == 2 for args in get_rlc.call_args_list)
+    get_rlc.assert_called_once_with(reduced, [0, 1], "source.s4p")
+    np.testing.assert_array_equal(plot_zmag.call_args_list[1].args[0][0][1], reduced.z_mag[:, 1, 1])
     assert plot_zmag.call_count == 2
+    touchstone.get_z_self.assert_called_once_with(reduced, [0, 1])
+
+
+def test_check_zmask_matches_a_point_by_point_log_log_check():
+    f = np.logspace(2, 9, 400)
+    rng = np.random.default_rng(0)
+    z_mag = 10 ** rng.uniform(-3, -1, (f.size, 3))
+    mask = [[1e3, 0.05], [1e6, 0.02], [1e8, 0.5]]
+
+    z_limit, margin_db, i_worst = TouchStone.check_zmask(f, z_mag, mask)
+
+    expected_margin = np.full(3, np.inf)
+    expected_index = np.full(3, -1)
+    for i_f, freq in enumerate(f):
+        if not 1e3 <= freq <= 1e8:
+            assert np.isnan(z_limit[i_f])
+            continue
+        i_seg = min(np.searchsorted([1e3, 1e6, 1e8], freq, side="right") - 1, 1)
+        (f_a, z_a), (f_b, z_b) = mask[i_seg], mask[i_seg + 1]
+        ratio = math.log10(freq / f_a) / math.log10(f_b / f_a)
+        limit = 10 ** (math.log10(z_a) + ratio * math.log10(z_b / z_a))
+        assert z_limit[i_f] == pytest.approx(limit)
+        for port in range(3):
+            margin = 20 * math.log10(limit / z_mag[i_f, port])
+            if margin < expected_margin[port]:
+                expected_margin[port], expected_index[port] = margin, i_f
+    np.testing.assert_allclose(margin_db, expected_margin)
+    np.testing.assert_array_equal(i_worst, expected_index)
+    assert (margin_db < 0).any()
+
+
+def test_check_zmask_reports_no_margin_when_the_mask_misses_the_sweep():
+    z_limit, margin_db, i_worst = TouchStone.check_zmask(
+        [1e6, 1e7], np.ones((2, 2)), [[1e8, 1.0], [1e9, 1.0]]
+    )
+
+    assert np.isnan(z_limit).all() and np.isnan(margin_db).all()
+    assert i_worst.tolist() == [-1, -1]
+    with pytest.raises(ValueError):
+        TouchStone.check_zmask([1e6], np.ones((1, 1)), [[1e8, 1.0], [1e7, 1.0]])
+
+
+def test_plot_zmask_checks_every_main_port_without_drawing_when_asked(touchstone_factory, tmp_path):
+    network = SimpleNamespace(f=np.array([1e6, 1e7, 1e8]))
+    z_self = np.array([[0.01, 0.01], [0.01, 0.2], [0.01, 0.01]])
+    touchstone = touchstone_factory(
+        key_name="SIM",
+        plt_dir=f"{tmp_path}{SL}",
+        spec_type={"POST_PROCESS_KEY": ["ZMASK"], "Z_MASK": [[1e6, 0.1], [1e8, 0.1]]},
+        conn_dict={"ZIN": [1, 2]},
+        nw=network,
+        f=network.f / 1e9,
+        mask_plot=False,
+    )
+    touchstone.plot_zmag = Mock()
+    touchstone.get_z_self = Mock(return_value=z_self)
+
+    result = touchstone.process_key("ZMASK")
+
+    assert result == [
+        ["SIM__ZMASK__Port1", "", "PASS", "20.00", "0.001"],
+        ["SIM__ZMASK__Port2", "", "FAIL", "-6.02", "0.01"],
+    ]
+    touchstone.plot_zmag.assert_not_called()
+    touchstone.get_z_self.assert_called_once_with(network, [0, 1])
+    assert list(tmp_path.iterdir()) == []
+
+
+def _random_network(port_count, z0=50.0, seed=0):
+    rng = np.random.default_rng(seed)
+    frequency = rf.Frequency.from_f([0.0, 1e6, 1e8, 1e9], unit="Hz")
+    s = 0.4 * (
+        rng.standard_normal((4, port_count, port_count))
+        + 1j * rng.standard_normal((4, port_count, port_count))
+    )
+    s = (s + s.transpose(0, 2, 1)) / 2
+    return rf.Network(frequency=frequency, s=s, z0=z0, name="random")
+
+
+def _load(network, impedance):
+    gamma = np.full((len(network.f), 1, 1), (impedance - 50.0) / (impedance + 50.0), dtype=complex)
+    return rf.Network(frequency=network.frequency, s=gamma, z0=50.0)
+
+
+def test_get_z_self_matches_the_full_conversion_for_the_requested_ports(touchstone_factory):
+    network = _random_network(5, z0=[10.0, 20.0, 30.0, 40.0, 50.0], seed=3)
+
+    z_self = touchstone_factory().get_z_self(network, [3, 0])
+
+    np.testing.assert_allclose(z_self, network.z[:, [3, 0], [3, 0]], rtol=1e-9)
+
+
+def test_get_z_self_reuses_the_solve_for_the_same_network_and_ports(touchstone_factory):
+    network = _random_network(3, seed=4)
+    touchstone = touchstone_factory()
+
+    first = touchstone.get_z_self(network, [0, 1])
+
+    assert touchstone.get_z_self(network, [0, 1]) is first
+    assert touchstone.get_z_self(network, [1]) is not first
+    assert touchstone.get_z_self(network.copy(), [0, 1]) is not first
+
+
+def test_get_z_self_nudges_an_exactly_singular_frequency(touchstone_factory):
+    network = _random_network(2, seed=5)
+    network.s[0] = np.eye(2)
+
+    z_self = touchstone_factory().get_z_self(network, [0, 1])
+
+    assert np.all(np.isfinite(z_self))
+    assert np.all(np.abs(z_self[0]) > 1e6)
+    np.testing.assert_allclose(z_self[1:], network.z[1:, [0, 1], [0, 1]], rtol=1e-9)
+
+
+def test_stacked_solves_equal_each_network_solved_alone(touchstone_factory):
+    singular = _random_network(3, seed=6)
+    singular.s[0] = np.eye(3)
+    network_list = [_random_network(3, seed=7), singular]
+    s = np.stack([network.s for network in network_list])
+    z0 = np.stack([network.z0 for network in network_list])
+    touchstone = touchstone_factory()
+
+    z_self = TouchStone.solve_z_self(s, z0, [2, 0])
+    s_red, z0_red = TouchStone.terminate_s(s, z0, [1])
+
+    for i_nw, network in enumerate(network_list):
+        np.testing.assert_array_equal(z_self[i_nw], touchstone.get_z_self(network, [2, 0]))
+        reduced = touchstone.terminate_ports(network, [1])
+        np.testing.assert_array_equal(s_red[i_nw], reduced.s)
+        np.testing.assert_array_equal(z0_red[i_nw], reduced.z0)
+
+
+@pytest.mark.parametrize("impedance", [0.0, 3.0 + 2.0j, 1e3])
+def test_terminate_ports_matches_sequential_connections(touchstone_factory, impedance):
+    network = _random_network(4)
+    expected = network
+    for port in (3, 1):
+        expected = rf.connect(expected, port, _load(network, impedance), 0)
+
+    reduced = touchstone_factory().terminate_ports(network, [1, 3], impedance)
+
+    assert reduced.number_of_ports == 2
+    np.testing.assert_allclose(reduced.s, expected.s, atol=1e-12)
+    np.testing.assert_array_equal(reduced.z0, network.z0[:, [0, 2]])
+
+
+def test_terminate_ports_open_keeps_the_z_submatrix(touchstone_factory):
+    network = _random_network(3, z0=0.1, seed=1)
+
+    reduced = touchstone_factory().terminate_ports(network, [2], np.inf)
+
+    np.testing.assert_allclose(reduced.z[1:], network.z[1:, :2, :2], rtol=1e-9)
+
+
+def test_terminate_ports_takes_one_impedance_per_port(touchstone_factory):
+    network = _random_network(3, seed=2)
+    expected = rf.connect(network, 2, _load(network, 0.0), 0)
+    expected = rf.connect(expected, 1, _load(network, 1e3), 0)
+
+    reduced = touchstone_factory().terminate_ports(network, [1, 2], [1e3, 0.0])
+
+    np.testing.assert_allclose(reduced.s, expected.s, atol=1e-12)
+
+
+def _complex_s(port_count, f_count=3):
+    values = np.arange(1, f_count * port_count * port_count + 1, dtype=float)
+    return (values * np.exp(1j * values)).reshape(f_count, port_count, port_count) / 100
 
 
 def test_plot_il_selects_output_input_paths_and_labels(touchstone_factory, tmp_path):
-    s_db = np.arange(3 * 3 * 3, dtype=float).reshape(3, 3, 3)
+    s = _complex_s(3)
+    s_db = 20 * np.log10(np.abs(s))
     plot_smag = Mock()
     touchstone = touchstone_factory(
         key_name="SIM", plt_dir=f"{tmp_path}{SL}", f=np.asarray([1.0, 2.0, 3.0])
     )
     touchstone.plot_smag = plot_smag
 
-    result = touchstone.plot_il([[1, 2], [3, 1]], s_db, "IL", "S")
+    result = touchstone.plot_il([[1, 2], [3, 1]], s, "IL", "S")
 
     assert result == [["SIM__IL__S", str(tmp_path / "SIM__IL__S.png")]]
     curves = plot_smag.call_args.args[0]
@@ -385,14 +534,15 @@ def test_plot_il_selects_output_input_paths_and_labels(touchstone_factory, tmp_p
 
 
 def test_plot_rl_selects_reflections_and_labels(touchstone_factory, tmp_path):
-    s_db = np.arange(3 * 3 * 3, dtype=float).reshape(3, 3, 3)
+    s = _complex_s(3)
+    s_db = 20 * np.log10(np.abs(s))
     plot_smag = Mock()
     touchstone = touchstone_factory(
         key_name="SIM", plt_dir=f"{tmp_path}{SL}", f=np.asarray([1.0, 2.0, 3.0])
     )
     touchstone.plot_smag = plot_smag
 
-    result = touchstone.plot_rl([1, 3], s_db, "RL", "S")
+    result = touchstone.plot_rl([1, 3], s, "RL", "S")
 
     assert result == [["SIM__RL__S", str(tmp_path / "SIM__RL__S.png")]]
     curves = plot_smag.call_args.args[0]
@@ -401,6 +551,41 @@ def test_plot_rl_selects_reflections_and_labels(touchstone_factory, tmp_path):
     assert [curve[2]["label"] for curve in curves] == ["S11", "S33"]
 
 
+@pytest.mark.parametrize(
+    ("fmt", "convert"),
+    [
+        ("db", lambda s: 20 * np.log10(np.abs(s))),
+        ("mag", np.abs),
+        ("complex", lambda s: s),
+    ],
+)
+def test_get_s_path_gathers_only_the_requested_paths(touchstone_factory, fmt, convert):
+    s = _complex_s(4, f_count=2)
+
+    paths = touchstone_factory().get_s_path(s, [1, 3, 0], [0, 3, 2], fmt)
+
+    assert paths.shape == (2, 3)
+    np.testing.assert_allclose(paths, convert(np.stack([s[:, 1, 0], s[:, 3, 3], s[:, 0, 2]], 1)))
+
+
+def test_plot_il_mm_reads_mode_conversion_paths_from_the_off_diagonal_quadrants(
+    touchstone_factory, tmp_path
+):
+    s = _complex_s(4)
+    plot_smag = Mock()
+    touchstone = touchstone_factory(
+        key_name="SIM", plt_dir=f"{tmp_path}{SL}", f=np.asarray([1.0, 2.0, 3.0]), port_num=4
+    )
+    touchstone.plot_smag = plot_smag
+
+    touchstone.plot_il_mm([[1, 2]], s, "IL_MM")
+
+    curves = {call.args[1]: call.args[0][0] for call in plot_smag.call_args_list}
+    np.testing.assert_allclose(curves["SIM__IL_MM__SDC"][1], 20 * np.log10(np.abs(s[:, 1, 2])))
+    np.testing.assert_allclose(curves["SIM__IL_MM__SCD"][1], 20 * np.log10(np.abs(s[:, 3, 0])))
+    assert curves["SIM__IL_MM__SCC"][2] == {"label": "SCC21"}
+
+
 def test_split_mixedmode_network_returns_dd_dc_cd_cc_quadrants(touchstone_factory):
     mixed_mode = np.arange(2 * 4 * 4).reshape(2, 4, 4)
     touchstone = touchstone_factory(port_num=4)
@@ -463,15 +648,13 @@ def test_plot_rl_mm_dispatches_like_mode_quadrants_only(touchstone_factory):
     np.testing.assert_array_equal(calls[1][1], mixed_mode[:, 2:, 2:])
 
 
-def test_plot_tdr_extrapolates_resamples_and_plots_both_sides(touchstone_factory, tmp_path):
-    network = FakeTdrNetwork([5e6, 20e6])
+def test_plot_tdr_transforms_both_sides_at_once_and_plots_them_apart(touchstone_factory, tmp_path):
+    network = object()
+    t = np.asarray([0.0, 1e-9])
+    zc = np.arange(8.0).reshape(2, 4)
     touchstone = touchstone_factory(key_name="SIM", plt_dir=f"{tmp_path}{SL}")
-    plotted = []
-
-    def plot_time_domain(connectivity, transformed, title, path):
-        plotted.append((list(connectivity), transformed, title, path))
-
-    touchstone.plot_time_domain = plot_time_domain
+    touchstone.get_tdr = Mock(return_value=(t, zc))
+    touchstone.plot_time_domain = Mock()
 
     result = touchstone.plot_tdr([[1, 2], [3, 4]], network, "TDR", "SE")
 
@@ -479,32 +662,74 @@ def test_plot_tdr_extrapolates_resamples_and_plots_both_sides(touchstone_factory
         ["SIM__TDR__SE_Left", str(tmp_path / "SIM__TDR__SE_Left.png")],
         ["SIM__TDR__SE_Right", str(tmp_path / "SIM__TDR__SE_Right.png")],
     ]
-    assert network.extrapolate_calls == []
-    assert network.resample_calls == []
-    assert plotted[0][0] == [1, 2]
-    assert plotted[1][0] == [3, 4]
-    assert plotted[0][1] is plotted[1][1]
-    assert plotted[0][1] is not network
-    assert plotted[0][1].extrapolate_calls == ["linear"]
-    assert plotted[0][1].resample_calls == [[0, 10_000_000, 20_000_000]]
-    np.testing.assert_array_equal(plotted[0][1].f, [0, 10_000_000, 20_000_000])
-
-
-def test_plot_tdr_skips_dc_extrapolation_when_network_already_starts_at_zero(touchstone_factory):
-    network = FakeTdrNetwork([0, 20e6])
+    touchstone.get_tdr.assert_called_once_with(network, [0, 1, 2, 3])
+    left, right = touchstone.plot_time_domain.call_args_list
+    assert left.args[1:] == ("SIM__TDR__SE_Left", str(tmp_path / "SIM__TDR__SE_Left.png"))
+    assert right.args[1:] == ("SIM__TDR__SE_Right", str(tmp_path / "SIM__TDR__SE_Right.png"))
+    assert [curve[2] for curve in right.args[0]] == [{"label": "Port_3"}, {"label": "Port_4"}]
+    np.testing.assert_array_equal(left.args[0][0][0], [0.0, 1.0])
+    np.testing.assert_array_equal(left.args[0][1][1], zc[:, 1])
+    np.testing.assert_array_equal(right.args[0][1][1], zc[:, 3])
+
+
+def _line_network(f_start_mhz=10):
+    frequency = rf.Frequency(f_start_mhz, 5000, 500, unit="MHz")
+    media = rf.media.DefinedGammaZ0(frequency, z0=50)
+    mismatch = rf.media.DefinedGammaZ0(frequency, z0=50).line(100, "mm")
+    mismatch.renormalize(40)
+    return media.line(100, "mm") ** mismatch ** media.line(100, "mm")
+
+
+def _skrf_step_zc(network, port):
+    dense = network.extrapolate_to_dc(kind="linear")
+    dense.resample(list(range(0, int(dense.f[-1]) + int(10e6), int(10e6))))
+    t, step = dense.step_response(squeeze=False)
+    step = step[:, port, port]
+    return t, dense.z0[0, port].real * (1 + step) / (1 - step)
+
+
+def test_get_tdr_defaults_match_the_scikit_rf_step_response(touchstone_factory):
+    network = _line_network()
     touchstone = touchstone_factory()
-    plotted = []
-    touchstone.plot_time_domain = lambda _, transformed, __, ___: plotted.append(transformed)
 
-    touchstone.plot_tdr([[1], [2]], network, "TDR")
+    t, zc = touchstone.get_tdr(network, [1, 0])
+
+    assert t[0] == 0.0
+    assert t[-1] == pytest.approx(50e-9, rel=1e-2)
+    assert zc.shape == (len(t), 2)
+    for column, port in enumerate([1, 0]):
+        t_ref, zc_ref = _skrf_step_zc(network, port)
+        np.testing.assert_allclose(zc[:, column], np.interp(t, t_ref, zc_ref), atol=0.05)
+
 
-    assert plotted[0] is plotted[1]
-    assert plotted[0].extrapolate_calls == []
-    assert plotted[0].resample_calls == [[0, 10_000_000, 20_000_000]]
+def test_get_tdr_grid_follows_span_and_rise_time(touchstone_factory):
+    network = _line_network(f_start_mhz=0)
+    touchstone = touchstone_factory(tdr_settings={"span": 5e-9, "window": None})
+
+    t_full, _ = touchstone.get_tdr(network, [0])
+    touchstone.tdr_settings["rise_time"] = 1e-9
+    t_slow, zc_slow = touchstone.get_tdr(network, [0])
+
+    # 5 ns at 0.1 ns steps from 5 GHz, then at 1/3 ns from the 1.5 GHz cap
+    assert len(t_full) == 50
+    assert len(t_slow) == 15
+    np.testing.assert_allclose(np.diff(t_slow), 1 / 3e9)
+    assert np.all(np.isfinite(zc_slow))
+
+
+def test_get_tdr_reads_only_the_requested_reflection_terms(touchstone_factory):
+    network = _line_network()
+    touchstone = touchstone_factory()
+    t_both, zc_both = touchstone.get_tdr(network, [0, 1])
+
+    t_one, zc_one = touchstone.get_tdr(network, [1])
+
+    np.testing.assert_array_equal(t_one, t_both)
+    np.testing.assert_allclose(zc_one[:, 0], zc_both[:, 1])
 
 
 def test_plot_tdr_mm_offsets_common_mode_ports_without_mutating_input(touchstone_factory):
-    network = FakeTdrNetwork([0, 10e6], port_count=4)
+    network = object()
     touchstone = touchstone_factory(port_num=4)
     calls = []
 
@@ -525,32 +750,120 @@ def test_plot_tdr_mm_offsets_common_mode_ports_without_mutating_input(touchstone
     assert connectivity == [[1], [2]]
 
 
-def test_convert_snp_se2mm_renumbers_converts_and_writes_next_to_source(
-    touchstone_factory, tmp_path
-):
-    network = FakeConversionNetwork([1e9, 2e9])
-    source = tmp_path / "source.s4p"
+def _skrf_se2gmm(network, order):
+    expected = network.copy()
+    expected.renumber(list(range(network.nports)), order)
+    expected.se2gmm(p=network.nports // 2)
+    return expected
+
+
+@pytest.mark.parametrize("order", [[0, 1, 2, 3], [2, 3, 0, 1], [0, 2, 1, 3], [3, 1, 0, 2]])
+def test_convert_snp_se2mm_matches_scikit_rf_for_a_shared_reference(touchstone_factory, order):
+    network = _random_network(4)
+    touchstone = touchstone_factory(nw=network, port_num=4, conn_dict={"MM_ORDER_IN_SE": order})
+
+    converted = touchstone.convert_snp_se2mm()
+
+    expected = _skrf_se2gmm(network, order)
+    np.testing.assert_allclose(converted.s, expected.s, atol=1e-12)
+    np.testing.assert_allclose(converted.z0, expected.z0)
+    np.testing.assert_array_equal(converted.f, network.f)
+
+
+def test_convert_snp_se2mm_falls_back_to_scikit_rf_for_mixed_references(touchstone_factory):
+    network = _random_network(4, z0=[50.0, 50.0, 40.0, 40.0])
+    touchstone = touchstone_factory(
+        nw=network, port_num=4, conn_dict={"MM_ORDER_IN_SE": [2, 3, 0, 1]}
+    )
+
+    converted = touchstone.convert_snp_se2mm(["DD"])
+
+    expected = _skrf_se2gmm(network, [2, 3, 0, 1])
+    np.testing.assert_allclose(converted.s, expected.s)
+    assert not np.isnan(converted.s).any()
+
+
+def test_convert_snp_se2mm_leaves_quadrants_not_asked_for_as_nan(touchstone_factory):
+    network = _random_network(4)
+    touchstone = touchstone_factory(
+        nw=network, port_num=4, conn_dict={"MM_ORDER_IN_SE": [0, 1, 2, 3]}
+    )
+
+    converted = touchstone.convert_snp_se2mm(["DD", "CC"])
+
+    expected = _skrf_se2gmm(network, [0, 1, 2, 3])
+    np.testing.assert_allclose(converted.s[:, :2, :2], expected.s[:, :2, :2], atol=1e-12)
+    np.testing.assert_allclose(converted.s[:, 2:, 2:], expected.s[:, 2:, 2:], atol=1e-12)
+    assert np.isnan(converted.s[:, :2, 2:]).all()
+    assert np.isnan(converted.s[:, 2:, :2]).all()
+
+
+def test_write_mm_snp_writes_next_to_source(touchstone_factory, tmp_path):
+    network = _random_network(4)
     touchstone = touchstone_factory(
         nw=network,
         port_num=4,
-        file_dir=str(source),
-        conn_dict={"MM_ORDER_IN_SE": [2, 3, 0, 1]},
+        file_dir=str(tmp_path / "source.s4p"),
+        conn_dict={"MM_ORDER_IN_SE": [0, 1, 2, 3]},
     )
 
-    converted = touchstone.convert_snp_se2mm()
+    touchstone.write_mm_snp(touchstone.convert_snp_se2mm())
 
-    assert converted is not network
-    assert network.renumber_calls == []
-    assert converted.renumber_calls == [([0, 1, 2, 3], [2, 3, 0, 1])]
-    assert converted.se2gmm_calls == [2]
-    assert converted.write_calls == [
-        {
-            "filename": "source_mm",
-            "dir": f"{tmp_path / 'Mixed_Mode'}{SL}",
-            "write_z0": True,
-        }
-    ]
-    assert (tmp_path / "Mixed_Mode").is_dir()
+    written = rf.Network(str(tmp_path / "Mixed_Mode" / "source_mm.s4p"))
+    np.testing.assert_allclose(written.z0[0], [100, 100, 25, 25])
+
+
+def _mm_touchstone(touchstone_factory, tmp_path, post_process_keys, **mm_settings):
+    return touchstone_factory(
+        MM_KEY=["IL_MM", "RL_MM"],
+        spec_type={"POST_PROCESS_KEY": post_process_keys},
+        nw=_random_network(4),
+        port_num=4,
+        file_dir=str(tmp_path / "source.s4p"),
+        conn_dict={"MM_ORDER_IN_SE": [0, 1, 2, 3]},
+        mm_settings=mm_settings,
+    )
+
+
+def test_mixedmode_network_is_reused_from_the_cache(monkeypatch, touchstone_factory, tmp_path):
+    (tmp_path / "source.s4p").write_text("source")
+    first = _mm_touchstone(touchstone_factory, tmp_path, ["IL_MM"], write_snp="off")
+    expected = first._TouchStone__get_mixedmode_network()
+    second = _mm_touchstone(touchstone_factory, tmp_path, ["IL_MM"], write_snp="off")
+    converter = Mock(side_effect=AssertionError("converted again"))
+    monkeypatch.setattr(second, "convert_snp_se2mm", converter)
+
+    cached = second._TouchStone__get_mixedmode_network()
+
+    np.testing.assert_array_equal(cached.s, expected.s)
+    assert (tmp_path / "Mixed_Mode" / "source_mm.npz").is_file()
+    assert not (tmp_path / "Mixed_Mode" / "source_mm.s4p").exists()
+
+
+def test_mixedmode_network_computes_only_needed_quadrants_and_skips_writing_them(
+    touchstone_factory, tmp_path
+):
+    (tmp_path / "source.s4p").write_text("source")
+    touchstone = _mm_touchstone(touchstone_factory, tmp_path, ["RL_MM"], quadrants="needed")
+
+    converted = touchstone._TouchStone__get_mixedmode_network()
+
+    assert np.isnan(converted.s[:, :2, 2:]).all()
+    assert not np.isnan(converted.s[:, :2, :2]).any()
+    assert not (tmp_path / "Mixed_Mode" / "source_mm.s4p").exists()
+
+
+def test_mixedmode_network_writes_the_touchstone_in_the_background(touchstone_factory, tmp_path):
+    (tmp_path / "source.s4p").write_text("source")
+    touchstone = _mm_touchstone(
+        touchstone_factory, tmp_path, ["IL_MM"], cache=False, write_snp="async"
+    )
+
+    touchstone._TouchStone__get_mixedmode_network()
+    TouchStone.wait_mm_writes()
+
+    assert (tmp_path / "Mixed_Mode" / "source_mm.s4p").is_file()
+    assert not (tmp_path / "Mixed_Mode" / "source_mm.npz").exists()
 
 
 @pytest.mark.parametrize(
@@ -567,6 +880,7 @@ def test_mixedmode_network_is_conditional_for_supported_keys(
         MM_KEY=["IL_MM", "RL_MM"],
         spec_type={"POST_PROCESS_KEY": post_process_keys},
         nw=single_ended,
+        mm_settings={"cache": False, "write_snp": "off"},
     )
     touchstone.convert_snp_se2mm = converter
 
@@ -578,26 +892,29 @@ def test_mixedmode_network_is_conditional_for_supported_keys(
 
 def test_get_rlc_extracts_and_converts_resistance_inductance_capacitance(touchstone_factory):
     touchstone = touchstone_factory()
+    flags = np.asarray([[False], [True], [False]])
     interpolate = Mock(
-        side_effect=[
-            (0.002, 0.0),
-            (10.0, 0.0),
-            (0.628, 0.0),
-        ]
+        return_value=(
+            np.asarray([[0.002], [10.0], [0.628]]),
+            np.zeros((3, 1)),
+            flags,
+        )
     )
     touchstone._TouchStone__get_z_interp = interpolate
     network = object()
 
-    resistance, inductance, capacitance = touchstone._TouchStone__get_rlc(network, 2, "source.s4p")
+    resistance, inductance, capacitance, extrap = touchstone._TouchStone__get_rlc(
+        network, [2], "source.s4p"
+    )
 
-    assert resistance == pytest.approx(2.0)
-    assert inductance > 0
-    assert capacitance > 0
-    assert interpolate.call_args_list == [
-        call(network, 1e3, 2, 2, "source.s4p"),
-        call(network, 1e4, 2, 2, "source.s4p"),
-        call(network, 1e8, 2, 2, "source.s4p"),
-    ]
+    np.testing.assert_allclose(resistance, [2.0])
+    assert inductance[0] > 0
+    assert capacitance[0] > 0
+    assert extrap is flags
+    interpolate.assert_called_once()
+    assert interpolate.call_args.args[0] is network
+    np.testing.assert_array_equal(interpolate.call_args.args[1], [1e3, 1e4, 1e8])
+    assert interpolate.call_args.args[2:] == ([2], "source.s4p")
 
 
 @pytest.mark.xfail(
@@ -608,70 +925,148 @@ def test_get_rlc_extracts_and_converts_resistance_inductance_capacitance(touchst
 def test_get_rlc_uses_math_pi_for_inductance_and_capacitance(touchstone_factory):
     touchstone = touchstone_factory()
     touchstone._TouchStone__get_z_interp = Mock(
-        side_effect=[(0.002, 0.0), (10.0, 0.0), (0.628, 0.0)]
+        return_value=(
+            np.asarray([[0.002], [10.0], [0.628]]),
+            np.zeros((3, 1)),
+            np.zeros((3, 1), dtype=bool),
+        )
     )
 
-    _, inductance, capacitance = touchstone._TouchStone__get_rlc(object(), 0, "source.s1p")
+    _, inductance, capacitance, _ = touchstone._TouchStone__get_rlc(object(), [0], "source.s1p")
 
-    assert inductance == pytest.approx(0.628 / (2 * math.pi * 1e8) * 1e12)
-    assert capacitance == pytest.approx(1 / 10 / (2 * math.pi * 1e4) * 1e9)
+    assert inductance[0] == pytest.approx(0.628 / (2 * math.pi * 1e8) * 1e12)
+    assert capacitance[0] == pytest.approx(1 / 10 / (2 * math.pi * 1e4) * 1e9)
 
 
 def test_get_z_interp_returns_exact_frequency_sample(touchstone_factory):
-    network = LookupNetwork([50, 100, 200], [5, 10, 20], [0.5, 1.0, 2.0])
+    network = _z_network([50, 100, 200], 10 * np.exp(1j * np.asarray([0.5, 1.0, 2.0])))
     touchstone = touchstone_factory()
 
-    magnitude, angle = touchstone._TouchStone__get_z_interp(network, 100, 0, 0, "source.s1p")
+    magnitude, angle, extrap = touchstone._TouchStone__get_z_interp(
+        network, [100], [0], "source.s1p"
+    )
 
-    assert magnitude == 10
-    assert angle == 1.0
+    assert magnitude[0, 0] == pytest.approx(10)
+    assert angle[0, 0] == pytest.approx(1.0)
+    assert not extrap.any()
 
 
 @pytest.mark.parametrize(
-    ("frequencies", "magnitudes", "angles", "expected_frequency_pair"),
+    ("frequencies", "magnitudes", "angles"),
     [
-        ([90, 110], [9, 22], [0.9, 1.1], (90, 110)),
-        ([90, 105], [9, 21], [0.9, 1.05], (105, 90)),
+        ([90, 110], [9, 22], [0.9, 1.1]),
+        ([50, 90, 105, 400], [1, 9, 21, 30], [0.1, 0.9, 1.05, 1.5]),
     ],
 )
 def test_get_z_interp_uses_log_magnitude_and_linear_angle_between_brackets(
-    touchstone_factory, frequencies, magnitudes, angles, expected_frequency_pair
+    touchstone_factory, frequencies, magnitudes, angles
 ):
-    network = LookupNetwork(frequencies, magnitudes, angles)
+    network = _z_network(frequencies, np.asarray(magnitudes) * np.exp(1j * np.asarray(angles)))
     touchstone = touchstone_factory()
 
-    magnitude, angle = touchstone._TouchStone__get_z_interp(network, 100, 0, 0, "source.s1p")
+    magnitude, angle, extrap = touchstone._TouchStone__get_z_interp(
+        network, [100], [0], "source.s1p"
+    )
 
-    first_frequency, second_frequency = expected_frequency_pair
-    first_index = frequencies.index(first_frequency)
-    second_index = frequencies.index(second_frequency)
+    upper = int(np.searchsorted(frequencies, 100))
+    lower = upper - 1
     expected_magnitude = _log_interpolate(
-        100,
-        first_frequency,
-        magnitudes[first_index],
-        second_frequency,
-        magnitudes[second_index],
+        100, frequencies[lower], magnitudes[lower], frequencies[upper], magnitudes[upper]
     )
-    expected_angle = angles[first_index] + (100 - first_frequency) / (
-        second_frequency - first_frequency
-    ) * (angles[second_index] - angles[first_index])
-    assert magnitude == pytest.approx(expected_magnitude)
-    assert angle == pytest.approx(expected_angle)
+    expected_angle = angles[lower] + (100 - frequencies[lower]) / (
+        frequencies[upper] - frequencies[lower]
+    ) * (angles[upper] - angles[lower])
+    assert magnitude[0, 0] == pytest.approx(expected_magnitude)
+    assert angle[0, 0] == pytest.approx(expected_angle)
+    assert not extrap.any()
+
+
+def test_get_z_interp_brackets_every_target_and_port_in_one_call(touchstone_factory):
+    frequencies = np.asarray([1e3, 1e4, 1e5, 1e6])
+    first = np.asarray([1.0, 10.0, 100.0, 1000.0])
+    second = np.asarray([2.0, 2.0, 2.0, 2.0])
+    network = _z_network(frequencies, np.stack([first, second, first], axis=1))
+    touchstone = touchstone_factory()
+
+    magnitude, _, extrap = touchstone._TouchStone__get_z_interp(
+        network, [3e3, 1e5, 5e5], [0, 1], "source.s3p"
+    )
+
+    assert magnitude.shape == (3, 2)
+    np.testing.assert_allclose(magnitude[:, 0], [3.0, 100.0, 500.0])
+    np.testing.assert_allclose(magnitude[:, 1], [2.0, 2.0, 2.0])
+    assert not extrap.any()
 
 
-def test_get_z_interp_warns_when_search_never_finds_a_bracket(touchstone_factory, capsys):
+def test_get_z_interp_falls_back_to_linear_magnitude_above_dc(touchstone_factory):
+    network = _z_network([0, 100, 200], [4.0, 8.0, 16.0])
     touchstone = touchstone_factory()
 
-    magnitude, angle = touchstone._TouchStone__get_z_interp(
-        SparseLookupNetwork(), 100, 0, 0, "sparse.s1p"
+    magnitude, _, extrap = touchstone._TouchStone__get_z_interp(network, [50], [0], "dc.s1p")
+
+    assert magnitude[0, 0] == pytest.approx(6.0)
+    assert not extrap.any()
+
+
+def test_get_z_interp_flags_and_warns_when_target_is_outside_sweep(touchstone_factory, capsys):
+    network = _z_network([80, 90], [8.0, 9.0])
+    touchstone = touchstone_factory()
+
+    magnitude, angle, extrap = touchstone._TouchStone__get_z_interp(
+        network, [85, 100], [0], "sparse.s1p"
     )
 
     output = capsys.readouterr().out
     assert "Frequency samples are not sufficiently dense for interpolation in sparse.s1p" in output
     assert "The results may not be accurate!" in output
     assert "Please raise frequency points and rerun simulations!" in output
-    assert magnitude == pytest.approx(_log_interpolate(100, 80, 8, 90, 9))
-    assert angle == pytest.approx(1.0)
+    np.testing.assert_array_equal(extrap, [[False], [True]])
+    assert magnitude[1, 0] == pytest.approx(_log_interpolate(100, 80, 8, 90, 9))
+    assert angle[1, 0] == pytest.approx(0.0)
+
+
+def _pdn_snp(tmp_path):
+    # four ports on one plane: a shared 1 uF decap and per-port mOhm, pH paths
+    f = np.r_[0.0, np.geomspace(1e3, 1e9, 1500)]
+    omega = 2 * np.pi * f
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_plane = 2e-3 + 1 / (1j * omega * 1e-6)
+    z_plane[0] = 1e9
+    z = np.empty((len(f), 4, 4), dtype=complex)
+    z[:] = (z_plane + 2e-4 + 1j * omega * 10e-12)[:, None, None]
+    z[:, range(4), range(4)] += (8e-4 + 1j * omega * 40e-12)[:, None]
+    network = rf.Network(frequency=rf.Frequency.from_f(f, unit="Hz"), s=rf.z2s(z, 50), z0=50)
+    network.write_touchstone(filename="SIM__A", dir=str(tmp_path))
+    return str(tmp_path / "SIM__A.s4p")
+
+
+def test_single_precision_gives_the_printed_values_of_double_precision(monkeypatch, tmp_path):
+    snp = _pdn_snp(tmp_path)
+    monkeypatch.setattr(TouchStone, "plot_zmag", Mock())
+    monkeypatch.setattr(TouchStone, "plot_smag", Mock())
+    output = {}
+    for precision in ("double", "single"):
+        info = {
+            "file_dir": snp,
+            "key_name": "SIM",
+            "plt_dir": f"{tmp_path}{SL}",
+            "spec_type": {
+                "POST_PROCESS_KEY": ["ZOPEN", "ZSHORT", "ZMASK"],
+                "Z_MASK": [[1e3, 0.2], [1e9, 0.2]],
+            },
+            "conn_dict": {"ZIN": [1, 2], "IL": [[1, 2]]},
+            "precision": precision,
+        }
+        touchstone = TouchStone(info)
+        output[precision] = touchstone.auto_process()
+        s_path = touchstone.get_s_path(touchstone.nw.s, [1], [0])
+        output[precision + "_il"] = s_path
+
+    assert touchstone.nw.s.dtype == np.complex64
+    assert output["single_il"].dtype == np.float32
+    np.testing.assert_allclose(output["single_il"], output["double_il"], atol=1e-3)
+    assert output["single"] == output["double"]
+    assert output["single"]["ZSHORT"][0][2:] == ["1.20", "45.77", ""]
 
 
 def test_from_list_constructs_instances_in_input_order():
@@ -687,60 +1082,129 @@ def test_from_list_constructs_instances_in_input_order():
     assert all(isinstance(item, RecordingTouchStone) for item in result)
 
 
-def test_plot_zmag_uses_log_axes_impedance_labels_and_target_path(monkeypatch, touchstone_factory):
-    pyplot = PyplotRecorder()
-    monkeypatch.setattr(touchstone_module, "plt", pyplot)
+def _lazy_info(tmp_path, post_process_keys):
+    return {
+        "file_dir": str(tmp_path / "input.s4p"),
+        "key_name": "SIM_A",
+        "plt_dir": f"{tmp_path}{SL}",
+        "spec_type": {"POST_PROCESS_KEY": post_process_keys},
+        "conn_dict": {"MM_ORDER_IN_SE": [0, 1, 2, 3]},
+        "mm_settings": {"cache": False},
+    }
+
+
+def test_lazy_init_defers_each_network_stage_to_first_access(monkeypatch, tmp_path):
+    single_ended = FakeConversionNetwork([1e9, 2e9])
+    mixed_mode = FakeConversionNetwork([1e9, 2e9])
+    loader = Mock(return_value=single_ended)
+    converter = Mock(return_value=mixed_mode)
+    monkeypatch.setattr(touchstone_module, "read_touchstone", loader)
+    monkeypatch.setattr(TouchStone, "convert_snp_se2mm", converter)
+
+    touchstone = TouchStone(_lazy_info(tmp_path, ["IL", "IL_MM"]), lazy=True)
+
+    loader.assert_not_called()
+    assert touchstone.port_num == 4
+    np.testing.assert_array_equal(touchstone.f, np.asarray([1.0, 2.0]))
+    assert touchstone.nw is single_ended
+    loader.assert_called_once_with(str(tmp_path / "input.s4p"))
+    converter.assert_not_called()
+    assert touchstone.nw_mm is mixed_mode
+    assert touchstone.nw_mm is mixed_mode
+    converter.assert_called_once_with(["DD", "DC", "CD", "CC"])
+
+
+def test_release_drops_networks_and_next_access_reloads(monkeypatch, tmp_path):
+    loader = Mock(side_effect=lambda _: FakeConversionNetwork([1e9]))
+    monkeypatch.setattr(touchstone_module, "read_touchstone", loader)
+    touchstone = TouchStone(_lazy_info(tmp_path, ["IL"]))
+    first = touchstone.nw
+
+    touchstone.release()
+
+    assert "nw" not in vars(touchstone)
+    assert "nw_mm" not in vars(touchstone)
+    assert touchstone.nw is not first
+    assert loader.call_count == 2
+
+
+def test_missing_non_network_attribute_still_raises(touchstone_factory):
+    with pytest.raises(AttributeError, match="no_such_attribute"):
+        touchstone_factory().no_such_attribute
+
+
+def test_from_list_stream_yields_lazy_instances_and_releases_each_one(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        touchstone_module,
+        "read_touchstone",
+        Mock(side_effect=lambda _: FakeConversionNetwork([1e9])),
+    )
+    infos = [_lazy_info(tmp_path, ["IL"]), _lazy_info(tmp_path, ["RL"])]
+
+    stream = TouchStone.from_list(infos, stream=True)
+    first = next(stream)
+    assert "nw" not in vars(first)
+    first.nw
+    second = next(stream)
+
+    assert "nw" not in vars(first)
+    assert second.spec_type == {"POST_PROCESS_KEY": ["RL"]}
+    second.nw
+    with pytest.raises(StopIteration):
+        next(stream)
+    assert "nw" not in vars(second)
+
+
+def test_plot_zmag_uses_log_axes_impedance_labels_and_target_path(
+    monkeypatch, touchstone_factory, tmp_path
+):
+    canvas = _fresh_canvas(monkeypatch)
     touchstone = touchstone_factory()
     frequency = np.asarray([0.001, 0.01])
     first = np.asarray([1.0, 2.0])
     second = np.asarray([3.0, 4.0])
+    fig_dir = str(tmp_path / "plot.png")
 
     touchstone.plot_zmag(
         [[frequency, first], [frequency, second, {"label": "Z22", "color": "red"}]],
         "Impedance",
-        "plot.png",
-    )
-
-    assert pyplot.figures == [{"figsize": (8, 5)}]
-    np.testing.assert_array_equal(pyplot.plots[0][0][0], frequency)
-    np.testing.assert_array_equal(pyplot.plots[0][0][1], first)
-    np.testing.assert_array_equal(pyplot.plots[1][0][1], second)
-    assert pyplot.plots[0][1] == {}
-    assert pyplot.plots[1][1] == {"label": "Z22", "color": "red"}
-    assert pyplot.legend_count == 1
-    assert pyplot.titles == ["Impedance"]
-    assert pyplot.xscales == ["log"]
-    assert pyplot.yscales == ["log"]
-    assert pyplot.xlabels == ["Frequency (GHz)"]
-    assert pyplot.ylabels == ["Z(Ohm)"]
-    assert pyplot.grids == [
-        {"which": "major", "linestyle": "-"},
-        {"which": "minor", "linestyle": "--"},
-    ]
-    assert pyplot.saved == ["plot.png"]
-    assert pyplot.close_count == 1
+        fig_dir,
+    )
+
+    fig, ax, _ = canvas.fig_dict["zmag"]
+    assert tuple(fig.get_size_inches()) == (8, 5)
+    np.testing.assert_array_equal(ax.lines[0].get_xdata(), frequency)
+    np.testing.assert_array_equal(ax.lines[0].get_ydata(), first)
+    np.testing.assert_array_equal(ax.lines[1].get_ydata(), second)
+    assert ax.lines[0].get_color() == "#1f77b4"
+    assert ax.lines[1].get_color() == "red"
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["Z22"]
+    assert ax.get_title() == "Impedance"
+    assert (ax.get_xscale(), ax.get_yscale()) == ("log", "log")
+    assert ax.get_xlabel() == "Frequency (GHz)"
+    assert ax.get_ylabel() == "Z(Ohm)"
+    assert (tmp_path / "plot.png").is_file()
 
 
 def test_plot_smag_uses_linear_frequency_axis_db_label_and_target_path(
-    monkeypatch, touchstone_factory
+    monkeypatch, touchstone_factory, tmp_path
 ):
-    pyplot = PyplotRecorder()
-    monkeypatch.setattr(touchstone_module, "plt", pyplot)
+    canvas = _fresh_canvas(monkeypatch)
     touchstone = touchstone_factory()
     frequency = np.asarray([1.0, 2.0])
     loss = np.asarray([-1.0, -2.0])
 
-    touchstone.plot_smag([[frequency, loss, {"label": "S21"}]], "Insertion Loss", "loss.png")
+    touchstone.plot_smag(
+        [[frequency, loss, {"label": "S21"}]], "Insertion Loss", str(tmp_path / "loss.png")
+    )
 
-    assert pyplot.plots[0][1] == {"label": "S21"}
-    assert pyplot.legend_count == 1
-    assert pyplot.titles == ["Insertion Loss"]
-    assert pyplot.xscales == []
-    assert pyplot.yscales == []
-    assert pyplot.xlabels == ["Frequency (GHz)"]
-    assert pyplot.ylabels == ["S21 (dB)"]
-    assert pyplot.saved == ["loss.png"]
-    assert pyplot.close_count == 1
+    _, ax, _ = canvas.fig_dict["smag"]
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["S21"]
+    assert ax.get_title() == "Insertion Loss"
+    assert (ax.get_xscale(), ax.get_yscale()) == ("linear", "linear")
+    assert ax.get_xlabel() == "Frequency (GHz)"
+    assert ax.get_ylabel() == "S21 (dB)"
+    assert (tmp_path / "loss.png").is_file()
 
 
 @pytest.mark.xfail(
@@ -748,36 +1212,40 @@ def test_plot_smag_uses_linear_frequency_axis_db_label_and_target_path(
     raises=AssertionError,
     reason="BUG: return-loss plots are always labeled S21 instead of reflection loss",
 )
-def test_plot_smag_labels_return_loss_as_reflection_loss(monkeypatch, touchstone_factory):
-    pyplot = PyplotRecorder()
-    monkeypatch.setattr(touchstone_module, "plt", pyplot)
+def test_plot_smag_labels_return_loss_as_reflection_loss(monkeypatch, touchstone_factory, tmp_path):
+    canvas = _fresh_canvas(monkeypatch)
     touchstone = touchstone_factory()
 
     touchstone.plot_smag(
         [[np.asarray([1.0]), np.asarray([-10.0]), {"label": "S11"}]],
         "SIM__RL__S",
-        "rl.png",
+        str(tmp_path / "rl.png"),
     )
 
-    assert pyplot.ylabels == ["S11 (dB)"]
+    assert canvas.fig_dict["smag"][1].get_ylabel() == "S11 (dB)"
 
 
-def test_plot_time_domain_uses_one_based_labels_and_characteristic_impedance_axes(
-    monkeypatch, touchstone_factory
+def test_plot_time_domain_draws_each_curve_with_characteristic_impedance_axes(
+    monkeypatch, touchstone_factory, tmp_path
 ):
-    pyplot = PyplotRecorder()
-    monkeypatch.setattr(touchstone_module, "plt", pyplot)
-    network = FakeTdrNetwork([0, 10e6], port_count=3)
+    canvas = _fresh_canvas(monkeypatch)
     touchstone = touchstone_factory()
+    t_ns = np.asarray([0.0, 1.0])
+    fig_data = [
+        [t_ns, np.asarray([50.0, 51.0]), {"label": "Port_1"}],
+        [t_ns, np.asarray([45.0, 46.0]), {"label": "Port_3"}],
+    ]
 
-    touchstone.plot_time_domain([1, 3], network, "TDR Left", "tdr.png")
+    touchstone.plot_time_domain(fig_data, "TDR Left", str(tmp_path / "tdr.png"))
 
-    assert network.time_step_calls == [(0, 0, "Port_1"), (2, 2, "Port_3")]
-    assert pyplot.titles == ["TDR Left"]
-    assert pyplot.xlabels == ["Time (ns)"]
-    assert pyplot.ylabels == ["Zc (Ohm)"]
-    assert pyplot.saved == ["tdr.png"]
-    assert pyplot.close_count == 1
+    _, ax, _ = canvas.fig_dict["time_domain"]
+    assert [line.get_label() for line in ax.lines] == ["Port_1", "Port_3"]
+    np.testing.assert_array_equal(ax.lines[1].get_ydata(), [45.0, 46.0])
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["Port_1", "Port_3"]
+    assert ax.get_title() == "TDR Left"
+    assert ax.get_xlabel() == "Time (ns)"
+    assert ax.get_ylabel() == "Zc (Ohm)"
+    assert (tmp_path / "tdr.png").is_file()
 
 
 @pytest.mark.xfail(
@@ -799,3 +1267,113 @@ def test_tdr_mm_alone_initializes_a_mixed_mode_network(touchstone_factory):
     touchstone.convert_snp_se2mm = Mock(return_value=mixed_mode)
 
     assert touchstone._TouchStone__get_mixedmode_network() is mixed_mode
+
+
+def test_plot_mm_methods_draw_only_the_parts_asked_for(touchstone_factory):
+    mixed_mode = np.arange(2 * 4 * 4).reshape(2, 4, 4)
+    touchstone = touchstone_factory(port_num=4)
+    touchstone.plot_il = lambda connectivity, values, process_key, header: [[header]]
+    touchstone.plot_rl = touchstone.plot_il
+
+    il_mm = touchstone.plot_il_mm([[1, 2]], mixed_mode, "IL_MM", ["CD", "DD"])
+    rl_mm = touchstone.plot_rl_mm([1, 2], mixed_mode, "RL_MM", ["CC"])
+
+    assert il_mm == {"DD": [["SDD"]], "CD": [["SCD"]]}
+    assert rl_mm == {"CC": [["SCC"]]}
+
+
+def test_parallel_auto_process_matches_the_serial_output(tmp_path):
+    network = _random_network(4, seed=8)
+    network.frequency = rf.Frequency.from_f(np.linspace(1e7, 4e9, 41), unit="Hz")
+    network.s = np.resize(network.s, (41, 4, 4)) * 0.5
+    network.z0 = 50.0
+    network.name = "shared"
+    network.write_touchstone(dir=str(tmp_path))
+    conn_dict = {
+        "IL": [[1, 3]],
+        "RL": [1, 2],
+        "IL_MM": [[1, 2]],
+        "RL_MM": [1, 2],
+        "MM_ORDER_IN_SE": [0, 2, 1, 3],
+    }
+    output_list = []
+    for plot_workers in (1, 2):
+        plt_dir = tmp_path / ("plot_" + str(plot_workers))
+        plt_dir.mkdir()
+        info = {
+            "file_dir": str(tmp_path / "shared.s4p"),
+            "key_name": "SNP_S__SHARED",
+            "plt_dir": str(plt_dir) + SL,
+            "spec_type": {"POST_PROCESS_KEY": ["IL", "IL_MM", "UNKNOWN", "RL", "RL_MM"]},
+            "conn_dict": conn_dict,
+            "mm_settings": {"cache": False, "write_snp": "off"},
+            "plot_workers": plot_workers,
+        }
+        output_list.append(TouchStone(info).auto_process())
+    serial, parallel = output_list
+
+    assert str(parallel).replace("plot_2", "plot_1") == str(serial)
+    assert list(parallel) == ["IL", "IL_MM", "RL", "RL_MM"]
+    assert list(parallel["IL_MM"]) == ["DD", "CC", "DC", "CD"]
+    png_list = list((tmp_path / "plot_1").glob("*.png"))
+    assert png_list
+    for png in png_list:
+        assert (tmp_path / "plot_2" / png.name).read_bytes() == png.read_bytes()
+
+
+def test_curve_export_writes_the_full_curves_of_each_figure(touchstone_factory, tmp_path):
+    f = np.linspace(0.01, 1.0, 5000)
+    s_path = np.stack([-f, -2 * f], axis=1)
+    touchstone = touchstone_factory(
+        key_name="SNP_S__SIM_A", plt_dir=f"{tmp_path}{SL}", f=f, curve_export=True
+    )
+
+    (entry,) = touchstone.draw_s_path(s_path, ["S21", "S31"], "IL")
+
+    x, y, port_list = ResultExport.load_shard(
+        ResultExport.get_shard_dir(f"{tmp_path}{SL}", entry[0])
+    )
+    assert port_list == ["S21", "S31"]
+    np.testing.assert_array_equal(x, f.astype(np.float32))
+    np.testing.assert_array_equal(y, s_path.T.astype(np.float32))
+
+
+def test_recorded_output_is_not_reused_while_its_curve_shard_is_missing(
+    touchstone_factory, tmp_path
+):
+    touchstone = _reusing_touchstone(touchstone_factory, tmp_path, {"IL": [[1, 2]]})
+    touchstone.curve_export = True
+    touchstone.f = np.array([1.0, 2.0])
+    output = touchstone.plot_il(touchstone.conn_dict["IL"], _complex_s(2, 2), "IL")
+    touchstone.save_output("IL", output)
+    assert touchstone.load_output("IL") == output
+
+    (tmp_path / "Curves" / (output[0][0] + ".npz")).unlink()
+
+    assert touchstone.load_output("IL") is None
+
+
+def test_quick_look_reads_a_row_subset_skips_slow_keys_and_draws_low_dpi(monkeypatch, tmp_path):
+    snp = _pdn_snp(tmp_path)
+    render = Mock()
+    monkeypatch.setattr(touchstone_module, "_get_canvas", lambda: Mock(render=render))
+    info = {
+        "file_dir": snp,
+        "key_name": "SIM",
+        "plt_dir": f"{tmp_path}{SL}",
+        "spec_type": {"POST_PROCESS_KEY": ["ZOPEN", "IL", "TDR", "IL_MM"]},
+        "conn_dict": {"ZIN": [1, 2], "IL": [[1, 2]]},
+        "curve_export": True,
+        "quick_look": True,
+    }
+
+    touchstone = TouchStone(info)
+    output = touchstone.auto_process()
+
+    assert list(output) == ["ZOPEN", "IL"]
+    assert len(touchstone.nw.f) <= touchstone.QUICK_LOOK_ROW + 2
+    assert touchstone.nw.name == "SIM__A"
+    assert {i_call.args[-1] for i_call in render.call_args_list} == {touchstone.QUICK_LOOK_DPI}
+    assert info["spec_type"]["POST_PROCESS_KEY"] == ["ZOPEN", "IL", "TDR", "IL_MM"]
+    assert touchstone.curve_export is False
+    assert not (tmp_path / "Curves").exists()